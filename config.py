@@ -9,6 +9,54 @@ load_dotenv()
 AI_API_KEY = os.getenv("NVIDIA_API_KEY")
 AI_BASE_URL = "https://integrate.api.nvidia.com/v1"
 AI_MODEL = "moonshotai/kimi-k2.5"
+AI_MAX_TOKENS = 1024            # completion cap per proposal
+
+# Model routing: the first route whose bands match the job is used, and its
+# "models" are tried in order until one answers (fallback chain). A model may
+# be a plain name (served by AI_BASE_URL) or {"model", "base_url", "api_key_env"}.
+# An empty list sends everything to AI_MODEL.
+#
+# Out of the box there is a single route: every job goes to AI_MODEL, with
+# llama only as a fallback when it errors — the default setup adds a fallback,
+# not band routing. To send lower bands to a faster model first, put a more
+# selective route ahead of a catch-all, e.g.:
+#     {"name": "high_value", "min_score": 5, "min_budget": 500,
+#      "models": [AI_MODEL, "meta/llama-3.3-70b-instruct"]},
+#     {"name": "standard", "min_score": 0, "min_budget": 0,
+#      "models": ["meta/llama-3.3-70b-instruct", AI_MODEL]},
+AI_ROUTES = [
+    {"name": "all", "min_score": 0, "min_budget": 0,
+     "models": [AI_MODEL, "meta/llama-3.3-70b-instruct"]},
+]
+AI_PROMPT_DESCRIPTION_TOKENS = 400  # job descriptions above this are condensed (modules/prompt_builder.py)
+AI_CONCURRENCY = 4              # proposals generated in parallel
+AI_REQUESTS_PER_MIN = 40        # provider rate limits (0 = unlimited)
+AI_TOKENS_PER_MIN = 60000
+AI_HTTP_TIMEOUT = 120           # seconds per LLM request
+AI_HTTP_KEEPALIVE_EXPIRY = 60   # idle seconds before a pooled connection is dropped
+AI_CLIENT_MAX_RETRIES = 2       # SDK-level retries per call, before our own backoff
+
+# Generation retries and circuit breaker
+AI_RETRY_MAX_ATTEMPTS = 4       # failed calls before a job goes to 'generation_failed'
+AI_RETRY_BASE_DELAY = 120       # seconds before the first retry, doubled per attempt (with jitter)
+AI_RETRY_MAX_DELAY = 6 * 3600
+AI_BREAKER_WINDOW = 20          # recent provider calls the error rate is measured over
+AI_BREAKER_MIN_CALLS = 5
+AI_BREAKER_ERROR_RATE = 0.5     # open the breaker at/above this failure ratio
+AI_BREAKER_COOLDOWN = 300       # seconds open before a single trial call is let through
+
+# LLM response cache (modules/llm_cache.py)
+LLM_CACHE_ENABLED = True
+LLM_CACHE_TTL_HOURS = 72
+LLM_CACHE_MAX_MB = 50
+LLM_CACHE_EVICT_INTERVAL_SEC = 600  # min seconds between eviction sweeps (sooner if writes may exceed the budget)
+
+# Database connection pool
+DB_POOL_MIN = 1                 # connections opened eagerly
+DB_POOL_MAX = 10                # hard cap; callers wait for a free one beyond this
+DB_POOL_TIMEOUT = 30            # seconds to wait for a free connection
+DB_POOL_MAX_LIFETIME = 1800     # seconds before a connection is recycled
+DB_POOL_PING_AFTER = 30         # seconds idle before a checkout runs SELECT 1
 
 # Rate Limits
 LIMITS = {
@@ -26,11 +74,44 @@ SEARCH_KEYWORDS = [
 ]
 
 SCRAPE_MAX_PAGES = 3
+SCRAPE_INCREMENTAL = True       # stop paging at last cycle's newest job (needs sort=recency)
 SCRAPE_PAGE_DELAY = (2, 5)      # seconds between pages
 SCRAPE_KEYWORD_DELAY = (5, 10)  # seconds between keywords
+SCRAPE_CONCURRENCY = 3          # parallel tabs per cycle (1 = sequential, single tab)
+SCRAPE_HOST_DELAY = (2, 5)      # seconds between navigations to one host, across all tabs
 SCRAPE_HEADLESS = True
+SCRAPE_MODE = "browser"         # "http" = curl_cffi + SSR __NUXT__ parsing, browser on challenge
+HTTP_IMPERSONATE = "chrome131"  # curl_cffi TLS fingerprint; keep in step with BROWSER_USER_AGENT
+BROWSER_DAEMON = True           # keep one browser warm across cycles (see modules/browser_manager.py)
+BROWSER_RECYCLE_AFTER = 50      # navigations before a pooled tab is closed and replaced
+BROWSER_RUN_TIMEOUT = 1800      # seconds a caller waits on one browser-manager run before it is cancelled
 SCRAPE_TIMEOUT = 30000          # ms
 
+# How jobs are read off a loaded page:
+#   "nuxt"    — wait for __NUXT__ hydration, then evaluate it in the page
+#   "network" — parse the JSON/GraphQL search payloads as they arrive
+SCRAPE_EXTRACTION_MODE = "nuxt"
+SCRAPE_CAPTURE_URL_PATTERNS = ["/api/graphql", "/search/jobs", "/find-work/api"]
+SCRAPE_CAPTURE_TIMEOUT = 10000  # ms to wait for a job payload before falling back
+
+# Route interception on scraper tabs — we only read __NUXT__ state / JSON
+SCRAPE_BLOCK_PROFILE = {
+    "enabled": True,
+    "resource_types": ["image", "media", "font", "stylesheet"],  # aborted outright
+    "deny_hosts": [                   # analytics/ads — answered with an empty 204
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+        "facebook.net",
+        "hotjar.com",
+        "segment.io",
+        "bing.com",
+        "linkedin.com",
+    ],
+    "block_third_party": False,       # True = abort every host not in allow_hosts
+    "allow_hosts": ["upwork.com", "static-upwork.com", "upwork.tech", "cloudflare.com"],
+}
+
 # Search filters (URL params for Upwork search)
 # All are optional — omit or set to None to skip
 SEARCH_FILTERS = {
@@ -92,6 +173,29 @@ KEYWORD_WHITELIST = [
 ]
 
 FILTER_WHITELIST_MIN_SCORE = 2  # Minimum score to proceed to proposal generation
+FILTER_BATCH_SIZE = 1000        # jobs evaluated + written back per transaction
+
+# Generation queue (modules/generation_queue.py)
+# priority = (score_weight * filter_score + budget_weight * log2(1 + budget_usd / 100))
+#            * freshness(age) * tier factor
+GENERATION_PRIORITY = {
+    "decay": "exponential",          # "exponential" (half-life), "linear" (to 0 at max_age), "step"
+    "half_life_hours": 6,
+    "step_hours": [(2, 1.0), (12, 0.6), (24, 0.3)],   # step: factor for age <= hours, else 0.1
+    "max_age_hours": 48,             # staleness deadline — older jobs are not generated
+    "score_weight": 1.0,
+    "budget_weight": 0.5,
+    "hourly_equiv_hours": 20,        # hourly rate × this ≈ fixed-price equivalent
+    "tier_factors": {                # proposals already on the job (normalized tier label)
+        "lessthan5": 1.0,
+        "5to10": 0.85,
+        "10to15": 0.7,
+        "15to20": 0.55,
+        "20to50": 0.4,
+        "50+": 0.25,
+    },
+    "unknown_tier_factor": 0.8,
+}
 
 # Proposal Generator
 PROPOSAL_MAX_CHARS = 1000
@@ -101,7 +205,42 @@ PROPOSAL_TONE = "professional but personable"  # Style for Claude to use
 API_HOST = "0.0.0.0"
 API_PORT = 8000
 
+# Pipeline event stream (GET /api/events, modules/pipeline_events.py)
+EVENTS_QUEUE_SIZE = 2000        # per-connection backlog; oldest events are dropped beyond this
+EVENTS_REPLAY = 500             # recent events replayed to a client reconnecting with Last-Event-ID
+EVENTS_KEEPALIVE_SEC = 15
+
 # Auto-Submit
 AUTO_SUBMIT_DELAY = (10, 30)  # seconds between submissions
+AUTO_SUBMIT_LOOKAHEAD = 3     # tabs open at once — the next jobs load during the pacing delay
+AUTO_SUBMIT_LEASE_SEC = 300   # a submitter's claim on a proposal; renewed at every state change
 AUTO_SUBMIT_DEFAULT_BID = 250  # default fixed price bid if none specified
 AUTO_SUBMIT_SCREENSHOTS = True  # save screenshots before submitting
+# Screenshot writer (modules/screenshot_writer.py)
+SCREENSHOT_FORMAT = "jpeg"      # "jpeg", or "webp" (re-encoded with Pillow if installed)
+SCREENSHOT_QUALITY = 70         # 1-100
+SCREENSHOT_DEDUPE_DISTANCE = 4  # frames within this many dHash bits of the previous one for the same stage are skipped
+SCREENSHOT_MAX_MB = 500         # oldest screenshots are deleted beyond this
+SCREENSHOT_RETENTION_DAYS = 30
+SCREENSHOT_RETENTION_INTERVAL_SEC = 600  # min seconds between retention sweeps (sooner if writes may exceed the budget)
+SCREENSHOT_QUEUE_SIZE = 64      # frames waiting for the writer; further ones are dropped
+# Ceilings (ms) for each readiness wait in submit_proposal — every wait
+# returns as soon as its signal fires, these only bound the failure case
+AUTO_SUBMIT_WAITS = {
+    "navigation": SCRAPE_TIMEOUT,  # job page DOM loaded
+    "apply_button": 10000,         # Apply button visible
+    "form": 15000,                 # cover letter visible after clicking Apply
+    "bid_input": 5000,             # absent on hourly jobs, so keep it short
+    "submit_button": 10000,
+    "confirmation": 15000,         # submit response or success page after clicking Submit
+}
+# The submit request itself — only its status is trusted, never other API
+# traffic: a POST whose URL matches "url", or a GraphQL POST whose body names
+# a "graphql_operation" (regexes, case-insensitive)
+AUTO_SUBMIT_REQUEST = {
+    "url": r"/proposals/(?:api/)?.*(?:apply|submit)",
+    "graphql_operation": r"\b(?:submit|create)Proposal\w*|\bapplyToJob\w*",
+}
+# Where Upwork lands after a successful submit (regex on the URL). Any other
+# navigation (validation step, login/captcha, error page) is not a confirmation.
+AUTO_SUBMIT_SUCCESS_URL_PATTERN = r"/proposals/\d+|/proposals/?\?(?:.*&)?success"
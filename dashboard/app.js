@@ -300,6 +300,8 @@ function renderProposalCard(p, status) {
         `;
     } else if (status === 'approved') {
         actions = `<button class="btn-submit btn-sm" onclick="submitOne(${p.id})">Submit Now</button>`;
+    } else if (status === 'sent' || status === 'send_failed') {
+        actions = `<button class="btn-secondary btn-sm" onclick="showScreenshots(${p.id})">Screenshots</button>`;
     }
 
     return `
@@ -648,6 +650,29 @@ async function showJobDetail(jobId) {
     }
 }
 
+async function showScreenshots(proposalId) {
+    try {
+        const r = await fetch(`${API}/api/proposal/${proposalId}/screenshots`);
+        if (!r.ok) throw new Error('Not found');
+        const d = await r.json();
+
+        document.getElementById('detail-title').textContent = `Submission screenshots — proposal ${proposalId}`;
+        document.getElementById('detail-body-content').innerHTML = d.screenshots.length
+            ? `<div class="screenshot-grid">${d.screenshots.map(s => `
+                <a href="${API}${s.url}" target="_blank" class="screenshot">
+                    <img src="${API}${s.url}" loading="lazy" alt="${escapeHtml(s.stage)}">
+                    <div class="label">${escapeHtml(s.stage)} · ${new Date(s.created_at).toLocaleString()}</div>
+                </a>`).join('')}</div>`
+            : '<div class="empty-state">No screenshots for this proposal</div>';
+
+        document.getElementById('detail-overlay').classList.add('open');
+        document.getElementById('detail-panel').classList.add('open');
+    } catch (e) {
+        console.error(e);
+        toast('Failed to load screenshots', 'error');
+    }
+}
+
 function closeDetail() {
     document.getElementById('detail-overlay').classList.remove('open');
     document.getElementById('detail-panel').classList.remove('open');
@@ -674,13 +699,8 @@ async function scrapeFeed(source) {
     const label = labels[source] || source;
     toast(`Pulling ${label} jobs...`, 'info');
     try {
-        const r = await fetch(`${API}/api/scrape-feed/${source}`, { method: 'POST' });
+        const r = await fetch(`${API}/api/scrape-feed/${source}?background=true`, { method: 'POST' });
         if (!r.ok) throw new Error(await r.text());
-        const d = await r.json();
-        toast(`${label}: ${d.new_jobs} new jobs, ${d.proposals_generated || 0} proposals generated`);
-        loadStats();
-        if (currentTab === 'feed') loadFeedJobs(currentFeedSource);
-        else loadProposals();
     } catch (e) {
         toast(`${label} failed: ${e.message || e}`, 'error');
     }
@@ -689,15 +709,69 @@ async function scrapeFeed(source) {
 async function runCycle() {
     toast('Running cycle...', 'info');
     try {
-        const r = await fetch(`${API}/api/run-cycle`, { method: 'POST' });
-        const d = await r.json();
-        toast(`Cycle done: ${d.proposals_generated || 0} proposals generated`);
-        loadStats(); loadProposals();
+        const r = await fetch(`${API}/api/run-cycle?background=true`, { method: 'POST' });
+        if (!r.ok) throw new Error(await r.text());
     } catch (e) {
         toast('Cycle failed: ' + e, 'error');
     }
 }
 
+// ================================================================
+// Pipeline Events (SSE)
+// ================================================================
+
+let liveJob = null;
+let refreshTimer = null;
+let scrapedCount = 0;
+
+function refreshSoon() {
+    // Proposals can land several per second — coalesce the reloads
+    clearTimeout(refreshTimer);
+    refreshTimer = setTimeout(() => {
+        loadStats();
+        if (currentTab === 'feed') loadFeedJobs(currentFeedSource);
+        else if (currentTab === 'pending') loadProposals();
+    }, 500);
+}
+
+function showLive(jobId, title, text) {
+    liveJob = jobId;
+    document.getElementById('live-title').textContent = title;
+    document.getElementById('live-text').textContent = text;
+    document.getElementById('live-panel').style.display = 'block';
+}
+
+function connectEvents() {
+    const source = new EventSource(`${API}/api/events`);
+    const on = (type, fn) => source.addEventListener(type, (e) => fn(JSON.parse(e.data)));
+
+    on('cycle_started', () => { scrapedCount = 0; });
+    on('job_scraped', () => { scrapedCount++; });
+    on('proposal_started', (d) => showLive(d.job_id, `Writing: ${d.title}`, ''));
+    on('proposal_token', (d) => {
+        if (d.job_id !== liveJob) return;
+        const el = document.getElementById('live-text');
+        // A fallback model starts the proposal over
+        el.textContent = (d.restart ? '' : el.textContent) + d.delta;
+    });
+    on('proposal_stored', (d) => {
+        if (d.job_id === liveJob) {
+            document.getElementById('live-text').textContent = d.proposal_text;
+        }
+        refreshSoon();
+    });
+    on('cycle_finished', (d) => {
+        document.getElementById('live-panel').style.display = 'none';
+        const found = d.new_jobs ?? scrapedCount;
+        toast(`Cycle done: ${found} new jobs, ${d.proposals_generated || 0} proposals generated`);
+        refreshSoon();
+    });
+    on('cycle_failed', (d) => {
+        document.getElementById('live-panel').style.display = 'none';
+        toast(`Cycle failed: ${d.error}`, 'error');
+    });
+}
+
 async function submitApproved() {
     toast('Submitting approved proposals...', 'info');
     try {
@@ -751,6 +825,7 @@ document.addEventListener('DOMContentLoaded', () => {
     loadProposals();
     loadConfig();
     loadSavedSearches();
+    connectEvents();
 
     document.getElementById('detail-overlay')?.addEventListener('click', closeDetail);
     document.addEventListener('keydown', (e) => {
@@ -1,68 +1,463 @@
 """Database initialization and helper functions (PostgreSQL)."""
 
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
+import atexit
+import logging
 import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
 from pathlib import Path
 
+import config
+
+logger = logging.getLogger(__name__)
+
 DB_URL = os.getenv("DATABASE_URL", "postgresql://localhost/upwork")
 
-def init_db():
-    """Initialize database with schema and run migrations."""
-    schema_path = Path(__file__).parent / "schema.sql"
 
-    conn = psycopg2.connect(DB_URL)
-    conn.autocommit = True
-    cur = conn.cursor()
-
-    with open(schema_path, 'r') as f:
-        cur.execute(f.read())
-
-    # Add columns to jobs if missing (safe migrations)
-    migrations = [
-        ("client_country", "TEXT DEFAULT ''"),
-        ("client_spent", "TEXT DEFAULT '0'"),
-        ("client_verified", "BOOLEAN DEFAULT FALSE"),
-        ("proposals_tier", "TEXT DEFAULT ''"),
-        ("experience_level", "TEXT DEFAULT ''"),
-        ("job_type", "TEXT DEFAULT ''"),
-        ("is_saved", "BOOLEAN DEFAULT FALSE"),
-        ("feed_source", "TEXT DEFAULT ''"),
-    ]
-    for col, typedef in migrations:
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes free within DB_POOL_TIMEOUT."""
+
+
+class ConnectionPool:
+    """Thread-safe pool of long-lived psycopg2 connections.
+
+    Connections are handed out in autocommit mode so a single exec_query()
+    costs one round trip. On checkout a connection is discarded if it is
+    closed, broken, or older than max_lifetime, and pinged with SELECT 1 if
+    it has been idle longer than ping_after seconds.
+    """
+
+    def __init__(self, dsn, minconn=1, maxconn=10, timeout=30,
+                 max_lifetime=1800, ping_after=30):
+        self.dsn = dsn
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.ping_after = ping_after
+
+        self._cond = threading.Condition()
+        self._idle = []          # [(conn, returned_at)]
+        self._created_at = {}    # id(conn) -> monotonic creation time
+        self._in_use = 0
+        self._closed = False
+        self._stats = {
+            "checkouts": 0,
+            "created": 0,
+            "discarded": 0,
+            "timeouts": 0,
+            "wait_total_ms": 0.0,
+            "wait_max_ms": 0.0,
+        }
+
+        for _ in range(minconn):
+            self._idle.append((self._connect(), time.monotonic()))
+
+    def _connect(self):
+        # The network connect happens unlocked; only the bookkeeping is shared
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        with self._cond:
+            self._created_at[id(conn)] = time.monotonic()
+            self._stats["created"] += 1
+        return conn
+
+    def _discard(self, conn):
+        # Caller holds self._cond
+        self._created_at.pop(id(conn), None)
+        self._stats["discarded"] += 1
         try:
-            cur.execute(f"ALTER TABLE jobs ADD COLUMN IF NOT EXISTS {col} {typedef}")
+            conn.close()
         except Exception:
             pass
 
-    conn.close()
+    def _is_healthy(self, conn, idle_since):
+        """Cheap local checks first; only ping connections that sat idle."""
+        if conn.closed:
+            return False
+        with self._cond:
+            created_at = self._created_at.get(id(conn), 0)
+        if time.monotonic() - created_at > self.max_lifetime:
+            return False
+        status = conn.get_transaction_status()
+        if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if time.monotonic() - idle_since > self.ping_after:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+            except Exception:
+                return False
+        return True
+
+    def getconn(self):
+        """Check out a healthy connection, waiting up to self.timeout seconds."""
+        start = time.monotonic()
+        deadline = start + self.timeout
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolTimeout("Connection pool is closed")
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                    break
+                if self._in_use < self.maxconn:
+                    conn, idle_since = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"No database connection free after {self.timeout}s "
+                        f"({self.maxconn} in use)"
+                    )
+                self._cond.wait(remaining)
+            self._in_use += 1
+
+        # Connect / health-check outside the lock so other threads aren't blocked
+        try:
+            if conn is not None and not self._is_healthy(conn, idle_since):
+                with self._cond:
+                    self._discard(conn)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        waited_ms = (time.monotonic() - start) * 1000
+        with self._cond:
+            self._stats["checkouts"] += 1
+            self._stats["wait_total_ms"] += waited_ms
+            self._stats["wait_max_ms"] = max(self._stats["wait_max_ms"], waited_ms)
+        return conn
+
+    def putconn(self, conn, discard=False):
+        """Return a connection to the pool, resetting any open transaction."""
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                conn.autocommit = True
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or conn.closed or self._closed:
+                self._discard(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self):
+        """Close every idle connection and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._discard(conn)
+            self._cond.notify_all()
+
+    def stats(self):
+        """Snapshot of pool size and checkout wait metrics."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["in_use"] = self._in_use
+            stats["idle"] = len(self._idle)
+            stats["max"] = self.maxconn
+        checkouts = stats["checkouts"] or 1
+        stats["wait_avg_ms"] = round(stats["wait_total_ms"] / checkouts, 2)
+        stats["wait_total_ms"] = round(stats["wait_total_ms"], 2)
+        stats["wait_max_ms"] = round(stats["wait_max_ms"], 2)
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    DB_URL,
+                    minconn=config.DB_POOL_MIN,
+                    maxconn=config.DB_POOL_MAX,
+                    timeout=config.DB_POOL_TIMEOUT,
+                    max_lifetime=config.DB_POOL_MAX_LIFETIME,
+                    ping_after=config.DB_POOL_PING_AFTER,
+                )
+                atexit.register(_pool.closeall)
+    return _pool
+
+
+def pool_stats():
+    """Pool metrics for the API, or None if no query has run yet."""
+    return _pool.stats() if _pool is not None else None
+
+
+def init_db():
+    """Initialize database with schema and run migrations."""
+    schema_path = Path(__file__).parent / "schema.sql"
+
+    with connection() as conn:
+        cur = conn.cursor()
+
+        with open(schema_path, 'r') as f:
+            cur.execute(f.read())
+
+        # Add columns to jobs if missing (safe migrations)
+        migrations = [
+            ("client_country", "TEXT DEFAULT ''"),
+            ("client_spent", "TEXT DEFAULT '0'"),
+            ("client_verified", "BOOLEAN DEFAULT FALSE"),
+            ("proposals_tier", "TEXT DEFAULT ''"),
+            ("experience_level", "TEXT DEFAULT ''"),
+            ("job_type", "TEXT DEFAULT ''"),
+            ("is_saved", "BOOLEAN DEFAULT FALSE"),
+            ("feed_source", "TEXT DEFAULT ''"),
+            ("generation_attempts", "INTEGER DEFAULT 0"),
+            ("next_attempt_at", "TIMESTAMP"),
+            ("last_error", "TEXT DEFAULT ''"),
+        ]
+        for col, typedef in migrations:
+            try:
+                cur.execute(f"ALTER TABLE jobs ADD COLUMN IF NOT EXISTS {col} {typedef}")
+            except Exception:
+                pass
+
+        proposal_migrations = [
+            ("prompt_tokens", "INTEGER"),
+            ("completion_tokens", "INTEGER"),
+            ("model", "TEXT"),
+            ("submit_state", "TEXT"),
+            ("submit_state_at", "TIMESTAMP"),
+            ("submit_lease_owner", "TEXT"),
+            ("submit_lease_until", "TIMESTAMP"),
+        ]
+        for col, typedef in proposal_migrations:
+            try:
+                cur.execute(f"ALTER TABLE proposals ADD COLUMN IF NOT EXISTS {col} {typedef}")
+            except Exception:
+                pass
+
     print(f"✅ Database initialized at {DB_URL}")
 
 def get_db():
-    """Get database connection."""
-    conn = psycopg2.connect(DB_URL)
-    return conn
+    """Check out a pooled database connection. Hand it back with release_db()."""
+    return get_pool().getconn()
+
+def release_db(conn, discard=False):
+    """Return a connection obtained from get_db() to the pool."""
+    get_pool().putconn(conn, discard=discard)
+
+@contextmanager
+def connection():
+    """Borrow a pooled connection for the duration of a with-block."""
+    conn = get_db()
+    discard = False
+    try:
+        yield conn
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        discard = True
+        raise
+    finally:
+        release_db(conn, discard=discard)
+
+@contextmanager
+def transaction():
+    """Run several statements on one pooled connection as a single transaction.
+
+    Yields a RealDictCursor; commits on success, rolls back on error.
+    """
+    with connection() as conn:
+        conn.autocommit = False
+        try:
+            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
 
 def exec_query(query, params=None, fetch=False):
     """Execute a query and return results if fetch=True."""
     # Convert SQLite-style ? placeholders to PostgreSQL %s
     query = query.replace("?", "%s")
 
-    conn = get_db()
-    cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+    with connection() as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
 
-    try:
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-
-        if fetch:
-            result = cursor.fetchall()
-        else:
-            conn.commit()
-            result = cursor.rowcount
-    finally:
-        conn.close()
+            if fetch:
+                result = cursor.fetchall()
+            else:
+                result = cursor.rowcount
 
     return result
+
+_JOB_INSERT = """INSERT INTO jobs (id, title, url, description, budget, category, posted_at,
+                                  fetched_at, client_country, client_spent, client_verified,
+                                  proposals_tier, experience_level, job_type, feed_source,
+                                  status)
+                VALUES %s
+                ON CONFLICT (id) DO NOTHING
+                RETURNING id"""
+_JOB_TEMPLATE = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'new')"
+
+
+def _text(value, default="", limit=None):
+    """Coerce a scraped value to TEXT Postgres will accept (no NUL bytes)."""
+    if value is None:
+        return default
+    text = value if isinstance(value, str) else str(value)
+    text = text.replace("\x00", "")
+    return text[:limit] if limit else text
+
+
+def _utc_naive(value):
+    """posted_at → naive UTC datetime (the column's convention); None if unknown.
+
+    Upwork and feedparser times are UTC already; ISO strings with an offset
+    are converted rather than having Postgres drop the offset.
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def insert_new_jobs(jobs, feed_source="", description_limit=None):
+    """Bulk-insert scraped job dicts, skipping ids already in the table.
+
+    One INSERT ... ON CONFLICT (id) DO NOTHING RETURNING id for the whole
+    batch. Returns the set of ids that were actually inserted, so callers
+    can derive exact new/duplicate counts for feed_log. If the batch is
+    rejected, rows are retried one at a time so a single bad job only
+    costs itself. description_limit truncates descriptions (the scrapers
+    store at most 2000 chars); by default they are stored in full.
+    """
+    now = datetime.now().isoformat()
+    utc_now = datetime.now(timezone.utc).replace(tzinfo=None)
+    rows = {}
+    for job in jobs:
+        if not job.get("id") or job["id"] in rows:
+            continue
+        job_id = _text(job["id"])
+        rows[job_id] = (
+            job_id,
+            _text(job.get("title")),
+            _text(job.get("url")),
+            _text(job.get("description"), limit=description_limit),
+            _text(job.get("budget"), default=None),
+            _text(job.get("category"), default=None),
+            _utc_naive(job.get("posted_at")) or utc_now,
+            now,
+            _text(job.get("client_country")),
+            _text(job.get("client_spent"), default="0"),
+            bool(job.get("client_verified", False)),
+            _text(job.get("proposals_tier")),
+            _text(job.get("experience_level")),
+            _text(job.get("job_type")),
+            _text(job.get("feed_source", feed_source)),
+        )
+    if not rows:
+        return set()
+
+    with connection() as conn:
+        with conn.cursor() as cursor:
+            try:
+                inserted = psycopg2.extras.execute_values(
+                    cursor, _JOB_INSERT, list(rows.values()),
+                    template=_JOB_TEMPLATE, page_size=len(rows), fetch=True,
+                )
+                return {row[0] for row in inserted}
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                raise
+            except psycopg2.Error as e:
+                logger.warning(f"⚠️ Batch insert of {len(rows)} jobs failed ({e}) — retrying row by row")
+
+            # Autocommit connection: a failed row doesn't abort the ones after it
+            new_ids = set()
+            for job_id, row in rows.items():
+                try:
+                    inserted = psycopg2.extras.execute_values(
+                        cursor, _JOB_INSERT, [row], template=_JOB_TEMPLATE, fetch=True,
+                    )
+                    new_ids.update(r[0] for r in inserted)
+                except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                    raise
+                except psycopg2.Error as e:
+                    logger.error(f"❌ Skipping job {job_id}: {e}")
+            return new_ids
+
+_quota_seeded_on = None
+
+def _seed_daily_quota():
+    """Create today's ledger row from proposals already generated today (once per day)."""
+    global _quota_seeded_on
+    if _quota_seeded_on == date.today():
+        return
+    exec_query(
+        """INSERT INTO proposal_quota (day, used)
+           SELECT CURRENT_DATE, COUNT(*) FROM proposals WHERE generated_at >= CURRENT_DATE
+           ON CONFLICT (day) DO NOTHING"""
+    )
+    _quota_seeded_on = date.today()
+
+def reserve_daily_slot(limit):
+    """Atomically take one of today's `limit` proposal slots.
+
+    A single upsert both creates the day's row and increments it, guarded by
+    used < limit, so concurrent workers and overlapping cycles can't overshoot.
+    Returns the ledger day to pass to release_daily_slot(), or None when full.
+    """
+    if limit <= 0:
+        return None
+    _seed_daily_quota()
+    rows = exec_query(
+        """INSERT INTO proposal_quota (day, used) VALUES (CURRENT_DATE, 1)
+           ON CONFLICT (day) DO UPDATE SET used = proposal_quota.used + 1
+           WHERE proposal_quota.used < %s
+           RETURNING day""",
+        (limit,),
+        fetch=True,
+    )
+    return rows[0]["day"] if rows else None
+
+def release_daily_slot(day):
+    """Hand back a slot reserved on `day` (a generation that stored nothing)."""
+    exec_query(
+        "UPDATE proposal_quota SET used = used - 1 WHERE day = %s AND used > 0",
+        (day,),
+    )
+
+def daily_quota_used():
+    """Slots taken today according to the ledger."""
+    rows = exec_query(
+        "SELECT used FROM proposal_quota WHERE day = CURRENT_DATE",
+        fetch=True,
+    )
+    return rows[0]["used"] if rows else 0
@@ -7,8 +7,8 @@ CREATE TABLE IF NOT EXISTS jobs (
     budget TEXT,
     category TEXT,
     url TEXT NOT NULL,
-    posted_at TIMESTAMP,
-    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    posted_at TIMESTAMP,                            -- UTC
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, -- local time
     status TEXT DEFAULT 'new',
     filter_reason TEXT,
     filter_score INTEGER DEFAULT 0,
@@ -19,7 +19,10 @@ CREATE TABLE IF NOT EXISTS jobs (
     experience_level TEXT DEFAULT '',
     job_type TEXT DEFAULT '',
     is_saved BOOLEAN DEFAULT FALSE,
-    feed_source TEXT DEFAULT ''
+    feed_source TEXT DEFAULT '',
+    generation_attempts INTEGER DEFAULT 0,
+    next_attempt_at TIMESTAMP,
+    last_error TEXT DEFAULT ''
 );
 
 CREATE TABLE IF NOT EXISTS proposals (
@@ -31,9 +34,48 @@ CREATE TABLE IF NOT EXISTS proposals (
     sent_at TIMESTAMP,
     status TEXT DEFAULT 'pending',
     notes TEXT,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    model TEXT,
+    -- Auto-submit state machine (modules/auto_submit.py):
+    -- navigating -> form_filled -> submitted_clicked -> confirmed | failed
+    submit_state TEXT,
+    submit_state_at TIMESTAMP,
+    submit_lease_owner TEXT,
+    submit_lease_until TIMESTAMP,
     FOREIGN KEY (job_id) REFERENCES jobs(id)
 );
 
+-- Daily proposal ledger: generation reserves a slot here against
+-- LIMITS['max_proposals_per_day'] with one atomic upsert
+CREATE TABLE IF NOT EXISTS proposal_quota (
+    day DATE PRIMARY KEY,
+    used INTEGER NOT NULL DEFAULT 0
+);
+
+-- Content-addressed LLM responses (see modules/llm_cache.py)
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    tokens INTEGER DEFAULT 0,
+    bytes INTEGER DEFAULT 0,
+    hits INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Auto-submit audit screenshots, written by modules/screenshot_writer.py
+-- (filename is relative to screenshots/)
+CREATE TABLE IF NOT EXISTS screenshots (
+    id SERIAL PRIMARY KEY,
+    proposal_id INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    bytes INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 CREATE TABLE IF NOT EXISTS feed_log (
     id SERIAL PRIMARY KEY,
     feed_url TEXT NOT NULL,
@@ -43,6 +85,15 @@ CREATE TABLE IF NOT EXISTS feed_log (
     errors TEXT
 );
 
+-- Newest job seen per search keyword; paging stops once a scrape reaches it
+CREATE TABLE IF NOT EXISTS scrape_watermarks (
+    keyword TEXT PRIMARY KEY,
+    search_url TEXT NOT NULL,
+    last_job_id TEXT NOT NULL,
+    last_published_on TEXT DEFAULT '',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 CREATE TABLE IF NOT EXISTS saved_searches (
     id SERIAL PRIMARY KEY,
     name TEXT NOT NULL,
@@ -62,3 +113,4 @@ CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
 CREATE INDEX IF NOT EXISTS idx_jobs_posted_at ON jobs(posted_at);
 CREATE INDEX IF NOT EXISTS idx_proposals_status ON proposals(status);
 CREATE INDEX IF NOT EXISTS idx_proposals_job_id ON proposals(job_id);
+CREATE INDEX IF NOT EXISTS idx_screenshots_proposal_id ON screenshots(proposal_id);
@@ -2,17 +2,23 @@
 
 import json
 import logging
+import threading
 from typing import Optional, List, Dict, Any
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from datetime import datetime
-from db.database import init_db, exec_query
-from modules.job_scraper import scrape_jobs, scrape_feed
-from modules.job_filter import filter_all_new_jobs, filter_job
-from modules.proposal_generator import generate_all_pending
+from db.database import init_db, exec_query, pool_stats, daily_quota_used
+from modules.job_scraper import scrape_jobs, scrape_feed, last_scrape_stats
+from modules.job_filter import (
+    filter_all_new_jobs, filter_job, filter_new_jobs_batch, invalidate_keyword_matcher,
+)
+from modules.proposal_generator import breaker, close_clients, generate_all_pending, last_generation_stats, router
+from modules.llm_cache import stats as llm_cache_stats
 from modules.sender import export_approved_proposals, mark_proposal_sent
+from modules import pipeline_events, screenshot_writer
 import config
 
 logging.basicConfig(level=logging.INFO)
@@ -94,6 +100,8 @@ def _apply_config(data: dict):
         config.KEYWORD_BLACKLIST = data["keyword_blacklist"]
     if "keyword_whitelist" in data and data["keyword_whitelist"] is not None:
         config.KEYWORD_WHITELIST = data["keyword_whitelist"]
+    if data.get("keyword_blacklist") is not None or data.get("keyword_whitelist") is not None:
+        invalidate_keyword_matcher()
     if "whitelist_min_score" in data and data["whitelist_min_score"] is not None:
         config.FILTER_WHITELIST_MIN_SCORE = data["whitelist_min_score"]
 
@@ -129,6 +137,16 @@ async def startup():
     except Exception as e:
         logger.warning(f"Database init warning: {e}")
     _load_active_search()
+    if config.BROWSER_DAEMON:
+        from modules.browser_manager import get_browser_manager
+        get_browser_manager().warm_up()
+
+@app.on_event("shutdown")
+def shutdown():
+    close_clients()
+    if config.BROWSER_DAEMON:
+        from modules.browser_manager import get_browser_manager
+        get_browser_manager().shutdown()
 
 # ============================================================================
 # Config Endpoints
@@ -314,8 +332,22 @@ def refilter_all_jobs():
     exec_query(
         "UPDATE jobs SET status = 'new', filter_reason = NULL, filter_score = 0 WHERE status = 'filtered_out'"
     )
-    passed, filtered = filter_all_new_jobs()
-    return {"passed": passed, "filtered": filtered}
+    stats = filter_new_jobs_batch()
+    logger.info(f"Refiltered {stats['total']} jobs at {stats['jobs_per_sec']} jobs/sec")
+    return stats
+
+@app.post("/api/jobs/{job_id}/retry-generation")
+def retry_generation(job_id: str):
+    """Put a job back in the generation queue with a fresh attempt budget."""
+    updated = exec_query(
+        """UPDATE jobs SET status = 'pending_proposal', generation_attempts = 0,
+                           next_attempt_at = NULL, last_error = ''
+           WHERE id = ? AND status IN ('pending_proposal', 'generation_failed')""",
+        (job_id,)
+    )
+    if not updated:
+        raise HTTPException(status_code=404, detail="No failed or pending job with that id")
+    return {"status": "queued"}
 
 # ============================================================================
 # Saved Jobs
@@ -462,6 +494,14 @@ def get_proposal(proposal_id: int):
 
     return dict(result[0])
 
+@app.get("/api/proposal/{proposal_id}/screenshots")
+def get_proposal_screenshots(proposal_id: int):
+    """Audit screenshots taken while submitting a proposal."""
+    shots = screenshot_writer.list_for_proposal(proposal_id)
+    for shot in shots:
+        shot["url"] = f"/screenshots/{shot['filename']}"
+    return {"screenshots": shots}
+
 @app.post("/api/proposal/{proposal_id}/approve")
 def approve_proposal(proposal_id: int):
     """Mark a proposal as approved."""
@@ -500,16 +540,26 @@ def get_stats():
         return r[0]['count'] if r else 0
 
     today = datetime.now().strftime("%Y-%m-%d")
+    tokens = exec_query(
+        """SELECT COALESCE(SUM(prompt_tokens), 0) AS prompt, COALESCE(SUM(completion_tokens), 0) AS completion,
+                  ROUND(AVG(prompt_tokens)) AS avg_prompt, ROUND(AVG(completion_tokens)) AS avg_completion
+           FROM proposals WHERE date(generated_at) = ?""",
+        (today,),
+        fetch=True
+    )[0]
     return {
         "new_jobs": _count("SELECT COUNT(*) as count FROM jobs WHERE status = 'new'"),
         "filtered_out": _count("SELECT COUNT(*) as count FROM jobs WHERE status = 'filtered_out'"),
         "pending_proposal": _count("SELECT COUNT(*) as count FROM jobs WHERE status = 'pending_proposal'"),
         "proposal_ready": _count("SELECT COUNT(*) as count FROM jobs WHERE status = 'proposal_ready'"),
+        "generation_failed": _count("SELECT COUNT(*) as count FROM jobs WHERE status = 'generation_failed'"),
         "proposals_pending": _count("SELECT COUNT(*) as count FROM proposals WHERE status = 'pending'"),
         "proposals_approved": _count("SELECT COUNT(*) as count FROM proposals WHERE status = 'approved'"),
         "proposals_sent": _count("SELECT COUNT(*) as count FROM proposals WHERE status = 'sent'"),
         "jobs_fetched_today": _count("SELECT COUNT(*) as count FROM jobs WHERE date(fetched_at) = ?", (today,)),
         "proposals_generated_today": _count("SELECT COUNT(*) as count FROM proposals WHERE date(generated_at) = ?", (today,)),
+        "daily_quota": {"used": daily_quota_used(), "limit": config.LIMITS['max_proposals_per_day']},
+        "tokens_today": {key: int(value or 0) for key, value in tokens.items()},
     }
 
 @app.get("/api/proposals")
@@ -528,55 +578,111 @@ def get_proposals(status: str = "pending", limit: int = 50):
     )
     return {"proposals": [dict(row) for row in result]}
 
+def _feed_cycle(source: str) -> dict:
+    pipeline_events.publish("cycle_started", kind="feed", source=source)
+    new_jobs = scrape_feed(source)
+    passed, filtered = filter_all_new_jobs()
+    generated = generate_all_pending()
+    result = {
+        "status": "success",
+        "source": source,
+        "new_jobs": new_jobs,
+        "jobs_filtered": {"passed": passed, "filtered": filtered},
+        "proposals_generated": generated,
+    }
+    pipeline_events.publish("cycle_finished", kind="feed", **result)
+    return result
+
+def _full_cycle(bypass_cache: bool) -> dict:
+    pipeline_events.publish("cycle_started", kind="search")
+    # Fetch
+    scrape_jobs()
+
+    # Filter
+    passed, filtered = filter_all_new_jobs()
+
+    # Generate
+    generated = generate_all_pending(bypass_cache=bypass_cache)
+
+    result = {
+        "status": "success",
+        "scrape": dict(last_scrape_stats),
+        "jobs_filtered": {"passed": passed, "filtered": filtered},
+        "proposals_generated": generated,
+        "generation": dict(last_generation_stats),
+    }
+    pipeline_events.publish("cycle_finished", kind="search", **result)
+    return result
+
+def _start_background(name: str, fn, *args) -> dict:
+    """Run a cycle on a worker thread; progress goes out on /api/events."""
+    def run():
+        try:
+            fn(*args)
+        except Exception as e:
+            logger.error(f"{name} failed: {e}")
+            pipeline_events.publish("cycle_failed", kind=name, error=str(e))
+
+    threading.Thread(target=run, name=name, daemon=True).start()
+    return {"status": "started", "events": "/api/events"}
+
 @app.post("/api/scrape-feed/{source}")
-def scrape_feed_endpoint(source: str):
+def scrape_feed_endpoint(source: str, background: bool = False):
     """Scrape jobs from an Upwork feed page and run them through filters.
 
     source: 'best-matches' or 'most-recent'
+    background: return immediately and stream progress on /api/events.
     """
     if source not in ("best-matches", "most-recent", "saved-jobs"):
         raise HTTPException(status_code=400, detail="source must be 'best-matches', 'most-recent', or 'saved-jobs'")
 
     logger.info(f"Scraping feed: {source}")
+    if background:
+        return _start_background("feed", _feed_cycle, source)
     try:
-        new_jobs = scrape_feed(source)
-        passed, filtered = filter_all_new_jobs()
-        generated = generate_all_pending()
-        return {
-            "status": "success",
-            "source": source,
-            "new_jobs": new_jobs,
-            "jobs_filtered": {"passed": passed, "filtered": filtered},
-            "proposals_generated": generated,
-        }
+        return _feed_cycle(source)
     except Exception as e:
         logger.error(f"Feed scrape failed: {e}")
+        pipeline_events.publish("cycle_failed", kind="feed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/run-cycle")
-def run_cycle():
-    """Manually trigger a full fetch + filter + generate cycle."""
-    logger.info("Starting manual cycle...")
+def run_cycle(bypass_cache: bool = False, background: bool = False):
+    """Manually trigger a full fetch + filter + generate cycle.
 
+    bypass_cache: regenerate even when an identical prompt is in the LLM cache.
+    background: return immediately and stream progress on /api/events.
+    """
+    logger.info("Starting manual cycle...")
+    if background:
+        return _start_background("search", _full_cycle, bypass_cache)
     try:
-        # Fetch
-        scrape_jobs()
-
-        # Filter
-        passed, filtered = filter_all_new_jobs()
-
-        # Generate
-        generated = generate_all_pending()
-
-        return {
-            "status": "success",
-            "jobs_filtered": {"passed": passed, "filtered": filtered},
-            "proposals_generated": generated,
-        }
+        return _full_cycle(bypass_cache)
     except Exception as e:
         logger.error(f"Cycle failed: {e}")
+        pipeline_events.publish("cycle_failed", kind="search", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/events")
+async def stream_events(request: Request, last_event_id: Optional[str] = Header(None)):
+    """Server-sent events: scraped jobs, filter decisions, proposal tokens and stored proposals."""
+    sub = pipeline_events.subscribe(last_event_id)
+
+    async def events():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                event = await sub.get(timeout=config.EVENTS_KEEPALIVE_SEC)
+                yield pipeline_events.format_sse(event) if event else ": keep-alive\n\n"
+        finally:
+            pipeline_events.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.post("/api/export-approved")
 def export_approved():
     """Export all approved proposals."""
@@ -612,10 +718,27 @@ def submit_single(proposal_id: int):
 @app.get("/health")
 def health_check():
     """Health check endpoint."""
-    return {"status": "ok"}
+    browser = None
+    if config.BROWSER_DAEMON:
+        from modules.browser_manager import get_browser_manager
+        browser = get_browser_manager().stats()
+    return {
+        "status": "ok",
+        "db_pool": pool_stats(),
+        "browser": browser,
+        "llm_cache": llm_cache_stats(),
+        "llm_breaker": breaker.stats(),
+        "llm_routes": router.stats(),
+        "screenshots": screenshot_writer.stats(),
+    }
 
 # Serve dashboard static files (must be after API routes)
 app.mount("/dashboard", StaticFiles(directory="dashboard", html=True), name="dashboard")
+app.mount(
+    "/screenshots",
+    StaticFiles(directory=str(screenshot_writer.SCREENSHOTS_DIR), check_dir=False),
+    name="screenshots",
+)
 
 if __name__ == "__main__":
     import uvicorn
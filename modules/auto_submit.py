@@ -3,25 +3,39 @@
 Connects to the user's real Chrome browser through Playwright CDP,
 navigates to each job URL, fills the proposal form, and submits.
 
+Each submission is a persisted state machine on the proposal row
+(submit_state: navigating -> form_filled -> submitted_clicked ->
+confirmed | failed) held under a time-limited lease, so several submitters
+can run at once and any of them can be killed and restarted. A proposal
+left in submitted_clicked is reconciled against the job page's "already
+applied" notice before anything is clicked again.
+
 Prerequisites:
   Chrome must be running with --remote-debugging-port=9222
 """
 
+import json
 import logging
 import os
 import random
 import re
+import socket
 import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
 import config
 from db.database import exec_query
+from modules import screenshot_writer
 
 logger = logging.getLogger(__name__)
 
 CDP_URL = os.getenv("CHROME_CDP_URL", "http://localhost:9222")
-SCREENSHOTS_DIR = Path(__file__).parent.parent / "screenshots"
+# Last selector that matched each form element, tried first on the next run
+SELECTOR_CACHE_FILE = Path(__file__).parent.parent / ".browser_state" / "submit_selectors.json"
 
 # ---------------------------------------------------------------------------
 # Selectors — multiple fallbacks for Upwork's proposal form
@@ -73,29 +87,117 @@ SUBMIT_BUTTON_SELECTORS = [
 
 CLOUDFLARE_INDICATORS = ["just a moment", "verify you are human", "checking your browser"]
 
+# "your proposal" used to be here, but the form itself says it — these must
+# only ever appear after a successful submit
+SUCCESS_PHRASES = [
+    "proposal submitted",
+    "proposal was submitted",
+    "successfully submitted",
+    "thank you for submitting",
+]
+
+# Upwork's own "already applied" notice on a job page — used to reconcile
+# interrupted submits. Scoped to the notice/banner elements and the link to
+# our proposal: free text on the page (job description, client notes) must
+# never match, or an unsent proposal would be marked sent.
+ALREADY_APPLIED_SELECTORS = [
+    '[data-test="already-applied"]',
+    '[role="alert"]:has-text("already submitted a proposal")',
+    '.air3-alert:has-text("already submitted a proposal")',
+    'a[href*="/proposals/"]:text-is("View proposal")',
+]
+
 
 # ---------------------------------------------------------------------------
 # Helper: find first matching selector
 # ---------------------------------------------------------------------------
 
+_selector_cache = None
+
+
+def _load_selector_cache() -> dict:
+    global _selector_cache
+    if _selector_cache is None:
+        try:
+            _selector_cache = json.loads(SELECTOR_CACHE_FILE.read_text())
+        except FileNotFoundError:
+            _selector_cache = {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable selector cache: {e}")
+            _selector_cache = {}
+    return _selector_cache
+
+
+def _remember_selector(description: str, selector: str):
+    """Persist the winning selector for description if it changed."""
+    cache = _load_selector_cache()
+    if cache.get(description) == selector:
+        return
+    cache[description] = selector
+    try:
+        SELECTOR_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = SELECTOR_CACHE_FILE.with_suffix(".tmp")
+        tmp.write_text(json.dumps(cache, indent=2))
+        tmp.replace(SELECTOR_CACHE_FILE)
+    except Exception as e:
+        logger.warning(f"Could not save selector cache: {e}")
+
+
 def _find_element(page, selectors: list[str], description: str, timeout: int = 10000):
-    """Try each selector in order, return the first visible element found.
+    """Wait for any of the selectors at once and return the first visible match.
 
-    Returns the element handle or None if nothing matched.
+    All fallbacks are raced in a single locator.or_() wait, so a stale first
+    selector no longer costs a full timeout. When several match, the
+    last winner for this description (see SELECTOR_CACHE_FILE) is preferred,
+    then list order. Returns the element handle or None if nothing matched.
     """
-    for selector in selectors:
+    cached = _load_selector_cache().get(description)
+    ordered = selectors
+    if cached in selectors:
+        ordered = [cached] + [s for s in selectors if s != cached]
+
+    visible = [page.locator(f"{selector} >> visible=true") for selector in ordered]
+    combined = visible[0]
+    for locator in visible[1:]:
+        combined = combined.or_(locator)
+
+    started = time.monotonic()
+    try:
+        combined.first.wait_for(state="visible", timeout=timeout)
+    except Exception:
+        logger.warning(f"Could not find {description} with any selector")
+        return None
+
+    for selector, locator in zip(ordered, visible):
         try:
-            element = page.wait_for_selector(selector, timeout=timeout, state="visible")
-            if element:
-                logger.debug(f"Found {description} with selector: {selector}")
-                return element
+            if locator.count():
+                element = locator.first.element_handle(timeout=1000)
+                if element:
+                    logger.debug(
+                        f"Found {description} with selector: {selector} "
+                        f"({(time.monotonic() - started) * 1000:.0f}ms)"
+                    )
+                    _remember_selector(description, selector)
+                    return element
         except Exception:
             continue
 
-    logger.warning(f"Could not find {description} with any selector")
+    # Matched during the wait but gone again (re-render) — caller treats as missing
+    logger.warning(f"{description} disappeared before it could be read")
     return None
 
 
+def _already_applied(page) -> bool:
+    """True if the loaded job page says we've already bid (no waiting)."""
+    for selector in ALREADY_APPLIED_SELECTORS:
+        try:
+            if page.locator(f"{selector} >> visible=true").count():
+                return True
+        except Exception:
+            continue
+    return False
+
+
 def _wait_for_cloudflare(page, timeout_ms: int = 60000):
     """Detect and wait through a Cloudflare challenge if present."""
     try:
@@ -112,8 +214,8 @@ def _wait_for_cloudflare(page, timeout_ms: int = 60000):
                 }""",
                 timeout=timeout_ms,
             )
-            # Extra settle time after challenge clears
-            page.wait_for_load_state("networkidle", timeout=15000)
+            # The cleared challenge reloads the page — wait for its DOM, not network idle
+            page.wait_for_load_state("domcontentloaded", timeout=15000)
             logger.info("Cloudflare challenge resolved")
             return True
     except Exception as e:
@@ -149,36 +251,134 @@ def _parse_bid_from_budget(budget_str: str) -> float | None:
     return None
 
 
-def _take_screenshot(page, proposal_id: int, stage: str = "pre-submit") -> str | None:
-    """Save a screenshot for audit trail. Returns the file path or None."""
+def _take_screenshot(page, proposal_id: int, stage: str = "pre-submit") -> bool:
+    """Capture a frame for the audit trail; it is stored by the background writer."""
     if not config.AUTO_SUBMIT_SCREENSHOTS:
-        return None
+        return False
 
     try:
-        SCREENSHOTS_DIR.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"proposal_{proposal_id}_{stage}_{timestamp}.png"
-        filepath = SCREENSHOTS_DIR / filename
-        page.screenshot(path=str(filepath), full_page=False)
-        logger.info(f"Screenshot saved: {filepath}")
-        return str(filepath)
+        data = page.screenshot(**screenshot_writer.capture_options())
     except Exception as e:
         logger.warning(f"Screenshot failed: {e}")
+        return False
+    return screenshot_writer.queue_frame(proposal_id, stage, data)
+
+
+class _StepTimer:
+    """Wall time per submission step, so slow waits show up in the logs."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.steps = {}
+
+    @contextmanager
+    def step(self, name: str):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.steps[name] = round(time.monotonic() - started, 2)
+
+    def summary(self) -> dict:
+        return {"steps": dict(self.steps), "total_sec": round(time.monotonic() - self.started, 2)}
+
+
+# Step timings of the most recent submission
+last_submit_timings = {}
+
+
+def _is_submit_request(request) -> bool:
+    """True only for the submit POST itself (config.AUTO_SUBMIT_REQUEST)."""
+    if request.method != "POST":
+        return False
+    patterns = config.AUTO_SUBMIT_REQUEST
+    if re.search(patterns["url"], request.url, re.IGNORECASE):
+        return True
+    if "graphql" in request.url.lower():
+        try:
+            body = request.post_data or ""
+        except Exception:
+            return False
+        return bool(re.search(patterns["graphql_operation"], body, re.IGNORECASE))
+    return False
+
+
+def _submit_outcome(response) -> str | None:
+    """Classify a submit response as "rejected" or "accepted" (None: settles nothing).
+
+    A GraphQL mutation reports failure in a 200 body, so "errors" there is
+    neither proof of success nor of rejection — the page decides.
+    """
+    if response.status >= 400:
+        return "rejected"
+    if not 200 <= response.status < 300:
         return None
+    if "graphql" in response.url.lower():
+        try:
+            if json.loads(response.body()).get("errors"):
+                return None
+        except Exception:
+            return None
+    return "accepted"
+
+
+def _is_success_url(url: str, form_url: str) -> bool:
+    return url != form_url and bool(re.search(config.AUTO_SUBMIT_SUCCESS_URL_PATTERN, url, re.IGNORECASE))
+
+
+def _wait_for_confirmation(page, form_url: str, submit_responses: list, timeout_ms: int) -> str | None:
+    """Wait for evidence that Submit went through (or was refused).
+
+    Returns "rejected" if the submit request itself failed, "response" if it
+    succeeded, "url" once the page lands on a success route, "text" when a
+    success phrase shows up, or None at the ceiling. A URL change on its own
+    (validation step, login/captcha redirect, error page) proves nothing.
+    """
+    deadline = time.monotonic() + timeout_ms / 1000
+    checked = 0
+    while time.monotonic() < deadline:
+        for response in submit_responses[checked:]:
+            checked += 1
+            outcome = _submit_outcome(response)
+            if outcome == "rejected":
+                return "rejected"
+            if outcome == "accepted":
+                return "response"
+        if _is_success_url(page.url, form_url):
+            return "url"
+        try:
+            page.wait_for_function(
+                """(phrases) => {
+                    const text = (document.body && document.body.innerText || '').toLowerCase();
+                    return phrases.some(p => text.includes(p));
+                }""",
+                arg=SUCCESS_PHRASES,
+                timeout=250,
+            )
+            return "text"
+        except Exception:
+            # Timed out (or the page navigated mid-check) — the loop re-checks
+            # the response and URL signals, which Playwright updates in between
+            continue
+    return None
 
 
 # ---------------------------------------------------------------------------
 # DB queries
 # ---------------------------------------------------------------------------
 
+_PROPOSAL_COLUMNS = """p.id, p.job_id, p.proposal_text, p.status, p.submit_state,
+                  j.title, j.url, j.budget, j.description"""
+
+
 def _get_approved_proposals() -> list[dict]:
-    """Fetch all approved proposals that haven't been sent yet."""
+    """Fetch approved, unsent proposals that no other submitter holds a lease on."""
     return exec_query(
-        """SELECT p.id, p.job_id, p.proposal_text, p.status,
-                  j.title, j.url, j.budget, j.description
+        f"""SELECT {_PROPOSAL_COLUMNS}
            FROM proposals p
            JOIN jobs j ON p.job_id = j.id
            WHERE p.status = 'approved' AND p.sent_at IS NULL
+             AND (p.submit_lease_until IS NULL OR p.submit_lease_until < CURRENT_TIMESTAMP)
            ORDER BY p.approved_at ASC""",
         fetch=True,
     )
@@ -187,8 +387,7 @@ def _get_approved_proposals() -> list[dict]:
 def _get_proposal_by_id(proposal_id: int) -> dict | None:
     """Fetch a single proposal by its ID."""
     rows = exec_query(
-        """SELECT p.id, p.job_id, p.proposal_text, p.status,
-                  j.title, j.url, j.budget, j.description
+        f"""SELECT {_PROPOSAL_COLUMNS}
            FROM proposals p
            JOIN jobs j ON p.job_id = j.id
            WHERE p.id = %s""",
@@ -198,19 +397,72 @@ def _get_proposal_by_id(proposal_id: int) -> dict | None:
     return rows[0] if rows else None
 
 
+class LeaseLost(Exception):
+    """Another submitter took over this proposal (our lease expired)."""
+
+
+def _claim(proposal_id: int, owner: str) -> dict | None:
+    """Take the submit lease on an approved proposal.
+
+    Succeeds when nobody holds a live lease (a crashed submitter's lease
+    simply runs out). Returns {"submit_state": ...} with the state the last
+    holder reached, or None if the proposal is leased or no longer approved.
+    """
+    rows = exec_query(
+        """UPDATE proposals
+           SET submit_lease_owner = %s,
+               submit_lease_until = CURRENT_TIMESTAMP + make_interval(secs => %s)
+           WHERE id = %s AND status = 'approved' AND sent_at IS NULL
+             AND (submit_lease_until IS NULL OR submit_lease_until < CURRENT_TIMESTAMP
+                  OR submit_lease_owner = %s)
+           RETURNING submit_state""",
+        (owner, config.AUTO_SUBMIT_LEASE_SEC, proposal_id, owner),
+        fetch=True,
+    )
+    return rows[0] if rows else None
+
+
+def _advance(proposal_id: int, owner: str, state: str):
+    """Persist the next submit state and renew the lease; raises LeaseLost if it isn't ours."""
+    updated = exec_query(
+        """UPDATE proposals
+           SET submit_state = %s, submit_state_at = CURRENT_TIMESTAMP,
+               submit_lease_until = CURRENT_TIMESTAMP + make_interval(secs => %s)
+           WHERE id = %s AND submit_lease_owner = %s""",
+        (state, config.AUTO_SUBMIT_LEASE_SEC, proposal_id, owner),
+    )
+    if not updated:
+        raise LeaseLost(f"lease on proposal {proposal_id} was taken over")
+
+
+def _release(proposal_id: int, owner: str):
+    """Drop our lease without changing state (e.g. left for reconciliation)."""
+    exec_query(
+        """UPDATE proposals SET submit_lease_owner = NULL, submit_lease_until = NULL
+           WHERE id = %s AND submit_lease_owner = %s""",
+        (proposal_id, owner),
+    )
+
+
 def _mark_sent(proposal_id: int):
-    """Mark proposal as sent with current timestamp."""
+    """Mark proposal as sent (confirmed) with current timestamp."""
     exec_query(
-        "UPDATE proposals SET status = 'sent', sent_at = %s WHERE id = %s",
-        (datetime.now(), proposal_id),
+        """UPDATE proposals
+           SET status = 'sent', sent_at = %s, submit_state = 'confirmed', submit_state_at = %s,
+               submit_lease_owner = NULL, submit_lease_until = NULL
+           WHERE id = %s""",
+        (datetime.now(), datetime.now(), proposal_id),
     )
 
 
 def _mark_failed(proposal_id: int, reason: str):
     """Mark proposal as failed with a note."""
     exec_query(
-        "UPDATE proposals SET status = 'send_failed', notes = %s WHERE id = %s",
-        (reason[:500], proposal_id),
+        """UPDATE proposals
+           SET status = 'send_failed', notes = %s, submit_state = 'failed', submit_state_at = %s,
+               submit_lease_owner = NULL, submit_lease_until = NULL
+           WHERE id = %s""",
+        (reason[:500], datetime.now(), proposal_id),
     )
 
 
@@ -226,6 +478,8 @@ class UpworkSubmitter:
         self.context = None
         self.page = None
         self.playwright = None
+        # Lease owner id — unique per submitter so parallel runs never share a proposal
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
 
     def connect(self):
         """Connect to Chrome via CDP."""
@@ -253,6 +507,7 @@ class UpworkSubmitter:
 
     def stop(self):
         """Clean up browser resources."""
+        screenshot_writer.flush()
         try:
             if self.page:
                 self.page.close()
@@ -282,165 +537,378 @@ class UpworkSubmitter:
         Returns:
             True if submitted successfully, False otherwise.
         """
-        proposal_id = proposal["id"]
-        job_url = proposal["url"]
-        job_title = proposal.get("title", "Unknown")
-
-        logger.info(f"[Proposal {proposal_id}] Submitting for: {job_title[:60]}")
+        tab = self._claim_tab(proposal, self.page)
+        if tab is None:
+            return False
+        ok = self._guard(tab, self._prepare) and self._guard(tab, self._complete)
+        self._finish(tab)
+        return ok or tab.reconciled
+
+    def submit_pipelined(self, proposals: list[dict]) -> int:
+        """Submit proposals in order, readying the next tabs during each pacing delay.
+
+        Up to AUTO_SUBMIT_LOOKAHEAD tabs are open at once. Their job pages
+        start loading as soon as they are opened, and while the head of the
+        queue waits for its pacing slot the tabs behind it clear Cloudflare
+        and resolve their Apply button. Pacing (AUTO_SUBMIT_DELAY) still
+        separates consecutive submit attempts. Returns the number submitted,
+        including proposals found already applied (marked sent, no new bid).
+        """
+        queue = deque(proposals)
+        tabs = deque()
+        lookahead = max(1, config.AUTO_SUBMIT_LOOKAHEAD)
+        submitted = 0
+        reconciled = 0
+        paced = 0.0
+        next_slot = time.monotonic()
+        started = time.monotonic()
 
         try:
-            # 1. Navigate to the job page
-            logger.info(f"[Proposal {proposal_id}] Navigating to {job_url}")
-            self.page.goto(job_url, wait_until="domcontentloaded", timeout=config.SCRAPE_TIMEOUT)
+            while queue or tabs:
+                while queue and len(tabs) < lookahead:
+                    tab = self._claim_tab(queue.popleft())
+                    if tab:
+                        self._guard(tab, self._start_navigation)
+                        tabs.append(tab)
+                if not tabs:
+                    break
+
+                head = tabs.popleft()
+                self._guard(head, self._prepare)
+
+                # Spend the pacing window readying the tabs behind the head
+                for tab in tabs:
+                    if time.monotonic() >= next_slot:
+                        break
+                    self._guard(tab, self._prepare)
+
+                wait = next_slot - time.monotonic()
+                if head.ready and wait > 0:
+                    logger.info(
+                        f"Waiting {wait:.1f}s before next submission "
+                        f"({sum(t.ready for t in tabs)} more tab(s) ready)..."
+                    )
+                    with head.timer.step("pacing"):
+                        head.page.wait_for_timeout(wait * 1000)
+
+                if head.ready and self._guard(head, self._complete):
+                    submitted += 1
+                reconciled += int(head.reconciled)
+                if head.attempted:
+                    delay = random.uniform(*config.AUTO_SUBMIT_DELAY)
+                    next_slot = time.monotonic() + delay
+                    paced += delay
+                self._finish(head)
+                head.close()
+        finally:
+            # Interrupted: hand unfinished proposals back for the next run
+            for tab in tabs:
+                self._finish(tab)
+                tab.close()
+
+        total = time.monotonic() - started
+        logger.info(
+            f"⏱ Drained {len(proposals)} proposal(s) in {total:.0f}s "
+            f"(pacing floor {paced:.0f}s, {lookahead} tab lookahead)"
+        )
+        if reconciled:
+            logger.info(f"{reconciled} proposal(s) were already applied — marked sent without resubmitting")
+        return submitted + reconciled
+
+    def _claim_tab(self, proposal: dict, page=None) -> "_Tab | None":
+        """Lease the proposal, then give it a tab (a new one unless page is passed)."""
+        claim = _claim(proposal["id"], self.owner)
+        if claim is None:
+            logger.info(f"[Proposal {proposal['id']}] Leased by another submitter or no longer approved — skipping")
+            return None
+        tab = _Tab(page or self.context.new_page(), proposal)
+        tab.owner = self.owner
+        tab.state = claim["submit_state"]
+        if tab.state == "submitted_clicked":
+            logger.warning(
+                f"[Proposal {proposal['id']}] Previous run clicked Submit without confirming — reconciling"
+            )
+        return tab
 
-            # 2. Handle Cloudflare if it appears
-            _wait_for_cloudflare(self.page)
+    def _finish(self, tab: "_Tab"):
+        """Log timings and let go of the lease if the proposal isn't settled."""
+        _log_timings(tab)
+        if not tab.settled:
+            _release(tab.proposal["id"], tab.owner)
 
-            # 3. Wait for page to settle
-            self.page.wait_for_load_state("networkidle", timeout=15000)
+    def _guard(self, tab: "_Tab", step) -> bool:
+        """Run a submission step, recording any exception as a failed proposal."""
+        try:
+            return step(tab)
+        except LeaseLost as e:
+            logger.warning(f"[Proposal {tab.proposal['id']}] Stopping: {e}")
+            tab.ready = False
+            tab.settled = True  # someone else owns it now
+            return False
+        except Exception as e:
+            proposal_id = tab.proposal["id"]
+            reason = f"Unexpected error: {str(e)[:400]}"
+            logger.error(f"[Proposal {proposal_id}] {reason}")
+            if tab.state == "submitted_clicked":
+                # The bid may have gone through — leave it for reconciliation
+                logger.warning(f"[Proposal {proposal_id}] Left in submitted_clicked for the next run")
+            else:
+                self._fail(tab, reason)
+            _take_screenshot(tab.page, proposal_id, "error")
+            tab.ready = False
+            return False
 
-            # 4. Click the "Apply Now" / "Submit a Proposal" button
+    def _fail(self, tab: "_Tab", reason: str):
+        _mark_failed(tab.proposal["id"], reason)
+        tab.state = "failed"
+        tab.settled = True
+
+    def _confirm(self, tab: "_Tab"):
+        _mark_sent(tab.proposal["id"])
+        tab.state = "confirmed"
+        tab.settled = True
+
+    def _advance(self, tab: "_Tab", state: str):
+        _advance(tab.proposal["id"], tab.owner, state)
+        tab.state = state
+
+    def _start_navigation(self, tab: "_Tab") -> bool:
+        """Start loading the job page without waiting for it to render."""
+        if not tab.navigating:
+            tab.navigating = True
+            # A clicked-but-unconfirmed submit keeps its state until reconciled
+            if tab.state != "submitted_clicked":
+                self._advance(tab, "navigating")
+            logger.info(f"[Proposal {tab.proposal['id']}] Navigating to {tab.proposal['url']}")
+            tab.page.goto(tab.proposal["url"], wait_until="commit", timeout=config.AUTO_SUBMIT_WAITS["navigation"])
+        return True
+
+    def _prepare(self, tab: "_Tab") -> bool:
+        """Load the job page, clear Cloudflare and find the Apply button (once per tab)."""
+        if tab.prepared:
+            return tab.ready
+        tab.prepared = True
+        proposal_id = tab.proposal["id"]
+        waits = config.AUTO_SUBMIT_WAITS
+
+        # 1. Navigate to the job page (Cloudflare check included)
+        with tab.timer.step("navigate"):
+            self._start_navigation(tab)
+            tab.page.wait_for_load_state("domcontentloaded", timeout=waits["navigation"])
+            _wait_for_cloudflare(tab.page)
+
+        # 2. The page is usable once the "Apply Now" / "Submit a Proposal" button renders
+        with tab.timer.step("apply_button"):
             apply_btn = _find_element(
-                self.page, APPLY_BUTTON_SELECTORS, "Apply button", timeout=10000
+                tab.page, APPLY_BUTTON_SELECTORS, "Apply button", timeout=waits["apply_button"]
             )
-            if not apply_btn:
+
+        # 3. Never bid twice: the job page knows if an earlier (interrupted) run got through
+        if _already_applied(tab.page):
+            logger.info(f"[Proposal {proposal_id}] Job page shows we already applied — marking sent")
+            self._confirm(tab)
+            tab.reconciled = True
+            return False
+
+        if not apply_btn:
+            if tab.state == "submitted_clicked":
+                reason = "Could not reconcile interrupted submit — no Apply button and no applied notice"
+            else:
                 reason = "Apply button not found — job may be closed or already applied"
-                logger.warning(f"[Proposal {proposal_id}] {reason}")
-                _mark_failed(proposal_id, reason)
-                _take_screenshot(self.page, proposal_id, "no-apply-button")
-                return False
+            logger.warning(f"[Proposal {proposal_id}] {reason}")
+            self._fail(tab, reason)
+            _take_screenshot(tab.page, proposal_id, "no-apply-button")
+            return False
+
+        if tab.state == "submitted_clicked":
+            logger.warning(f"[Proposal {proposal_id}] Earlier submit did not land — submitting again")
+        tab.ready = True
+        return True
 
-            apply_btn.click()
-            logger.info(f"[Proposal {proposal_id}] Clicked Apply button")
+    def _complete(self, tab: "_Tab") -> bool:
+        """Apply, fill the form and submit on a prepared tab."""
+        tab.attempted = True
+        page = tab.page
+        proposal = tab.proposal
+        proposal_id = proposal["id"]
+        waits = config.AUTO_SUBMIT_WAITS
+        timer = tab.timer
+
+        # 4. Click Apply — re-resolved because the page may have re-rendered
+        #    while the tab waited; the cached selector makes this instant
+        apply_btn = _find_element(page, APPLY_BUTTON_SELECTORS, "Apply button", timeout=waits["apply_button"])
+        if not apply_btn:
+            reason = "Apply button disappeared before submitting"
+            logger.warning(f"[Proposal {proposal_id}] {reason}")
+            self._fail(tab, reason)
+            _take_screenshot(page, proposal_id, "no-apply-button")
+            return False
 
-            # 5. Wait for the proposal form to load
-            self.page.wait_for_load_state("domcontentloaded", timeout=config.SCRAPE_TIMEOUT)
-            _wait_for_cloudflare(self.page)
-            # Give the SPA time to render the form
-            self.page.wait_for_timeout(3000)
+        apply_btn.click()
+        logger.info(f"[Proposal {proposal_id}] Clicked Apply button")
 
-            # 6. Fill in the cover letter
+        # 5. The form is ready once the cover letter is visible; a challenge
+        #    after the click gets one more wait
+        with timer.step("form"):
             cover_letter_el = _find_element(
-                self.page, COVER_LETTER_SELECTORS, "cover letter textarea", timeout=15000
+                page, COVER_LETTER_SELECTORS, "cover letter textarea", timeout=waits["form"]
             )
-            if not cover_letter_el:
-                reason = "Cover letter textarea not found — unexpected form layout"
-                logger.warning(f"[Proposal {proposal_id}] {reason}")
-                _mark_failed(proposal_id, reason)
-                _take_screenshot(self.page, proposal_id, "no-cover-letter")
-                return False
-
-            # Clear existing content and type the proposal
+            if not cover_letter_el and _wait_for_cloudflare(page):
+                cover_letter_el = _find_element(
+                    page, COVER_LETTER_SELECTORS, "cover letter textarea", timeout=waits["form"]
+                )
+        if not cover_letter_el:
+            reason = "Cover letter textarea not found — unexpected form layout"
+            logger.warning(f"[Proposal {proposal_id}] {reason}")
+            self._fail(tab, reason)
+            _take_screenshot(page, proposal_id, "no-cover-letter")
+            return False
+
+        # 6. Clear existing content and type the proposal
+        with timer.step("cover_letter"):
             cover_letter_el.click()
             cover_letter_el.fill("")
             cover_letter_el.type(proposal["proposal_text"], delay=5)
-            logger.info(f"[Proposal {proposal_id}] Filled cover letter ({len(proposal['proposal_text'])} chars)")
+        logger.info(f"[Proposal {proposal_id}] Filled cover letter ({len(proposal['proposal_text'])} chars)")
 
-            # 7. Set the bid amount (fixed-price jobs)
-            bid_amount = _parse_bid_from_budget(proposal.get("budget", ""))
-            if bid_amount is None:
-                bid_amount = config.AUTO_SUBMIT_DEFAULT_BID
+        # 7. Set the bid amount (fixed-price jobs)
+        bid_amount = _parse_bid_from_budget(proposal.get("budget", ""))
+        if bid_amount is None:
+            bid_amount = config.AUTO_SUBMIT_DEFAULT_BID
 
+        with timer.step("bid"):
             bid_input = _find_element(
-                self.page, BID_INPUT_SELECTORS, "bid input", timeout=5000
+                page, BID_INPUT_SELECTORS, "bid input", timeout=waits["bid_input"]
             )
             if bid_input:
                 bid_input.click()
                 bid_input.fill("")
                 bid_input.type(str(int(bid_amount)), delay=20)
-                logger.info(f"[Proposal {proposal_id}] Set bid amount: ${int(bid_amount)}")
-            else:
-                logger.info(
-                    f"[Proposal {proposal_id}] No bid input found — "
-                    "may be hourly or bid is pre-filled"
-                )
+        if bid_input:
+            logger.info(f"[Proposal {proposal_id}] Set bid amount: ${int(bid_amount)}")
+        else:
+            logger.info(
+                f"[Proposal {proposal_id}] No bid input found — "
+                "may be hourly or bid is pre-filled"
+            )
 
-            # 8. Take pre-submit screenshot for audit
-            _take_screenshot(self.page, proposal_id, "pre-submit")
+        self._advance(tab, "form_filled")
 
-            # 9. Scroll to bottom to make submit button visible
-            self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            self.page.wait_for_timeout(1000)
+        # 8. Take pre-submit screenshot for audit
+        with timer.step("pre_screenshot"):
+            _take_screenshot(page, proposal_id, "pre-submit")
 
-            # 10. Click Submit
+        # 9. Find Submit (click() scrolls it into view itself)
+        with timer.step("submit_button"):
             submit_btn = _find_element(
-                self.page, SUBMIT_BUTTON_SELECTORS, "Submit button", timeout=10000
+                page, SUBMIT_BUTTON_SELECTORS, "Submit button", timeout=waits["submit_button"]
             )
-            if not submit_btn:
-                reason = "Submit button not found — form may require additional fields"
-                logger.warning(f"[Proposal {proposal_id}] {reason}")
-                _mark_failed(proposal_id, reason)
-                _take_screenshot(self.page, proposal_id, "no-submit-button")
-                return False
-
-            submit_btn.click()
-            logger.info(f"[Proposal {proposal_id}] Clicked Submit")
-
-            # 11. Wait for confirmation / navigation after submit
-            try:
-                self.page.wait_for_load_state("networkidle", timeout=15000)
-            except Exception:
-                pass  # Sometimes Upwork doesn't fully settle, that's OK
-
-            # Brief pause for the page to process
-            self.page.wait_for_timeout(2000)
-
-            # 12. Take post-submit screenshot
-            _take_screenshot(self.page, proposal_id, "post-submit")
-
-            # 13. Check for success indicators
-            success = self._check_submission_success()
-            if success:
-                _mark_sent(proposal_id)
-                logger.info(f"[Proposal {proposal_id}] Successfully submitted")
-                return True
-            else:
-                # Even without a clear success signal, the click went through.
-                # Mark as sent but log the ambiguity.
-                _mark_sent(proposal_id)
-                logger.warning(
-                    f"[Proposal {proposal_id}] Submit clicked but could not confirm "
-                    "success — marked as sent. Check screenshot."
-                )
-                return True
-
-        except Exception as e:
-            reason = f"Unexpected error: {str(e)[:400]}"
-            logger.error(f"[Proposal {proposal_id}] {reason}")
-            _mark_failed(proposal_id, reason)
-            _take_screenshot(self.page, proposal_id, "error")
+        if not submit_btn:
+            reason = "Submit button not found — form may require additional fields"
+            logger.warning(f"[Proposal {proposal_id}] {reason}")
+            self._fail(tab, reason)
+            _take_screenshot(page, proposal_id, "no-submit-button")
             return False
 
-    def _check_submission_success(self) -> bool:
-        """Check whether the proposal was submitted successfully.
+        # 10. Record the click *before* making it, so a crash right after can't cause a second bid
+        self._advance(tab, "submitted_clicked")
 
-        Looks for common success indicators on the page.
-        """
+        # 11. Click Submit and wait for the submit request's own response or a success page
+        submit_responses = []
+
+        def on_response(response):
+            if _is_submit_request(response.request):
+                submit_responses.append(response)
+
+        form_url = page.url
+        page.on("response", on_response)
         try:
-            page_text = (self.page.text_content("body") or "").lower()
-            url = self.page.url.lower()
-
-            success_phrases = [
-                "proposal submitted",
-                "proposal was submitted",
-                "successfully submitted",
-                "thank you for submitting",
-                "your proposal",
-            ]
-
-            # Check URL for success indicators
-            if "proposals" in url and "submit" not in url:
-                return True
+            with timer.step("confirmation"):
+                submit_btn.click()
+                logger.info(f"[Proposal {proposal_id}] Clicked Submit")
+                signal = _wait_for_confirmation(page, form_url, submit_responses, waits["confirmation"])
+        finally:
+            page.remove_listener("response", on_response)
+
+        if signal == "rejected":
+            status = next(r.status for r in submit_responses if r.status >= 400)
+            reason = f"Submit request returned HTTP {status}"
+            logger.warning(f"[Proposal {proposal_id}] {reason}")
+            _take_screenshot(page, proposal_id, "submit-error")
+            self._fail(tab, reason)
+            return False
+
+        # 12. Take post-submit screenshot
+        with timer.step("post_screenshot"):
+            _take_screenshot(page, proposal_id, "post-submit")
+
+        # 13. Only a visible confirmation settles it; otherwise the next run
+        #     reconciles against the job page instead of bidding again
+        if signal or _check_submission_success(page, form_url):
+            self._confirm(tab)
+            logger.info(f"[Proposal {proposal_id}] Successfully submitted (confirmed by {signal or 'page'})")
+            return True
+
+        logger.warning(
+            f"[Proposal {proposal_id}] Submit clicked but not confirmed within "
+            f"{waits['confirmation']}ms — left in submitted_clicked for reconciliation. Check screenshot."
+        )
+        return False
+
 
-            # Check page content
-            for phrase in success_phrases:
-                if phrase in page_text:
-                    return True
+class _Tab:
+    """One proposal's page on its way through the submitter."""
 
+    def __init__(self, page, proposal: dict):
+        self.page = page
+        self.proposal = proposal
+        self.timer = _StepTimer()
+        self.navigating = False
+        self.prepared = False
+        self.ready = False       # Apply button found
+        self.attempted = False   # form interaction started — counts for pacing
+        self.owner = None
+        self.state = None        # persisted submit_state
+        self.settled = False     # confirmed/failed (or taken over) — lease needs no release
+        self.reconciled = False  # found already applied, marked sent without a new bid
+
+    def close(self):
+        try:
+            self.page.close()
         except Exception:
             pass
 
-        return False
+
+def _log_timings(tab: _Tab):
+    summary = tab.timer.summary()
+    last_submit_timings.clear()
+    last_submit_timings.update({"proposal_id": tab.proposal["id"], **summary})
+    steps = ", ".join(f"{name} {sec}s" for name, sec in summary["steps"].items())
+    logger.info(f"[Proposal {tab.proposal['id']}] ⏱ {summary['total_sec']}s total — {steps}")
+
+
+def _check_submission_success(page, form_url: str) -> bool:
+    """Check whether the proposal was submitted successfully.
+
+    Looks for common success indicators on the page.
+    """
+    try:
+        page_text = (page.text_content("body") or "").lower()
+        url = page.url.lower()
+
+        # Only a known success route counts — the form itself lives under /proposals/
+        if _is_success_url(url, form_url.lower()):
+            return True
+
+        # Check page content
+        for phrase in SUCCESS_PHRASES:
+            if phrase in page_text:
+                return True
+
+    except Exception:
+        pass
+
+    return False
 
 
 # ---------------------------------------------------------------------------
@@ -471,17 +939,7 @@ def submit_approved_proposals() -> int:
         return 0
 
     try:
-        for i, proposal in enumerate(proposals):
-            success = submitter.submit_proposal(proposal)
-            if success:
-                submitted_count += 1
-
-            # Random delay between submissions (skip after last one)
-            if i < len(proposals) - 1:
-                delay = random.uniform(*config.AUTO_SUBMIT_DELAY)
-                logger.info(f"Waiting {delay:.1f}s before next submission...")
-                time.sleep(delay)
-
+        submitted_count = submitter.submit_pipelined(proposals)
     except Exception as e:
         logger.error(f"Submission loop error: {e}")
     finally:
@@ -0,0 +1,147 @@
+"""Browser Manager — one long-lived Playwright browser shared by every scrape.
+
+Playwright objects are bound to the event loop that created them, while
+FastAPI runs sync endpoints on worker threads. The manager therefore owns a
+dedicated thread with its own asyncio loop; callers hand it a coroutine
+function and block on the result:
+
+    get_browser_manager().run(lambda scraper: _scrape_keywords(scraper, keywords))
+
+The driver, browser and context stay warm between cycles, tabs are pooled
+and recycled after BROWSER_RECYCLE_AFTER navigations (see
+AsyncUpworkScraper.release_page), and the browser is restarted if it dies.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import threading
+import time
+
+import config
+from modules.job_scraper import AsyncUpworkScraper
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserManager:
+    """Owns the Playwright driver, browser and context for the process."""
+
+    def __init__(self):
+        self._loop = None
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._browser_lock = None
+        self._scraper = None
+        self.started_at = None
+        self.restarts = 0
+        self.runs = 0
+
+    def _ensure_thread(self):
+        with self._thread_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever, name="browser-manager", daemon=True
+            )
+            self._thread.start()
+
+    async def _ensure_browser(self) -> AsyncUpworkScraper:
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+        async with self._browser_lock:
+            if self._scraper is not None and self._scraper.is_alive():
+                return self._scraper
+            if self._scraper is not None:
+                logger.warning("Browser disconnected — restarting")
+                self.restarts += 1
+                await self._scraper.stop()
+            scraper = AsyncUpworkScraper()
+            await scraper.start_browser()
+            self._scraper = scraper
+            self.started_at = time.time()
+            return scraper
+
+    async def _run(self, coro_fn):
+        scraper = await self._ensure_browser()
+        self.runs += 1
+        try:
+            return await coro_fn(scraper)
+        except Exception:
+            if not scraper.is_alive():
+                logger.warning("Browser died mid-run; it will be restarted on next use")
+            raise
+
+    def run(self, coro_fn, timeout: float = None):
+        """Run coro_fn(scraper) on the manager loop and return its result.
+
+        Waits at most timeout seconds (default BROWSER_RUN_TIMEOUT), then
+        cancels the run and raises TimeoutError, so a hung CDP call can't
+        pin the calling API worker forever.
+        """
+        self._ensure_thread()
+        timeout = config.BROWSER_RUN_TIMEOUT if timeout is None else timeout
+        future = asyncio.run_coroutine_threadsafe(self._run(coro_fn), self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.error(f"Browser run exceeded {timeout}s — cancelled")
+            raise
+
+    def warm_up(self):
+        """Start the browser in the background so the first request pays nothing."""
+        self._ensure_thread()
+        future = asyncio.run_coroutine_threadsafe(self._ensure_browser(), self._loop)
+
+        def _report(f):
+            if not f.cancelled() and f.exception():
+                logger.warning(f"Browser warm-up failed: {f.exception()}")
+
+        future.add_done_callback(_report)
+
+    def shutdown(self):
+        """Stop the browser and the manager loop."""
+        if not self._loop or not self._thread or not self._thread.is_alive():
+            return
+
+        async def _stop():
+            if self._scraper is not None:
+                await self._scraper.stop()
+                self._scraper = None
+
+        try:
+            asyncio.run_coroutine_threadsafe(_stop(), self._loop).result(timeout=30)
+        except Exception as e:
+            logger.warning(f"Error stopping browser manager: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        logger.info("Browser manager stopped")
+
+    def stats(self) -> dict:
+        scraper = self._scraper
+        return {
+            "alive": bool(scraper and scraper.is_alive()),
+            "open_tabs": len(scraper._pages) if scraper else 0,
+            "idle_tabs": len(scraper._idle_pages) if scraper else 0,
+            "runs": self.runs,
+            "restarts": self.restarts,
+            "uptime_sec": round(time.time() - self.started_at) if self.started_at else 0,
+        }
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_browser_manager() -> BrowserManager:
+    """Return the process-wide browser manager, creating it on first use."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = BrowserManager()
+                atexit.register(_manager.shutdown)
+    return _manager
@@ -1,9 +1,8 @@
 """RSS Feed Monitor - Polls Upwork feeds for new jobs."""
 
-import feedparser
 import logging
 from datetime import datetime
-from db.database import exec_query, get_db
+from db.database import exec_query, insert_new_jobs
 import config
 
 logging.basicConfig(level=logging.INFO)
@@ -11,6 +10,8 @@ logger = logging.getLogger(__name__)
 
 def fetch_feed(feed_url):
     """Fetch and parse RSS feed."""
+    import feedparser
+
     try:
         feed = feedparser.parse(feed_url)
         if feed.bozo:
@@ -32,30 +33,13 @@ def extract_job_from_entry(entry):
             'budget': entry.get('budget', None),
             'category': entry.get('category', 'General'),
             'url': entry.get('link', ''),
-            'posted_at': datetime(*entry.published_parsed[:6]) if hasattr(entry, 'published_parsed') else datetime.now(),
+            # published_parsed is UTC; insert_new_jobs() falls back to UTC now
+            'posted_at': datetime(*entry.published_parsed[:6]) if entry.get('published_parsed') else None,
         }
     except Exception as e:
         logger.error(f"Error extracting job from entry: {e}")
         return None
 
-def job_exists(job_id):
-    """Check if job already in database."""
-    result = exec_query(
-        "SELECT id FROM jobs WHERE id = ?",
-        (job_id,),
-        fetch=True
-    )
-    return len(result) > 0
-
-def insert_job(job_data):
-    """Insert new job into database."""
-    exec_query(
-        """INSERT INTO jobs (id, title, description, budget, category, url, posted_at, status)
-           VALUES (?, ?, ?, ?, ?, ?, ?, 'new')""",
-        (job_data['id'], job_data['title'], job_data['description'],
-         job_data['budget'], job_data['category'], job_data['url'], job_data['posted_at'])
-    )
-
 def log_feed_fetch(feed_url, new_jobs, duplicates, errors=None):
     """Log feed fetch cycle."""
     exec_query(
@@ -75,19 +59,14 @@ def monitor_feeds():
             log_feed_fetch(feed_url, 0, 0, "Failed to fetch feed")
             continue
         
-        new_jobs = 0
-        duplicates = 0
-        
-        for entry in feed.entries:
-            job_data = extract_job_from_entry(entry)
-            if not job_data:
-                continue
-            
-            if job_exists(job_data['id']):
-                duplicates += 1
-            else:
-                insert_job(job_data)
-                new_jobs += 1
+        entries = [extract_job_from_entry(entry) for entry in feed.entries]
+        entries = [job_data for job_data in entries if job_data]
+
+        inserted = insert_new_jobs(entries)
+        new_jobs = len(inserted)
+        duplicates = len(entries) - new_jobs
+        for job_data in entries:
+            if job_data['id'] in inserted:
                 logger.info(f"✅ New job: {job_data['title'][:50]}...")
         
         log_feed_fetch(feed_url, new_jobs, duplicates)
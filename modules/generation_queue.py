@@ -0,0 +1,106 @@
+"""Generation Queue - decides which pending jobs get the day's proposals first.
+
+The daily cap is scarce, so pending jobs are ranked by how likely a
+proposal is to convert rather than by filter_score alone: a fresh job with
+few proposals beats an older, crowded one with a slightly higher score.
+Weights and the freshness decay live in config.GENERATION_PRIORITY.
+"""
+
+import logging
+import math
+import re
+from datetime import datetime, timezone
+
+from db.database import exec_query
+from modules.job_filter import extract_budget_amount
+import config
+
+logger = logging.getLogger(__name__)
+
+
+def _freshness(age_hours: float, cfg: dict) -> float:
+    """1.0 for a brand-new job, decaying towards 0 with age."""
+    age = max(0.0, age_hours)
+    decay = cfg.get("decay", "exponential")
+    if decay == "linear":
+        return max(0.0, 1.0 - age / cfg["max_age_hours"])
+    if decay == "step":
+        for hours, factor in cfg["step_hours"]:
+            if age <= hours:
+                return factor
+        return 0.1
+    return 0.5 ** (age / cfg["half_life_hours"])
+
+
+def _tier_factor(tier: str, cfg: dict) -> float:
+    """'Less than 5' / 'lessThan5' / '50+' → configured competition factor."""
+    key = re.sub(r"[^a-z0-9+]", "", (tier or "").lower())
+    return cfg["tier_factors"].get(key, cfg["unknown_tier_factor"])
+
+
+def budget_usd(budget: str, cfg: dict = None) -> float:
+    """Budget string → rough fixed-price USD ('$30-$50/hr' counts hourly_equiv_hours hours)."""
+    cfg = cfg or config.GENERATION_PRIORITY
+    amount = extract_budget_amount(budget) or 0
+    if budget and "/hr" in budget.lower():
+        amount *= cfg["hourly_equiv_hours"]
+    return float(amount)
+
+
+def priority(job: dict, cfg: dict = None) -> float:
+    """Conversion-weighted priority for a pending job (higher goes first).
+
+    job needs filter_score, budget, proposals_tier and age_hours.
+    """
+    cfg = cfg or config.GENERATION_PRIORITY
+    base = (
+        cfg["score_weight"] * (job.get("filter_score") or 0)
+        + cfg["budget_weight"] * math.log2(1 + budget_usd(job.get("budget"), cfg) / 100)
+    )
+    return base * _freshness(job.get("age_hours") or 0.0, cfg) * _tier_factor(job.get("proposals_tier"), cfg)
+
+
+def _age_hours(posted_at, fetched_at) -> float:
+    """Hours since posting, each column against its own clock (never negative).
+
+    posted_at is naive UTC; fetched_at, the fallback, is naive local time.
+    """
+    if posted_at is not None:
+        age = datetime.now(timezone.utc).replace(tzinfo=None) - posted_at
+    elif fetched_at is not None:
+        age = datetime.now() - fetched_at
+    else:
+        return 0.0
+    return max(0.0, age.total_seconds() / 3600)
+
+
+def rank_pending_jobs() -> tuple[list[str], int]:
+    """Due pending_proposal jobs by priority. Returns (job_ids, skipped_stale)."""
+    cfg = config.GENERATION_PRIORITY
+    rows = exec_query(
+        """SELECT id, filter_score, budget, proposals_tier, posted_at, fetched_at
+           FROM jobs
+           WHERE status = 'pending_proposal' AND (next_attempt_at IS NULL OR next_attempt_at <= ?)""",
+        (datetime.now(),),
+        fetch=True
+    )
+
+    fresh = []
+    stale = 0
+    for row in rows:
+        job = dict(row)
+        job["age_hours"] = _age_hours(job["posted_at"], job["fetched_at"])
+        if job["age_hours"] > cfg["max_age_hours"]:
+            stale += 1
+            continue
+        fresh.append((priority(job, cfg), job))
+
+    fresh.sort(key=lambda pair: pair[0], reverse=True)
+    if stale:
+        logger.info(f"Skipping {stale} pending jobs older than {cfg['max_age_hours']}h")
+    for score, job in fresh[:3]:
+        logger.info(
+            f"Queue: {job['id']} priority {score:.2f} "
+            f"(score {job['filter_score']}, {job['age_hours']:.1f}h old, {job['proposals_tier'] or '?'} proposals)"
+        )
+    return [job["id"] for _, job in fresh], stale
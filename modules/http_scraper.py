@@ -0,0 +1,183 @@
+"""Browser-free scraping — fetch search pages over HTTP and parse __NUXT__.
+
+Uses a keep-alive curl_cffi session per thread (TLS fingerprint of real
+Chrome) with cookies, including cf_clearance, loaded from the Playwright
+storage state in .browser_state/state.json. A Cloudflare challenge raises
+ChallengeDetected so scrape_jobs() can hand the remaining keywords to the
+browser path, which refreshes state.json on its way out. A page whose
+__NUXT__ script modules.nuxt_state can't evaluate raises NuxtParserGap
+instead: the keywords still go to the browser, but the log says the parser
+needs extending rather than blaming Cloudflare.
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+
+import config
+from modules.job_scraper import (
+    BROWSER_USER_AGENT,
+    STATE_DIR,
+    _build_search_url,
+    _ingest_keyword,
+    _next_page_step,
+    _normalize_nuxt_jobs,
+    _raw_job_from_payload,
+    _record_cycle,
+    load_watermarks,
+)
+from modules.nuxt_state import NuxtParseError, NuxtStateMissing, parse_nuxt_state
+
+logger = logging.getLogger(__name__)
+
+CHALLENGE_MARKERS = ("just a moment", "cf-chl", "challenge-platform", "verify you are human")
+
+_local = threading.local()
+
+
+class ChallengeDetected(Exception):
+    """Cloudflare (or another interstitial) answered instead of the search page."""
+
+
+class NuxtParserGap(Exception):
+    """The search page rendered, but its __NUXT__ script uses syntax we don't evaluate."""
+
+
+def _load_cookies(session):
+    """Copy Upwork cookies from the browser's saved storage state into the session."""
+    state_file = STATE_DIR / "state.json"
+    if not state_file.exists():
+        logger.info("No saved browser state — HTTP mode starts without cookies")
+        return 0
+    try:
+        with open(state_file) as f:
+            cookies = json.load(f).get("cookies", [])
+    except Exception as e:
+        logger.warning(f"Could not read {state_file}: {e}")
+        return 0
+
+    loaded = 0
+    for c in cookies:
+        if "upwork.com" not in c.get("domain", ""):
+            continue
+        session.cookies.set(c["name"], c["value"], domain=c["domain"], path=c.get("path", "/"))
+        loaded += 1
+    return loaded
+
+
+def get_session():
+    """Return this thread's pooled HTTP session, creating it on first use."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        from curl_cffi import requests as curl_requests
+
+        session = curl_requests.Session(impersonate=config.HTTP_IMPERSONATE)
+        session.headers.update({
+            "User-Agent": BROWSER_USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        loaded = _load_cookies(session)
+        logger.info(f"HTTP session ready ({loaded} cookies from browser state)")
+        _local.session = session
+    return session
+
+
+def reset_session():
+    """Drop this thread's session so the next fetch reloads cookies."""
+    session = getattr(_local, "session", None)
+    if session is not None:
+        session.close()
+        _local.session = None
+
+
+def fetch_search_page(keyword: str, page_num: int = 1) -> tuple[list[dict], dict]:
+    """Fetch one search page. Returns (jobs, paging) from the SSR __NUXT__ state."""
+    url = _build_search_url(keyword, page_num)
+    logger.info(f"Fetching (http): {keyword} (page {page_num})")
+
+    response = get_session().get(url, timeout=config.SCRAPE_TIMEOUT / 1000)
+    html = response.text or ""
+    head = html[:5000].lower()
+    if response.status_code in (403, 429, 503) or any(m in head for m in CHALLENGE_MARKERS):
+        raise ChallengeDetected(f"HTTP {response.status_code} on {url}")
+
+    try:
+        state = parse_nuxt_state(html).get("state") or {}
+    except NuxtStateMissing as e:
+        # A page without __NUXT__ is almost always an interstitial
+        raise ChallengeDetected(f"No __NUXT__ state on {url}: {e}") from e
+    except NuxtParseError as e:
+        raise NuxtParserGap(f"Unparsed __NUXT__ state on {url}: {e}") from e
+
+    search = state.get("jobsSearch") or {}
+    if not isinstance(search.get("jobs"), list):
+        # Not an empty result page — the state has a shape we don't know
+        raise NuxtParserGap(f"No jobsSearch.jobs in __NUXT__ state on {url}")
+    raw = [_raw_job_from_payload(j) for j in search["jobs"] if isinstance(j, dict)]
+    return _normalize_nuxt_jobs(raw), search.get("paging") or {}
+
+
+def scrape_keyword_http(keyword: str, watermark: dict | None = None) -> tuple[list[dict], bool]:
+    """Fetch up to SCRAPE_MAX_PAGES pages for a keyword over HTTP, stopping at the watermark.
+
+    Returns (jobs, complete). A failed page raises instead, so a keyword is
+    only ever ingested here after paging reached a real stopping point.
+    """
+    all_jobs = []
+    for page_num in range(1, config.SCRAPE_MAX_PAGES + 1):
+        jobs, paging = fetch_search_page(keyword, page_num)
+        if not jobs:
+            logger.info(f"No jobs on page {page_num} for '{keyword}', stopping")
+            return all_jobs, True
+        jobs, fetch_next = _next_page_step(keyword, page_num, jobs, paging, watermark)
+        all_jobs.extend(jobs)
+        if not fetch_next:
+            return all_jobs, True
+
+        time.sleep(random.uniform(*config.SCRAPE_PAGE_DELAY))
+    return all_jobs, True
+
+
+def scrape_keywords_http(keywords: list[str]) -> tuple[int, list[str]]:
+    """Scrape keywords over HTTP until challenged or a request fails.
+
+    Returns (new_jobs_inserted, keywords_left_for_the_browser).
+    """
+    started = time.monotonic()
+    total_found = 0
+    total_new = 0
+    watermarks = load_watermarks(keywords)
+
+    for i, keyword in enumerate(keywords):
+        try:
+            jobs, complete = scrape_keyword_http(keyword, watermarks.get(keyword))
+        except ChallengeDetected as e:
+            logger.warning(f"[{keyword}] {e}")
+            reset_session()
+            _record_cycle("http", started, i, total_found, total_new, 0)
+            return total_new, keywords[i:]
+        except NuxtParserGap as e:
+            logger.error(f"[{keyword}] ❌ nuxt_state parser gap — {e}")
+            _record_cycle("http", started, i, total_found, total_new, 0)
+            return total_new, keywords[i:]
+        except ImportError:
+            logger.error("curl_cffi is not installed — using the browser instead")
+            return total_new, keywords[i:]
+        except Exception as e:
+            # Timeouts, resets, DNS failures — the browser gets the rest, as for a challenge
+            logger.warning(f"[{keyword}] HTTP fetch failed ({type(e).__name__}: {e}) — handing off to the browser")
+            reset_session()
+            _record_cycle("http", started, i, total_found, total_new, 0)
+            return total_new, keywords[i:]
+
+        total_found += len(jobs)
+        total_new += _ingest_keyword(keyword, jobs, complete)
+
+        if i < len(keywords) - 1:
+            time.sleep(random.uniform(*config.SCRAPE_KEYWORD_DELAY))
+
+    _record_cycle("http", started, len(keywords), total_found, total_new, 0)
+    return total_new, []
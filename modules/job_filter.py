@@ -2,7 +2,10 @@
 
 import logging
 import re
-from db.database import exec_query
+import time
+from psycopg2.extras import execute_values
+from db.database import exec_query, transaction
+from modules import pipeline_events
 import config
 
 logging.basicConfig(level=logging.INFO)
@@ -34,25 +37,113 @@ def is_budget_acceptable(budget_str):
     else:
         return amount >= config.BUDGET_FILTERS['fixed_min']
 
+class KeywordMatcher:
+    """Blacklist + whitelist matcher compiled into one regex.
+
+    Keywords are lowercased once and folded into a character trie, which is
+    emitted as a single alternation inside a lookahead so one finditer()
+    pass visits every start position. At each position the regex yields the
+    longest keyword; every shorter keyword matching there is a prefix of it,
+    so those are precomputed per keyword. Semantics match plain substring
+    checks, including overlapping hits ("api" inside "zapier").
+    """
+
+    def __init__(self, blacklist, whitelist):
+        self.blacklist = set()
+        self.whitelist = {}  # keyword -> number of whitelist entries (duplicates score twice)
+        for keyword in blacklist:
+            self.blacklist.add(keyword.lower())
+        for keyword in whitelist:
+            keyword = keyword.lower()
+            self.whitelist[keyword] = self.whitelist.get(keyword, 0) + 1
+
+        # "" is a substring of everything — handle it without the regex
+        self.always_blacklisted = "" in self.blacklist
+        self.base_score = self.whitelist.get("", 0)
+
+        keywords = (self.blacklist | set(self.whitelist)) - {""}
+        self.prefixes = {
+            kw: [other for other in keywords if kw.startswith(other)]
+            for kw in keywords
+        }
+        self.pattern = (
+            re.compile("(?=(" + self._trie_regex(keywords) + "))") if keywords else None
+        )
+
+    @staticmethod
+    def _trie_regex(keywords):
+        trie = {}
+        for kw in keywords:
+            node = trie
+            for ch in kw:
+                node = node.setdefault(ch, {})
+            node[""] = True
+
+        def emit(node):
+            terminal = "" in node
+            branches = [re.escape(ch) + emit(child)
+                        for ch, child in sorted(node.items()) if ch != ""]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+            # Greedy optional keeps the longest keyword at each position
+            if terminal:
+                return "(?:" + body + ")?"
+            return body
+
+        return emit(trie)
+
+    def match(self, title, description):
+        """Return (blacklisted, whitelist_score) from one pass over the text."""
+        blacklisted = self.always_blacklisted
+        score = self.base_score
+        if self.pattern is None:
+            return blacklisted, score
+
+        full_text = (title + " " + description).lower()
+        seen = set()
+        for m in self.pattern.finditer(full_text):
+            longest = m.group(1)
+            if longest in seen:
+                continue
+            seen.add(longest)
+            seen.update(self.prefixes[longest])
+
+        for keyword in seen:
+            if keyword in self.blacklist:
+                blacklisted = True
+            score += self.whitelist.get(keyword, 0)
+        return blacklisted, score
+
+
+_matcher = None
+_matcher_key = None
+
+def get_keyword_matcher():
+    """Return the compiled matcher for the current KEYWORD_BLACKLIST/WHITELIST.
+
+    Rebuilt only when the config lists are replaced (see _apply_config in
+    main.py) or invalidate_keyword_matcher() is called.
+    """
+    global _matcher, _matcher_key
+    key = (id(config.KEYWORD_BLACKLIST), id(config.KEYWORD_WHITELIST))
+    if _matcher is None or _matcher_key != key:
+        _matcher = KeywordMatcher(config.KEYWORD_BLACKLIST, config.KEYWORD_WHITELIST)
+        _matcher_key = key
+    return _matcher
+
+def invalidate_keyword_matcher():
+    """Force a rebuild on next use (call after changing keyword lists)."""
+    global _matcher
+    _matcher = None
+
 def check_blacklist(title, description):
     """Return True if job matches any blacklist keyword."""
-    full_text = (title + " " + description).lower()
-    
-    for keyword in config.KEYWORD_BLACKLIST:
-        if keyword.lower() in full_text:
-            return True
-    return False
+    return get_keyword_matcher().match(title, description)[0]
 
 def score_whitelist(title, description):
     """Score job based on whitelist keyword hits."""
-    full_text = (title + " " + description).lower()
-    score = 0
-    
-    for keyword in config.KEYWORD_WHITELIST:
-        if keyword.lower() in full_text:
-            score += 1
-    
-    return score
+    return get_keyword_matcher().match(title, description)[1]
 
 def check_client_filters(job):
     """Check job against CLIENT_FILTERS config. Returns (pass, reason) tuple."""
@@ -98,13 +189,58 @@ def check_client_filters(job):
     return True, ""
 
 
+def evaluate_job(job):
+    """Decide a job's fate in memory. Returns (status, filter_reason, filter_score).
+
+    filter_reason / filter_score are None when the decision leaves that
+    column untouched.
+    """
+    blacklisted, score = get_keyword_matcher().match(job['title'], job['description'] or '')
+
+    # Check blacklist
+    if blacklisted:
+        return 'filtered_out', 'blacklist_match', None
+
+    # Check budget
+    if not is_budget_acceptable(job['budget']):
+        return 'filtered_out', 'low_budget', None
+
+    # Check client filters
+    client_pass, reason = check_client_filters(job)
+    if not client_pass:
+        return 'filtered_out', reason, None
+
+    # Score whitelist
+    if score >= config.FILTER_WHITELIST_MIN_SCORE:
+        return 'pending_proposal', None, score
+    return 'filtered_out', 'low_score', score
+
+def _publish_decision(job, status, reason, score):
+    pipeline_events.publish(
+        "filter_decision",
+        job_id=job['id'], title=job['title'], status=status, reason=reason, score=score,
+    )
+
+def _log_decision(job, status, reason, score, level=logging.INFO):
+    if status == 'pending_proposal':
+        logger.log(level, f"✅ Passed filter (score {score}): {job['title'][:50]}")
+    elif reason == 'blacklist_match':
+        logger.log(level, f"❌ Filtered out (blacklist): {job['title'][:50]}")
+    elif reason == 'low_budget':
+        logger.log(level, f"❌ Filtered out (budget): {job['title'][:50]}")
+    elif reason == 'low_score':
+        logger.log(level, f"❌ Filtered out (score {score}): {job['title'][:50]}")
+    else:
+        logger.log(level, f"❌ Filtered out ({reason}): {job['title'][:50]}")
+
+JOB_FILTER_COLUMNS = """id, title, description, budget, client_country, client_spent,
+                  client_verified, proposals_tier, experience_level, job_type"""
+
 def filter_job(job_id):
     """Filter a single job and update its status and score."""
     # Get job from DB (including new client columns)
     result = exec_query(
-        """SELECT id, title, description, budget, client_country, client_spent,
-                  client_verified, proposals_tier, experience_level, job_type
-           FROM jobs WHERE id = ?""",
+        f"SELECT {JOB_FILTER_COLUMNS} FROM jobs WHERE id = ?",
         (job_id,),
         fetch=True
     )
@@ -114,74 +250,94 @@ def filter_job(job_id):
         return False
 
     job = result[0]
+    status, reason, score = evaluate_job(job)
 
-    # Check blacklist
-    if check_blacklist(job['title'], job['description'] or ''):
-        exec_query(
-            "UPDATE jobs SET status = 'filtered_out', filter_reason = 'blacklist_match' WHERE id = ?",
-            (job_id,)
-        )
-        logger.info(f"❌ Filtered out (blacklist): {job['title'][:50]}")
-        return False
+    exec_query(
+        """UPDATE jobs SET status = ?, filter_reason = COALESCE(?, filter_reason),
+                           filter_score = COALESCE(?, filter_score)
+           WHERE id = ?""",
+        (status, reason, score, job_id)
+    )
+    _log_decision(job, status, reason, score)
+    _publish_decision(job, status, reason, score)
+    return status == 'pending_proposal'
 
-    # Check budget
-    if not is_budget_acceptable(job['budget']):
-        exec_query(
-            "UPDATE jobs SET status = 'filtered_out', filter_reason = 'low_budget' WHERE id = ?",
-            (job_id,)
-        )
-        logger.info(f"❌ Filtered out (budget): {job['title'][:50]}")
-        return False
+def filter_new_jobs_batch(chunk_size=None):
+    """Set-based filter run over every job with status='new'.
 
-    # Check client filters
-    client_pass, reason = check_client_filters(job)
-    if not client_pass:
-        exec_query(
-            "UPDATE jobs SET status = 'filtered_out', filter_reason = ? WHERE id = ?",
-            (reason, job_id)
-        )
-        logger.info(f"❌ Filtered out ({reason}): {job['title'][:50]}")
-        return False
+    Each chunk is claimed with SELECT ... FOR UPDATE SKIP LOCKED, evaluated
+    in memory, and written back with a single UPDATE ... FROM (VALUES ...)
+    in the same transaction. Returns a stats dict including jobs_per_sec.
+    """
+    chunk_size = chunk_size or config.FILTER_BATCH_SIZE
+    passed = 0
+    filtered = 0
+    chunks = 0
+    start = time.monotonic()
 
-    # Score whitelist
-    score = score_whitelist(job['title'], job['description'] or '')
+    while True:
+        with transaction() as cursor:
+            cursor.execute(
+                f"""SELECT {JOB_FILTER_COLUMNS} FROM jobs
+                    WHERE status = 'new'
+                    ORDER BY posted_at DESC
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED""",
+                (chunk_size,)
+            )
+            jobs = cursor.fetchall()
+            if not jobs:
+                break
 
-    if score >= config.FILTER_WHITELIST_MIN_SCORE:
-        exec_query(
-            "UPDATE jobs SET status = 'pending_proposal', filter_score = ? WHERE id = ?",
-            (score, job_id)
-        )
-        logger.info(f"✅ Passed filter (score {score}): {job['title'][:50]}")
-        return True
-    else:
-        exec_query(
-            "UPDATE jobs SET status = 'filtered_out', filter_reason = 'low_score', filter_score = ? WHERE id = ?",
-            (score, job_id)
-        )
-        logger.info(f"❌ Filtered out (score {score}): {job['title'][:50]}")
-        return False
+            decisions = []
+            for job in jobs:
+                status, reason, score = evaluate_job(job)
+                decisions.append((job['id'], status, reason, score))
+                _log_decision(job, status, reason, score, level=logging.DEBUG)
+                if status == 'pending_proposal':
+                    passed += 1
+                else:
+                    filtered += 1
+
+            execute_values(
+                cursor,
+                """UPDATE jobs AS j
+                   SET status = v.status,
+                       filter_reason = COALESCE(v.filter_reason, j.filter_reason),
+                       filter_score = COALESCE(v.filter_score, j.filter_score)
+                   FROM (VALUES %s) AS v(id, status, filter_reason, filter_score)
+                   WHERE j.id = v.id""",
+                decisions,
+                template="(%s, %s, %s::text, %s::integer)",
+                page_size=len(decisions),
+            )
+        # Publish only once the chunk is committed
+        for job, (_, status, reason, score) in zip(jobs, decisions):
+            _publish_decision(job, status, reason, score)
+        chunks += 1
+
+    elapsed = time.monotonic() - start
+    total = passed + filtered
+    return {
+        "passed": passed,
+        "filtered": filtered,
+        "total": total,
+        "chunks": chunks,
+        "seconds": round(elapsed, 3),
+        "jobs_per_sec": round(total / elapsed, 1) if elapsed > 0 else 0.0,
+    }
 
 def filter_all_new_jobs():
     """Filter all jobs with status='new'."""
     logger.info("🔍 Starting job filter...")
-    
-    # Get all new jobs
-    new_jobs = exec_query(
-        "SELECT id FROM jobs WHERE status = 'new' ORDER BY posted_at DESC",
-        fetch=True
+
+    stats = filter_new_jobs_batch()
+
+    logger.info(
+        f"📊 Filter complete: {stats['passed']} passed, {stats['filtered']} filtered out "
+        f"({stats['jobs_per_sec']} jobs/sec over {stats['chunks']} chunks)"
     )
-    
-    passed = 0
-    filtered = 0
-    
-    for job in new_jobs:
-        if filter_job(job['id']):
-            passed += 1
-        else:
-            filtered += 1
-    
-    logger.info(f"📊 Filter complete: {passed} passed, {filtered} filtered out")
-    return passed, filtered
+    return stats['passed'], stats['filtered']
 
 if __name__ == "__main__":
     filter_all_new_jobs()
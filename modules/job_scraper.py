@@ -3,26 +3,37 @@
 Two modes:
 1. CDP (default): Connects to your real Chrome — no Cloudflare issues
    Start Chrome: /Applications/Google\\ Chrome.app/Contents/MacOS/Google\\ Chrome --remote-debugging-port=9222
-2. HTTP (experimental): Direct requests with curl_cffi — needs valid cf_clearance
+2. HTTP (SCRAPE_MODE = "http"): Direct requests with curl_cffi, parsing the
+   serialized __NUXT__ out of the HTML — reuses cf_clearance from
+   .browser_state/state.json and falls back to the browser on a challenge.
+   See modules/http_scraper.py.
 """
 
+import asyncio
 import json
 import logging
 import os
 import re
 import random
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from urllib.parse import quote_plus, urlencode
+from urllib.parse import quote_plus, urlencode, urlparse
 
 import config
-from db.database import exec_query
+from db.database import exec_query, insert_new_jobs
+from modules import pipeline_events
 
 logger = logging.getLogger(__name__)
 
 STATE_DIR = Path(__file__).parent.parent / ".browser_state"
 CDP_URL = os.getenv("CHROME_CDP_URL", "http://localhost:9222")
+# Shared by the standalone browser and the HTTP mode — cf_clearance is UA-bound
+BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/131.0.0.0 Safari/537.36"
+)
 
 
 def _build_search_url(keyword: str, page: int = 1) -> str:
@@ -34,66 +45,102 @@ def _build_search_url(keyword: str, page: int = 1) -> str:
     return "https://www.upwork.com/nx/search/jobs/?" + urlencode(params)
 
 
-def _extract_nuxt_jobs(page, feed_mode=False) -> list[dict]:
-    """Extract job data from __NUXT__ state via JS evaluation.
-
-    feed_mode: try multiple NUXT state paths (findWork, bestMatches, etc.)
-    """
-    raw = page.evaluate("""
-        ((feedMode) => {
-            let jobs = [];
-            if (feedMode) {
-                // Try multiple paths for feed pages (/nx/find-work/*)
-                const paths = [
-                    window.__NUXT__?.state?.findWork?.results,
-                    window.__NUXT__?.state?.findWork?.jobs,
-                    window.__NUXT__?.state?.bestMatches?.results,
-                    window.__NUXT__?.state?.bestMatches?.jobs,
-                    window.__NUXT__?.state?.mostRecentJobs?.results,
-                    window.__NUXT__?.state?.mostRecentJobs?.jobs,
-                    window.__NUXT__?.state?.jobsSearch?.jobs,
-                ];
-                for (const p of paths) {
-                    if (p && p.length > 0) { jobs = p; break; }
-                }
-                // Last resort: walk the state tree looking for an array of objects with 'title'
-                if (jobs.length === 0) {
-                    const state = window.__NUXT__?.state || {};
-                    for (const key of Object.keys(state)) {
-                        const val = state[key];
-                        if (val && typeof val === 'object') {
-                            for (const subkey of Object.keys(val)) {
-                                const arr = val[subkey];
-                                if (Array.isArray(arr) && arr.length > 0 && arr[0]?.title) {
-                                    jobs = arr;
-                                    break;
-                                }
+# JS run in the page to pull raw job objects out of __NUXT__ state.
+# feedMode: try multiple NUXT state paths (findWork, bestMatches, etc.)
+_NUXT_JOBS_JS = """
+    (feedMode) => {
+        let jobs = [];
+        if (feedMode) {
+            // Try multiple paths for feed pages (/nx/find-work/*)
+            const paths = [
+                window.__NUXT__?.state?.findWork?.results,
+                window.__NUXT__?.state?.findWork?.jobs,
+                window.__NUXT__?.state?.bestMatches?.results,
+                window.__NUXT__?.state?.bestMatches?.jobs,
+                window.__NUXT__?.state?.mostRecentJobs?.results,
+                window.__NUXT__?.state?.mostRecentJobs?.jobs,
+                window.__NUXT__?.state?.jobsSearch?.jobs,
+            ];
+            for (const p of paths) {
+                if (p && p.length > 0) { jobs = p; break; }
+            }
+            // Last resort: walk the state tree looking for an array of objects with 'title'
+            if (jobs.length === 0) {
+                const state = window.__NUXT__?.state || {};
+                for (const key of Object.keys(state)) {
+                    const val = state[key];
+                    if (val && typeof val === 'object') {
+                        for (const subkey of Object.keys(val)) {
+                            const arr = val[subkey];
+                            if (Array.isArray(arr) && arr.length > 0 && arr[0]?.title) {
+                                jobs = arr;
+                                break;
                             }
                         }
-                        if (jobs.length > 0) break;
                     }
+                    if (jobs.length > 0) break;
+                }
+            }
+        } else {
+            jobs = window.__NUXT__?.state?.jobsSearch?.jobs || [];
+        }
+        return jobs.map(j => ({
+            id: j.ciphertext?.replace('~0', '') || j.uid || '',
+            title: j.title || '',
+            ciphertext: j.ciphertext || '',
+            description: (j.description || '').slice(0, 2000),
+            budget_amount: j.amount?.amount || 0,
+            hourly_min: j.hourlyBudget?.min || 0,
+            hourly_max: j.hourlyBudget?.max || 0,
+            published_on: j.publishedOn || '',
+            client_country: j.client?.location?.country || '',
+            client_spent: j.client?.totalSpent || '0',
+            client_verified: j.client?.isPaymentVerified || false,
+            proposals_tier: j.proposalsTier || '',
+            tier_text: j.tierText || '',
+            type: j.type || 0,
+        }));
+    }
+"""
+
+# Resolves truthy once search results have hydrated into __NUXT__
+_SEARCH_READY_JS = "() => window.__NUXT__?.state?.jobsSearch?.jobs?.length > 0"
+# Search state rendered at all — distinguishes "no results" from a page that never loaded
+_SEARCH_STATE_JS = "() => Array.isArray(window.__NUXT__?.state?.jobsSearch?.jobs)"
+
+# Feed pages: any NUXT state module holding an array of job-like objects
+_FEED_READY_JS = """
+    () => {
+        const s = window.__NUXT__?.state || {};
+        for (const k of Object.keys(s)) {
+            const v = s[k];
+            if (v && typeof v === 'object') {
+                for (const sk of Object.keys(v)) {
+                    const arr = v[sk];
+                    if (Array.isArray(arr) && arr.length > 0 && arr[0]?.title) return true;
                 }
-            } else {
-                jobs = window.__NUXT__?.state?.jobsSearch?.jobs || [];
             }
-            return jobs.map(j => ({
-                id: j.ciphertext?.replace('~0', '') || j.uid || '',
-                title: j.title || '',
-                ciphertext: j.ciphertext || '',
-                description: (j.description || '').slice(0, 2000),
-                budget_amount: j.amount?.amount || 0,
-                hourly_min: j.hourlyBudget?.min || 0,
-                hourly_max: j.hourlyBudget?.max || 0,
-                published_on: j.publishedOn || '',
-                client_country: j.client?.location?.country || '',
-                client_spent: j.client?.totalSpent || '0',
-                client_verified: j.client?.isPaymentVerified || false,
-                proposals_tier: j.proposalsTier || '',
-                tier_text: j.tierText || '',
-                type: j.type || 0,
-            }));
-        })(%s)
-    """ % ("true" if feed_mode else "false"))
+        }
+        return false;
+    }
+"""
+
+_FEED_TILES_JS = (
+    "() => document.querySelectorAll('[data-test=\"JobTile\"], "
+    "[data-test=\"job-tile-list\"] > *').length > 0"
+)
+
+
+def _extract_nuxt_jobs(page, feed_mode=False) -> list[dict]:
+    """Extract job data from __NUXT__ state via JS evaluation.
+
+    feed_mode: try multiple NUXT state paths (findWork, bestMatches, etc.)
+    """
+    return _normalize_nuxt_jobs(page.evaluate(_NUXT_JOBS_JS, feed_mode))
+
+
+def _normalize_nuxt_jobs(raw) -> list[dict]:
+    """Turn raw job objects from _NUXT_JOBS_JS into DB-ready job dicts."""
     if not raw:
         return []
 
@@ -127,14 +174,474 @@ def _extract_nuxt_jobs(page, feed_mode=False) -> list[dict]:
     return jobs
 
 
+_NUXT_PAGING_JS = """
+    (() => {
+        const p = window.__NUXT__?.state?.jobsSearch?.paging;
+        return p ? { total: p.total, offset: p.offset, count: p.count } : null;
+    })()
+"""
+
+
 def _extract_nuxt_paging(page) -> dict:
-    """Get paging info from __NUXT__ state."""
-    return page.evaluate("""
-        (() => {
-            const p = window.__NUXT__?.state?.jobsSearch?.paging;
-            return p ? { total: p.total, offset: p.offset, count: p.count } : null;
-        })()
-    """) or {}
+    """Get paging info from __NUXT__ state ({} if the page has none)."""
+    try:
+        return page.evaluate(_NUXT_PAGING_JS) or {}
+    except Exception:
+        return {}
+
+
+# ── Incremental paging ───────────────────────────────────────────────────
+#
+# Search results are sorted newest-first (SEARCH_FILTERS sort=recency), so
+# once a page reaches the newest job stored for a keyword last cycle,
+# everything after it is already in the DB. The watermark is keyed on the
+# page-1 search URL too, so changing SEARCH_FILTERS invalidates it.
+
+def _watermarks_enabled() -> bool:
+    return config.SCRAPE_INCREMENTAL and config.SEARCH_FILTERS.get("sort") == "recency"
+
+
+def _parse_published(value):
+    """ISO publishedOn string → aware datetime, or None."""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def load_watermarks(keywords: list[str]) -> dict[str, dict]:
+    """Return {keyword: {"job_id", "published_on"}} for watermarks still valid."""
+    if not _watermarks_enabled() or not keywords:
+        return {}
+    try:
+        rows = exec_query(
+            """SELECT keyword, search_url, last_job_id, last_published_on
+               FROM scrape_watermarks WHERE keyword = ANY(%s)""",
+            (list(keywords),),
+            fetch=True,
+        )
+    except Exception as e:
+        logger.warning(f"Could not load scrape watermarks, paging in full: {e}")
+        return {}
+    return {
+        r["keyword"]: {"job_id": r["last_job_id"], "published_on": r["last_published_on"]}
+        for r in rows
+        if r["search_url"] == _build_search_url(r["keyword"])
+    }
+
+
+def _save_watermark(keyword: str, newest: dict):
+    exec_query(
+        """INSERT INTO scrape_watermarks (keyword, search_url, last_job_id, last_published_on, updated_at)
+           VALUES (%s, %s, %s, %s, %s)
+           ON CONFLICT (keyword) DO UPDATE SET
+               search_url = EXCLUDED.search_url,
+               last_job_id = EXCLUDED.last_job_id,
+               last_published_on = EXCLUDED.last_published_on,
+               updated_at = EXCLUDED.updated_at""",
+        (keyword, _build_search_url(keyword), newest["id"],
+         newest.get("posted_at") or "", datetime.now().isoformat()),
+    )
+
+
+def _cut_at_watermark(jobs: list[dict], watermark: dict | None) -> tuple[list[dict], bool]:
+    """Drop jobs at/after the watermark. Returns (unseen_jobs, crossed)."""
+    if not watermark:
+        return jobs, False
+    mark_ts = _parse_published(watermark.get("published_on"))
+    for i, job in enumerate(jobs):
+        if job["id"] == watermark["job_id"]:
+            return jobs[:i], True
+        ts = _parse_published(job.get("posted_at"))
+        # Strictly older only — several jobs can share a publish second
+        if mark_ts and ts and ts < mark_ts:
+            return jobs[:i], True
+    return jobs, False
+
+
+def _has_next_page(paging: dict, page_num: int) -> bool:
+    """False when __NUXT__ paging says page_num was the last page of results."""
+    total, count = paging.get("total"), paging.get("count")
+    if not isinstance(total, int) or not isinstance(count, int) or count <= 0:
+        return True
+    offset = paging.get("offset")
+    if not isinstance(offset, int):
+        offset = (page_num - 1) * count
+    return offset + count < total
+
+
+class SearchPageAborted(Exception):
+    """A search page never showed results: unresolved challenge or no search state.
+
+    Unlike an empty result page this says nothing about older jobs, so the
+    keyword's watermark must not move past them.
+    """
+
+
+def _next_page_step(keyword: str, page_num: int, jobs: list[dict],
+                    paging: dict, watermark: dict | None) -> tuple[list[dict], bool]:
+    """Trim one search page at the watermark. Returns (jobs_to_keep, fetch_next).
+
+    fetch_next is False only at a real stopping point: the old watermark was
+    crossed, paging is exhausted, or SCRAPE_MAX_PAGES (the deliberate per-cycle
+    depth) was reached — each of which makes the page set safe to watermark.
+    """
+    kept, crossed = _cut_at_watermark(jobs, watermark)
+    logger.info(f"Found {len(jobs)} jobs on page {page_num} for '{keyword}' ({len(kept)} unseen)")
+    if crossed:
+        logger.info(f"[{keyword}] reached last cycle's newest job on page {page_num}, stopping")
+        return kept, False
+    if not _has_next_page(paging, page_num):
+        logger.info(f"[{keyword}] page {page_num} is the last of {paging.get('total')} results")
+        return kept, False
+    return kept, page_num < config.SCRAPE_MAX_PAGES
+
+
+# ── Network-response capture ─────────────────────────────────────────────
+#
+# Alternative to waiting for __NUXT__ hydration: listen for the JSON/GraphQL
+# payloads the page fetches and parse jobs straight from the response bytes.
+# Payload items are mapped onto the same raw shape _NUXT_JOBS_JS returns, so
+# _normalize_nuxt_jobs() produces identical dicts either way.
+
+def _is_job_payload_response(response) -> bool:
+    """Cheap header/URL check run on every response the page receives."""
+    try:
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return False
+        if not any(p in response.url for p in config.SCRAPE_CAPTURE_URL_PATTERNS):
+            return False
+        return "json" in (response.headers.get("content-type") or "")
+    except Exception:
+        return False
+
+
+def _dig(obj, *keys, default=None):
+    for key in keys:
+        if not isinstance(obj, dict):
+            return default
+        obj = obj.get(key)
+    return default if obj is None else obj
+
+
+def _as_number(value):
+    if isinstance(value, dict):
+        value = value.get("amount")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0
+    return int(number) if number.is_integer() else number
+
+
+def _raw_job_from_payload(item: dict) -> dict:
+    """Map a search/feed API job object (NUXT-style or GraphQL jobTile) to raw shape."""
+    job = _dig(item, "jobTile", "job", default={})
+    client = item.get("client") or _dig(item, "upworkHistoryData", "client", default={})
+
+    ciphertext = item.get("ciphertext") or job.get("ciphertext") or ""
+    job_type = item.get("type")
+    if job_type is None:
+        job_type = 1 if str(job.get("jobType", "")).upper() == "HOURLY" else 0
+    verified = client.get("isPaymentVerified")
+    if verified is None:
+        verified = client.get("paymentVerificationStatus") == "VERIFIED"
+
+    return {
+        "id": ciphertext.replace("~0", "", 1) or str(item.get("uid") or item.get("id") or ""),
+        "title": item.get("title") or "",
+        "ciphertext": ciphertext,
+        "description": (item.get("description") or "")[:2000],
+        "budget_amount": _as_number(item.get("amount") or job.get("fixedPriceAmount")),
+        "hourly_min": _as_number(_dig(item, "hourlyBudget", "min") or job.get("hourlyBudgetMin")),
+        "hourly_max": _as_number(_dig(item, "hourlyBudget", "max") or job.get("hourlyBudgetMax")),
+        "published_on": item.get("publishedOn") or job.get("publishTime") or job.get("createTime") or "",
+        "client_country": _dig(client, "location", "country") or client.get("country") or "",
+        "client_spent": str(_as_number(client.get("totalSpent"))),
+        "client_verified": bool(verified),
+        "proposals_tier": item.get("proposalsTier") or "",
+        "tier_text": item.get("tierText") or job.get("contractorTier") or "",
+        "type": job_type,
+    }
+
+
+def _find_job_array(data):
+    """Depth-first search for the first list of objects that look like jobs."""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            if node and isinstance(node[0], dict) and node[0].get("title") and (
+                "ciphertext" in node[0] or "jobTile" in node[0] or "uid" in node[0]
+            ):
+                return node
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            stack.extend(reversed(list(node.values())))
+    return None
+
+
+def _jobs_from_payload(data) -> list[dict]:
+    """Parse normalized jobs out of a decoded JSON payload ([] if none)."""
+    items = _find_job_array(data)
+    if not items:
+        return []
+    return _normalize_nuxt_jobs([_raw_job_from_payload(i) for i in items if isinstance(i, dict)])
+
+
+class _PayloadCapture:
+    """Response matching and payload parsing shared by the sync and async capture.
+
+    Only the I/O differs between _capture_jobs() and _capture_jobs_async():
+    they attach listen() as the page's response listener, feed bodies and the
+    inline __NUXT__ state in here, and wait for more responses while
+    remaining_ms() is positive. Responses that arrive while a body is being
+    read are buffered, so the drivers drain pending() before every wait and
+    once more before giving up.
+    """
+
+    def __init__(self, notify=None):
+        self.inline_checked = False
+        self._responses = []
+        self._checked = 0
+        self._deadline = None
+        self._notify = notify    # called on every job-payload response
+
+    def listen(self, response):
+        if not _is_job_payload_response(response):
+            return
+        self._responses.append(response)
+        if self._notify:
+            self._notify()
+
+    def start_clock(self):
+        self._deadline = time.monotonic() + config.SCRAPE_CAPTURE_TIMEOUT / 1000
+
+    def has_pending(self) -> bool:
+        return self._checked < len(self._responses)
+
+    def pending(self) -> list:
+        """Job-payload responses received since the last call."""
+        new = self._responses[self._checked:]
+        self._checked += len(new)
+        return new
+
+    def jobs_from_body(self, response, body) -> list[dict]:
+        try:
+            jobs = _jobs_from_payload(json.loads(body))
+        except Exception:
+            return []
+        if jobs:
+            logger.debug(f"Captured {len(jobs)} jobs from {response.url}")
+        return jobs
+
+    def jobs_from_inline(self, raw) -> list[dict]:
+        self.inline_checked = True
+        return _normalize_nuxt_jobs(raw)
+
+    def remaining_ms(self) -> float:
+        return (self._deadline - time.monotonic()) * 1000
+
+
+def _read_pending(capture: _PayloadCapture) -> list[dict]:
+    for response in capture.pending():
+        try:
+            body = response.body()
+        except Exception:
+            continue
+        jobs = capture.jobs_from_body(response, body)
+        if jobs:
+            return jobs
+    return []
+
+
+async def _read_pending_async(capture: _PayloadCapture) -> list[dict]:
+    for response in capture.pending():
+        try:
+            body = await response.body()
+        except Exception:
+            continue
+        jobs = capture.jobs_from_body(response, body)
+        if jobs:
+            return jobs
+    return []
+
+
+def _capture_jobs(page, url: str, feed_mode: bool = False) -> list[dict]:
+    """Navigate and return jobs parsed from captured payloads ([] if none seen).
+
+    SSR pages embed their first results in the document rather than an XHR,
+    so once DOMContentLoaded fires the inline __NUXT__ state is read once
+    (no hydration polling) before waiting for further payloads.
+    """
+    capture = _PayloadCapture()
+    page.on("response", capture.listen)
+    try:
+        page.goto(url, wait_until="domcontentloaded", timeout=config.SCRAPE_TIMEOUT)
+        capture.start_clock()
+        while True:
+            jobs = _read_pending(capture)
+            if jobs:
+                return jobs
+
+            if not capture.inline_checked:
+                jobs = capture.jobs_from_inline(page.evaluate(_NUXT_JOBS_JS, feed_mode))
+                if jobs:
+                    return jobs
+
+            # Sync Playwright only dispatches events inside its own calls, so
+            # anything buffered during body()/evaluate() is visible here
+            if capture.has_pending():
+                continue
+            remaining = capture.remaining_ms()
+            if remaining <= 0:
+                return _read_pending(capture)
+            try:
+                page.wait_for_event("response", predicate=_is_job_payload_response, timeout=remaining)
+            except Exception:
+                return _read_pending(capture)
+    finally:
+        page.remove_listener("response", capture.listen)
+
+
+async def _capture_jobs_async(page, url: str, feed_mode: bool = False) -> list[dict]:
+    """Async twin of _capture_jobs() — same _PayloadCapture, awaited I/O.
+
+    Waits on an event the listener sets, so a payload that lands while a
+    body is being read wakes the loop instead of being missed.
+    """
+    arrived = asyncio.Event()
+    capture = _PayloadCapture(notify=arrived.set)
+    page.on("response", capture.listen)
+    try:
+        await page.goto(url, wait_until="domcontentloaded", timeout=config.SCRAPE_TIMEOUT)
+        capture.start_clock()
+        while True:
+            arrived.clear()
+            jobs = await _read_pending_async(capture)
+            if jobs:
+                return jobs
+
+            if not capture.inline_checked:
+                jobs = capture.jobs_from_inline(await page.evaluate(_NUXT_JOBS_JS, feed_mode))
+                if jobs:
+                    return jobs
+
+            remaining = capture.remaining_ms()
+            if remaining <= 0:
+                return await _read_pending_async(capture)
+            try:
+                await asyncio.wait_for(arrived.wait(), remaining / 1000)
+            except asyncio.TimeoutError:
+                return await _read_pending_async(capture)
+    finally:
+        page.remove_listener("response", capture.listen)
+
+
+# ── Request blocking ─────────────────────────────────────────────────────
+
+# Rough transfer size per blocked request, for the "bytes saved" estimate.
+# Aborted requests never report a size, so this is an approximation.
+_EST_BYTES_BY_TYPE = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 60_000,
+    "stylesheet": 50_000,
+    "script": 80_000,
+}
+
+
+def _host_matches(host: str, patterns) -> bool:
+    return any(host == p or host.endswith("." + p) for p in patterns)
+
+
+class RouteBlocker:
+    """Route-interception profile installed on each scraper tab.
+
+    Aborts non-essential resource types and short-circuits deny-listed
+    (analytics/ads) hosts with an empty 204, so page scripts that await
+    them don't error. Installed per page rather than per context because in
+    CDP mode the context is the user's own Chrome profile.
+    """
+
+    def __init__(self, profile: dict):
+        self.resource_types = set(profile.get("resource_types", []))
+        self.allow_hosts = profile.get("allow_hosts", [])
+        self.deny_hosts = profile.get("deny_hosts", [])
+        self.block_third_party = profile.get("block_third_party", False)
+        self.reset()
+
+    def reset(self):
+        self.stats = {"requests": 0, "blocked": 0, "est_bytes_saved": 0, "by_type": {}}
+
+    def decide(self, request) -> str:
+        """Return 'continue', 'abort', or 'fulfill' for a request."""
+        host = urlparse(request.url).hostname or ""
+        if _host_matches(host, self.deny_hosts):
+            return "fulfill"
+        if self.block_third_party and not _host_matches(host, self.allow_hosts):
+            return "abort"
+        if request.resource_type in self.resource_types:
+            return "abort"
+        return "continue"
+
+    def _record(self, request, action: str):
+        self.stats["requests"] += 1
+        if action == "continue":
+            return
+        rtype = request.resource_type
+        self.stats["blocked"] += 1
+        self.stats["by_type"][rtype] = self.stats["by_type"].get(rtype, 0) + 1
+        self.stats["est_bytes_saved"] += _EST_BYTES_BY_TYPE.get(rtype, 5_000)
+
+    def handle(self, route):
+        action = self.decide(route.request)
+        self._record(route.request, action)
+        if action == "abort":
+            route.abort("blockedbyclient")
+        elif action == "fulfill":
+            route.fulfill(status=204, body="")
+        else:
+            route.continue_()
+
+    async def handle_async(self, route):
+        action = self.decide(route.request)
+        self._record(route.request, action)
+        if action == "abort":
+            await route.abort("blockedbyclient")
+        elif action == "fulfill":
+            await route.fulfill(status=204, body="")
+        else:
+            await route.continue_()
+
+    def log_page(self, label: str):
+        """Log and reset the counters for the page just scraped."""
+        s = self.stats
+        if s["requests"]:
+            logger.info(
+                f"[{label}] blocked {s['blocked']}/{s['requests']} requests "
+                f"(~{s['est_bytes_saved'] // 1024} KB saved) {s['by_type']}"
+            )
+        self.reset()
+
+
+def _make_blocker():
+    profile = config.SCRAPE_BLOCK_PROFILE
+    return RouteBlocker(profile) if profile.get("enabled") else None
+
+
+def _write_cookie_state(cookies: list[dict]):
+    """Save cookies in Playwright storage-state format (Upwork domain only)."""
+    try:
+        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(STATE_DIR / "state.json", "w") as f:
+            json.dump({"cookies": cookies, "origins": []}, f)
+        logger.info(f"Saved {len(cookies)} Upwork cookies to {STATE_DIR / 'state.json'}")
+    except Exception as e:
+        logger.warning(f"Could not save browser cookies: {e}")
 
 
 class UpworkScraper:
@@ -146,6 +653,11 @@ class UpworkScraper:
         self.page = None
         self.playwright = None
         self._using_cdp = False
+        self.blocker = _make_blocker()
+
+    def _install_blocker(self):
+        if self.blocker:
+            self.page.route("**/*", self.blocker.handle)
 
     def start_browser(self):
         """Connect to Chrome via CDP, or launch standalone as fallback."""
@@ -164,6 +676,7 @@ class UpworkScraper:
             else:
                 self.context = self.browser.new_context()
                 self.page = self.context.new_page()
+            self._install_blocker()
             logger.info(f"Connected to Chrome via CDP at {CDP_URL}")
             return
         except Exception as e:
@@ -182,106 +695,116 @@ class UpworkScraper:
 
         self.context = self.browser.new_context(
             storage_state=storage_state,
-            user_agent=(
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
+            user_agent=BROWSER_USER_AGENT,
             viewport={"width": 1920, "height": 1080},
         )
         self.context.add_init_script(
             "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
         )
         self.page = self.context.new_page()
+        self._install_blocker()
         logger.info("Standalone Chromium started")
 
     def scrape_search_page(self, keyword: str, page_num: int = 1) -> list[dict]:
         """Navigate to search URL and extract jobs from __NUXT__ state."""
+        try:
+            return self._scrape_search_page(keyword, page_num)
+        finally:
+            if self.blocker:
+                self.blocker.log_page(f"{keyword} p{page_num}")
+
+    def _scrape_search_page(self, keyword: str, page_num: int) -> list[dict]:
         url = _build_search_url(keyword, page_num)
         logger.info(f"Scraping: {keyword} (page {page_num})")
 
-        self.page.goto(url, wait_until="domcontentloaded", timeout=config.SCRAPE_TIMEOUT)
+        if config.SCRAPE_EXTRACTION_MODE == "network":
+            jobs = _capture_jobs(self.page, url)
+            if jobs:
+                return jobs
+            # Nothing usable on the wire — page is loaded, fall back to __NUXT__
+        else:
+            self.page.goto(url, wait_until="domcontentloaded", timeout=config.SCRAPE_TIMEOUT)
 
         # Wait for NUXT state to hydrate
         try:
-            self.page.wait_for_function(
-                "() => window.__NUXT__?.state?.jobsSearch?.jobs?.length > 0",
-                timeout=15000,
-            )
+            self.page.wait_for_function(_SEARCH_READY_JS, timeout=15000)
         except Exception:
             # Check for Cloudflare
             title = self.page.title()
             if "moment" in title.lower() or "verify" in title.lower():
                 logger.warning("Cloudflare challenge — waiting up to 60s...")
                 try:
-                    self.page.wait_for_function(
-                        "() => window.__NUXT__?.state?.jobsSearch?.jobs?.length > 0",
-                        timeout=60000,
-                    )
+                    self.page.wait_for_function(_SEARCH_READY_JS, timeout=60000)
                 except Exception:
                     debug_path = STATE_DIR / "debug_cloudflare.png"
                     STATE_DIR.mkdir(parents=True, exist_ok=True)
                     self.page.screenshot(path=str(debug_path))
-                    logger.error(f"Cloudflare not resolved — screenshot: {debug_path}")
-                    return []
-            else:
-                logger.warning(f"No jobs found on page (title: {title})")
+                    raise SearchPageAborted(f"Cloudflare not resolved — screenshot: {debug_path}")
+            elif self.page.evaluate(_SEARCH_STATE_JS):
+                logger.info(f"No results on page {page_num} for '{keyword}'")
                 return []
+            else:
+                raise SearchPageAborted(f"no search results state (title: {title})")
 
         return _extract_nuxt_jobs(self.page)
 
-    def scrape_keyword(self, keyword: str) -> list[dict]:
-        """Scrape up to SCRAPE_MAX_PAGES pages for a keyword."""
+    def scrape_keyword(self, keyword: str, watermark: dict | None = None) -> tuple[list[dict], bool]:
+        """Scrape up to SCRAPE_MAX_PAGES pages for a keyword, stopping at the watermark.
+
+        Returns (jobs, complete); complete is False when paging was cut short
+        by an aborted page, so the watermark must stay where it is.
+        """
         all_jobs = []
         for page_num in range(1, config.SCRAPE_MAX_PAGES + 1):
-            jobs = self.scrape_search_page(keyword, page_num)
+            try:
+                jobs = self.scrape_search_page(keyword, page_num)
+            except SearchPageAborted as e:
+                logger.warning(f"[{keyword}] page {page_num} aborted: {e}")
+                return all_jobs, False
 
             if not jobs:
                 logger.info(f"No jobs on page {page_num} for '{keyword}', stopping")
-                break
+                return all_jobs, True
 
+            jobs, fetch_next = _next_page_step(
+                keyword, page_num, jobs, _extract_nuxt_paging(self.page), watermark
+            )
             all_jobs.extend(jobs)
-            logger.info(f"Found {len(jobs)} jobs on page {page_num}")
+            if not fetch_next:
+                return all_jobs, True
 
-            if page_num < config.SCRAPE_MAX_PAGES:
-                delay = random.uniform(*config.SCRAPE_PAGE_DELAY)
-                time.sleep(delay)
+            delay = random.uniform(*config.SCRAPE_PAGE_DELAY)
+            time.sleep(delay)
 
-        return all_jobs
+        return all_jobs, True
 
     def scrape_feed_page(self, url: str) -> list[dict]:
         """Navigate to an Upwork feed URL (best-matches, most-recent) and extract jobs."""
+        try:
+            return self._scrape_feed_page(url)
+        finally:
+            if self.blocker:
+                self.blocker.log_page(url)
+
+    def _scrape_feed_page(self, url: str) -> list[dict]:
         logger.info(f"Scraping feed: {url}")
 
-        self.page.goto(url, wait_until="domcontentloaded", timeout=config.SCRAPE_TIMEOUT)
+        if config.SCRAPE_EXTRACTION_MODE == "network":
+            jobs = _capture_jobs(self.page, url, feed_mode=True)
+            if jobs:
+                return jobs
+        else:
+            self.page.goto(url, wait_until="domcontentloaded", timeout=config.SCRAPE_TIMEOUT)
 
         # Wait for any NUXT state with job data to hydrate
         try:
-            self.page.wait_for_function(
-                """() => {
-                    const s = window.__NUXT__?.state || {};
-                    for (const k of Object.keys(s)) {
-                        const v = s[k];
-                        if (v && typeof v === 'object') {
-                            for (const sk of Object.keys(v)) {
-                                const arr = v[sk];
-                                if (Array.isArray(arr) && arr.length > 0 && arr[0]?.title) return true;
-                            }
-                        }
-                    }
-                    return false;
-                }""",
-                timeout=15000,
-            )
+            self.page.wait_for_function(_FEED_READY_JS, timeout=15000)
         except Exception:
             title = self.page.title()
             if "moment" in title.lower() or "verify" in title.lower():
                 logger.warning("Cloudflare challenge on feed page — waiting 60s...")
                 try:
-                    self.page.wait_for_function(
-                        "() => document.querySelectorAll('[data-test=\"JobTile\"], [data-test=\"job-tile-list\"] > *').length > 0",
-                        timeout=60000,
-                    )
+                    self.page.wait_for_function(_FEED_TILES_JS, timeout=60000)
                 except Exception:
                     logger.error("Cloudflare not resolved on feed page")
                     return []
@@ -291,6 +814,10 @@ class UpworkScraper:
 
         return _extract_nuxt_jobs(self.page, feed_mode=True)
 
+    def export_cookies(self):
+        """Write Upwork cookies (incl. cf_clearance) to state.json for the HTTP mode."""
+        _write_cookie_state(self.context.cookies("https://www.upwork.com"))
+
     def stop(self):
         """Clean up browser resources."""
         try:
@@ -307,37 +834,248 @@ class UpworkScraper:
         logger.info("Browser stopped")
 
 
-# ── DB helpers ────────────────────────────────────────────────────────────
+# ── Concurrent (async) mode ──────────────────────────────────────────────
 
-def _job_exists(job_id: str) -> bool:
-    result = exec_query("SELECT 1 FROM jobs WHERE id = %s", (job_id,), fetch=True)
-    return len(result) > 0
+class HostRateLimiter:
+    """Politeness limiter shared by every tab in a scrape cycle.
 
+    Each navigation reserves the next free slot for its host, spaced by a
+    random delay from delay_range. Only the waiting tab sleeps; the others
+    keep parsing, so the delay is enforced globally without blocking the
+    whole process.
+    """
 
-def _insert_job(job: dict, feed_source: str = ""):
-    exec_query(
-        """INSERT INTO jobs (id, title, url, description, budget, posted_at, status, fetched_at,
-                             client_country, client_spent, client_verified, proposals_tier,
-                             experience_level, job_type, feed_source)
-           VALUES (%s, %s, %s, %s, %s, %s, 'new', %s, %s, %s, %s, %s, %s, %s, %s)""",
-        (
-            job["id"],
-            job["title"],
-            job["url"],
-            job["description"][:2000],
-            job["budget"],
-            job["posted_at"] or datetime.now().isoformat(),
-            datetime.now().isoformat(),
-            job.get("client_country", ""),
-            job.get("client_spent", "0"),
-            job.get("client_verified", False),
-            job.get("proposals_tier", ""),
-            job.get("experience_level", ""),
-            job.get("job_type", ""),
-            feed_source,
-        ),
-    )
+    def __init__(self, delay_range):
+        self.delay_range = delay_range
+        self._next_slot = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, url: str):
+        host = urlparse(url).netloc
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + random.uniform(*self.delay_range)
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class AsyncUpworkScraper:
+    """Scrapes several keywords at once, one tab per worker, in one browser context."""
+
+    def __init__(self, concurrency: int = None):
+        self.concurrency = concurrency or config.SCRAPE_CONCURRENCY
+        self.limiter = HostRateLimiter(config.SCRAPE_HOST_DELAY)
+        self.browser = None
+        self.context = None
+        self.playwright = None
+        self._using_cdp = False
+        self._pages = []
+        self._idle_pages = []
+        self._blockers = {}
+        self._navigations = {}
+
+    async def start_browser(self):
+        """Connect to Chrome via CDP, or launch standalone as fallback."""
+        from playwright.async_api import async_playwright
+
+        self.playwright = await async_playwright().start()
+
+        try:
+            self.browser = await self.playwright.chromium.connect_over_cdp(CDP_URL)
+            self._using_cdp = True
+            contexts = self.browser.contexts
+            self.context = contexts[0] if contexts else await self.browser.new_context()
+            logger.info(f"Connected to Chrome via CDP at {CDP_URL}")
+            return
+        except Exception as e:
+            logger.warning(f"CDP failed ({e}), launching standalone Chromium")
+
+        self._using_cdp = False
+        self.browser = await self.playwright.chromium.launch(
+            headless=config.SCRAPE_HEADLESS,
+            args=["--disable-blink-features=AutomationControlled", "--no-sandbox"],
+        )
+        state_file = STATE_DIR / "state.json"
+        storage_state = str(state_file) if state_file.exists() else None
+        self.context = await self.browser.new_context(
+            storage_state=storage_state,
+            user_agent=BROWSER_USER_AGENT,
+            viewport={"width": 1920, "height": 1080},
+        )
+        await self.context.add_init_script(
+            "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+        )
+        logger.info("Standalone Chromium started")
+
+    def is_alive(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
+
+    async def new_page(self):
+        page = await self.context.new_page()
+        blocker = _make_blocker()
+        if blocker:
+            await page.route("**/*", blocker.handle_async)
+        self._blockers[page] = blocker
+        self._navigations[page] = 0
+        self._pages.append(page)
+        return page
+
+    async def acquire_page(self):
+        """Reuse an idle tab if one is available, otherwise open a new one."""
+        while self._idle_pages:
+            page = self._idle_pages.pop()
+            if not page.is_closed():
+                return page
+            self._forget_page(page)
+        return await self.new_page()
+
+    async def release_page(self, page):
+        """Return a tab to the idle pool, closing it once it hit BROWSER_RECYCLE_AFTER."""
+        if page.is_closed() or self._navigations.get(page, 0) >= config.BROWSER_RECYCLE_AFTER:
+            try:
+                await page.close()
+            except Exception:
+                pass
+            self._forget_page(page)
+            return
+        self._idle_pages.append(page)
+
+    def _forget_page(self, page):
+        self._blockers.pop(page, None)
+        self._navigations.pop(page, None)
+        if page in self._pages:
+            self._pages.remove(page)
+
+    async def _goto(self, page, url: str, feed_mode: bool = False) -> list[dict]:
+        """Navigate a tab; returns captured jobs in network mode, else []."""
+        self._navigations[page] = self._navigations.get(page, 0) + 1
+        if config.SCRAPE_EXTRACTION_MODE == "network":
+            return await _capture_jobs_async(page, url, feed_mode)
+        await page.goto(url, wait_until="domcontentloaded", timeout=config.SCRAPE_TIMEOUT)
+        return []
+
+    async def scrape_search_page(self, page, keyword: str, page_num: int = 1) -> list[dict]:
+        """Navigate one tab to a search URL and extract jobs from __NUXT__ state."""
+        try:
+            return await self._scrape_search_page(page, keyword, page_num)
+        finally:
+            blocker = self._blockers.get(page)
+            if blocker:
+                blocker.log_page(f"{keyword} p{page_num}")
+
+    async def _scrape_search_page(self, page, keyword: str, page_num: int) -> list[dict]:
+        url = _build_search_url(keyword, page_num)
+        await self.limiter.wait(url)
+        logger.info(f"Scraping: {keyword} (page {page_num})")
+
+        jobs = await self._goto(page, url)
+        if jobs:
+            return jobs
+
+        try:
+            await page.wait_for_function(_SEARCH_READY_JS, timeout=15000)
+        except Exception:
+            title = await page.title()
+            if "moment" in title.lower() or "verify" in title.lower():
+                logger.warning(f"Cloudflare challenge on '{keyword}' — waiting up to 60s...")
+                try:
+                    await page.wait_for_function(_SEARCH_READY_JS, timeout=60000)
+                except Exception:
+                    raise SearchPageAborted(f"Cloudflare not resolved for '{keyword}' page {page_num}")
+            elif await page.evaluate(_SEARCH_STATE_JS):
+                logger.info(f"No results on page {page_num} for '{keyword}'")
+                return []
+            else:
+                raise SearchPageAborted(f"no search results state (title: {title})")
+
+        return _normalize_nuxt_jobs(await page.evaluate(_NUXT_JOBS_JS, False))
+
+    async def scrape_keyword(self, page, keyword: str,
+                             watermark: dict | None = None) -> tuple[list[dict], bool]:
+        """Scrape up to SCRAPE_MAX_PAGES pages for a keyword on one tab, stopping at the watermark.
+
+        Returns (jobs, complete) like UpworkScraper.scrape_keyword().
+        """
+        all_jobs = []
+        for page_num in range(1, config.SCRAPE_MAX_PAGES + 1):
+            try:
+                jobs = await self.scrape_search_page(page, keyword, page_num)
+            except SearchPageAborted as e:
+                logger.warning(f"[{keyword}] page {page_num} aborted: {e}")
+                return all_jobs, False
+            if not jobs:
+                logger.info(f"No jobs on page {page_num} for '{keyword}', stopping")
+                return all_jobs, True
+            try:
+                paging = await page.evaluate(_NUXT_PAGING_JS) or {}
+            except Exception:
+                paging = {}
+            jobs, fetch_next = _next_page_step(keyword, page_num, jobs, paging, watermark)
+            all_jobs.extend(jobs)
+            if not fetch_next:
+                return all_jobs, True
+        return all_jobs, True
+
+    async def scrape_feed_page(self, page, url: str) -> list[dict]:
+        """Navigate one tab to an Upwork feed URL and extract jobs."""
+        try:
+            return await self._scrape_feed_page(page, url)
+        finally:
+            blocker = self._blockers.get(page)
+            if blocker:
+                blocker.log_page(url)
+
+    async def _scrape_feed_page(self, page, url: str) -> list[dict]:
+        await self.limiter.wait(url)
+        logger.info(f"Scraping feed: {url}")
+
+        jobs = await self._goto(page, url, feed_mode=True)
+        if jobs:
+            return jobs
+
+        try:
+            await page.wait_for_function(_FEED_READY_JS, timeout=15000)
+        except Exception:
+            title = await page.title()
+            if "moment" in title.lower() or "verify" in title.lower():
+                logger.warning("Cloudflare challenge on feed page — waiting 60s...")
+                try:
+                    await page.wait_for_function(_FEED_TILES_JS, timeout=60000)
+                except Exception:
+                    logger.error("Cloudflare not resolved on feed page")
+                    return []
+            else:
+                logger.warning(f"No jobs found on feed page (title: {title})")
+                return []
+
+        return _normalize_nuxt_jobs(await page.evaluate(_NUXT_JOBS_JS, True))
+
+    async def export_cookies(self):
+        """Write Upwork cookies (incl. cf_clearance) to state.json for the HTTP mode."""
+        _write_cookie_state(await self.context.cookies("https://www.upwork.com"))
 
+    async def stop(self):
+        """Close our tabs and release the browser (leaves a CDP Chrome running)."""
+        try:
+            for page in self._pages:
+                if not page.is_closed():
+                    await page.close()
+            self._pages.clear()
+            self._idle_pages.clear()
+            if self.context and not self._using_cdp:
+                await self.context.close()
+            if self.browser and not self._using_cdp:
+                await self.browser.close()
+            if self.playwright:
+                await self.playwright.stop()
+        except Exception as e:
+            logger.warning(f"Error stopping browser: {e}")
+        logger.info("Browser stopped")
+
+
+# ── DB helpers ────────────────────────────────────────────────────────────
 
 def _log_feed_run(keyword: str, jobs_found: int, new_jobs: int):
     duplicates = jobs_found - new_jobs
@@ -350,50 +1088,193 @@ def _log_feed_run(keyword: str, jobs_found: int, new_jobs: int):
 
 # ── Main entry point ─────────────────────────────────────────────────────
 
-def scrape_jobs():
-    """Main entry point — drop-in replacement for monitor_feeds().
+last_scrape_stats = {}
 
-    Scrapes Upwork search results for configured keywords,
-    deduplicates against the DB, and inserts new jobs.
+
+def _publish_scraped(jobs: list[dict], inserted: set, source: str):
+    for job in jobs:
+        if job.get("id") in inserted:
+            pipeline_events.publish(
+                "job_scraped",
+                job_id=job["id"], title=job.get("title", ""), budget=job.get("budget"),
+                url=job.get("url", ""), source=source,
+            )
+
+
+def _ingest_keyword(keyword: str, jobs: list[dict], complete: bool = True) -> int:
+    """Insert a keyword's jobs, log the run, and return the new-job count.
+
+    The watermark only advances when paging reached a real stopping point
+    (complete); after an aborted page the older, unfetched jobs would
+    otherwise be skipped for good.
     """
+    new_count = 0
+    try:
+        inserted = insert_new_jobs(jobs, feed_source=f"search:{keyword}", description_limit=2000)
+        new_count = len(inserted)
+        _publish_scraped(jobs, inserted, f"search:{keyword}")
+        # Only advance the watermark once the jobs below it are safely stored
+        if jobs and complete and _watermarks_enabled():
+            _save_watermark(keyword, jobs[0])
+        elif jobs and _watermarks_enabled():
+            logger.info(f"[{keyword}] paging cut short — watermark left in place")
+    except Exception as e:
+        logger.error(f"Failed to insert jobs for '{keyword}': {e}")
+
+    _log_feed_run(keyword, len(jobs), new_count)
+    logger.info(f"[{keyword}] {len(jobs)} found, {new_count} new")
+    return new_count
+
+
+def _ingest_feed(source: str, jobs: list[dict]) -> int:
+    """Insert a feed page's jobs, log the run, and return the new-job count."""
+    new_count = 0
+    try:
+        inserted = insert_new_jobs(jobs, feed_source=source, description_limit=2000)
+        new_count = len(inserted)
+        _publish_scraped(jobs, inserted, source)
+    except Exception as e:
+        logger.error(f"Failed to insert jobs for feed '{source}': {e}")
+
+    _log_feed_run(f"feed:{source}", len(jobs), new_count)
+    logger.info(f"[feed:{source}] {len(jobs)} found, {new_count} new")
+    return new_count
+
+
+def _record_cycle(mode: str, started: float, keywords: int, found: int, new: int, tabs: int):
+    duration = time.monotonic() - started
+    last_scrape_stats.clear()
+    last_scrape_stats.update({
+        "mode": mode,
+        "keywords": keywords,
+        "tabs": tabs,
+        "found": found,
+        "new": new,
+        "duration_sec": round(duration, 1),
+        "finished_at": datetime.now().isoformat(),
+    })
+    logger.info(
+        f"Scrape complete: {found} found, {new} new in {duration:.1f}s "
+        f"({keywords} keywords, {tabs} tab(s))"
+    )
+
+
+def _scrape_jobs_sequential(keywords: list[str]) -> int:
+    """One tab, keywords in order, sleeping SCRAPE_*_DELAY between steps."""
     scraper = UpworkScraper()
+    started = time.monotonic()
     total_found = 0
     total_new = 0
 
     try:
         scraper.start_browser()
+        watermarks = load_watermarks(keywords)
 
-        for i, keyword in enumerate(config.SEARCH_KEYWORDS):
-            jobs = scraper.scrape_keyword(keyword)
-            new_count = 0
-
-            for job in jobs:
-                if not _job_exists(job["id"]):
-                    try:
-                        _insert_job(job, feed_source=f"search:{keyword}")
-                        new_count += 1
-                    except Exception as e:
-                        logger.error(f"Failed to insert job {job['id']}: {e}")
-
+        for i, keyword in enumerate(keywords):
+            jobs, complete = scraper.scrape_keyword(keyword, watermarks.get(keyword))
             total_found += len(jobs)
-            total_new += new_count
-            _log_feed_run(keyword, len(jobs), new_count)
-            logger.info(f"[{keyword}] {len(jobs)} found, {new_count} new")
+            total_new += _ingest_keyword(keyword, jobs, complete)
 
-            if i < len(config.SEARCH_KEYWORDS) - 1:
+            if i < len(keywords) - 1:
                 delay = random.uniform(*config.SCRAPE_KEYWORD_DELAY)
                 time.sleep(delay)
 
+        if config.SCRAPE_MODE == "http":
+            scraper.export_cookies()
+
     except Exception as e:
         logger.error(f"Scraper error: {e}")
         raise
     finally:
         scraper.stop()
 
-    logger.info(f"Scrape complete: {total_found} found, {total_new} new")
+    _record_cycle("sequential", started, len(keywords), total_found, total_new, 1)
     return total_new
 
 
+async def _scrape_keywords(scraper: AsyncUpworkScraper, keywords: list[str]) -> int:
+    """Scrape keywords on up to scraper.concurrency tabs pulling from a shared queue."""
+    tabs = max(1, min(scraper.concurrency, len(keywords)))
+    started = time.monotonic()
+    totals = {"found": 0, "new": 0}
+
+    watermarks = await asyncio.to_thread(load_watermarks, keywords)
+    queue = asyncio.Queue()
+    for keyword in keywords:
+        queue.put_nowait(keyword)
+
+    async def worker():
+        page = await scraper.acquire_page()
+        try:
+            while True:
+                try:
+                    keyword = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    jobs, complete = await scraper.scrape_keyword(page, keyword, watermarks.get(keyword))
+                except Exception as e:
+                    logger.error(f"[{keyword}] scrape failed: {e}")
+                    if not scraper.is_alive():
+                        raise
+                    continue
+                # DB writes are blocking — keep them off the event loop
+                new_count = await asyncio.to_thread(_ingest_keyword, keyword, jobs, complete)
+                totals["found"] += len(jobs)
+                totals["new"] += new_count
+        finally:
+            await scraper.release_page(page)
+
+    await asyncio.gather(*(worker() for _ in range(tabs)))
+    if config.SCRAPE_MODE == "http":
+        await scraper.export_cookies()
+    _record_cycle("concurrent", started, len(keywords), totals["found"], totals["new"], tabs)
+    return totals["new"]
+
+
+async def _scrape_jobs_concurrent(keywords: list[str]) -> int:
+    """One-shot concurrent cycle: start a browser, scrape, tear it down."""
+    scraper = AsyncUpworkScraper()
+    try:
+        await scraper.start_browser()
+        return await _scrape_keywords(scraper, keywords)
+    except Exception as e:
+        logger.error(f"Scraper error: {e}")
+        raise
+    finally:
+        await scraper.stop()
+
+
+def _scrape_with_browser(keywords: list[str]) -> int:
+    if config.BROWSER_DAEMON:
+        from modules.browser_manager import get_browser_manager
+        return get_browser_manager().run(lambda scraper: _scrape_keywords(scraper, keywords))
+    if config.SCRAPE_CONCURRENCY > 1 and len(keywords) > 1:
+        return asyncio.run(_scrape_jobs_concurrent(keywords))
+    return _scrape_jobs_sequential(keywords)
+
+
+def scrape_jobs():
+    """Main entry point — drop-in replacement for monitor_feeds().
+
+    Scrapes Upwork search results for configured keywords,
+    deduplicates against the DB, and inserts new jobs.
+    With SCRAPE_MODE = "http" pages are fetched without a browser until a
+    Cloudflare challenge shows up; the remaining keywords then go through
+    the browser path (parallel tabs with SCRAPE_CONCURRENCY > 1, the
+    long-lived browser manager with BROWSER_DAEMON).
+    """
+    keywords = list(config.SEARCH_KEYWORDS)
+    if config.SCRAPE_MODE == "http":
+        from modules.http_scraper import scrape_keywords_http
+        new_count, remaining = scrape_keywords_http(keywords)
+        if not remaining:
+            return new_count
+        logger.warning(f"HTTP mode challenged — {len(remaining)} keyword(s) fall back to the browser")
+        return new_count + _scrape_with_browser(remaining)
+    return _scrape_with_browser(keywords)
+
+
 FEED_URLS = {
     "best-matches": "https://www.upwork.com/nx/find-work/best-matches",
     "most-recent": "https://www.upwork.com/nx/find-work/most-recent",
@@ -410,25 +1291,26 @@ def scrape_feed(source: str) -> int:
     if not url:
         raise ValueError(f"Unknown feed source: {source}. Use: {list(FEED_URLS.keys())}")
 
+    if config.BROWSER_DAEMON:
+        from modules.browser_manager import get_browser_manager
+
+        async def _scrape(scraper):
+            page = await scraper.acquire_page()
+            try:
+                return await scraper.scrape_feed_page(page, url)
+            finally:
+                await scraper.release_page(page)
+
+        jobs = get_browser_manager().run(_scrape)
+        return _ingest_feed(source, jobs)
+
     scraper = UpworkScraper()
-    total_found = 0
     new_count = 0
 
     try:
         scraper.start_browser()
         jobs = scraper.scrape_feed_page(url)
-        total_found = len(jobs)
-
-        for job in jobs:
-            if not _job_exists(job["id"]):
-                try:
-                    _insert_job(job, feed_source=source)
-                    new_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to insert job {job['id']}: {e}")
-
-        _log_feed_run(f"feed:{source}", total_found, new_count)
-        logger.info(f"[feed:{source}] {total_found} found, {new_count} new")
+        new_count = _ingest_feed(source, jobs)
 
     except Exception as e:
         logger.error(f"Feed scraper error: {e}")
@@ -0,0 +1,150 @@
+"""LLM response cache — content-addressed, stored in the llm_cache table.
+
+The key is a SHA-256 of the model, the full message list and the sampling
+params, so a byte-identical prompt (re-filtered or re-posted job, retry after
+a DB error) is answered from the table instead of the API. Entries expire
+after LLM_CACHE_TTL_HOURS, and the least recently used ones are evicted once
+the table holds more than LLM_CACHE_MAX_MB of responses. That sweep runs at
+most every LLM_CACHE_EVICT_INTERVAL_SEC, or sooner once the bytes written
+since the last sweep could push the table over budget.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+
+import config
+from db.database import exec_query
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "writes": 0, "evicted": 0, "bypassed": 0, "errors": 0}
+
+# Eviction throttle (guarded by _lock)
+_last_sweep = 0.0
+_size_after_sweep = None     # table bytes measured by the last sweep
+_bytes_since_sweep = 0
+
+
+def _count(name: str, n: int = 1):
+    with _lock:
+        _stats[name] += n
+
+
+def cache_key(model: str, messages: list[dict], params: dict) -> str:
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get(key: str) -> str | None:
+    """Return the cached response text for key, or None on a miss/expiry."""
+    try:
+        rows = exec_query(
+            """UPDATE llm_cache SET hits = hits + 1, last_used_at = CURRENT_TIMESTAMP
+               WHERE key = %s AND created_at > CURRENT_TIMESTAMP - make_interval(hours => %s)
+               RETURNING response""",
+            (key, config.LLM_CACHE_TTL_HOURS),
+            fetch=True,
+        )
+    except Exception as e:
+        logger.warning(f"LLM cache lookup failed: {e}")
+        _count("errors")
+        return None
+    if rows:
+        _count("hits")
+        return rows[0]["response"]
+    _count("misses")
+    return None
+
+
+def put(key: str, model: str, response: str, tokens: int = 0):
+    """Store a response; trim expired and over-budget entries when a sweep is due."""
+    size = len(response.encode("utf-8"))
+    try:
+        exec_query(
+            """INSERT INTO llm_cache (key, model, response, tokens, bytes)
+               VALUES (%s, %s, %s, %s, %s)
+               ON CONFLICT (key) DO UPDATE SET
+                   response = EXCLUDED.response,
+                   tokens = EXCLUDED.tokens,
+                   bytes = EXCLUDED.bytes,
+                   created_at = CURRENT_TIMESTAMP,
+                   last_used_at = CURRENT_TIMESTAMP""",
+            (key, model, response, tokens, size),
+        )
+        _count("writes")
+        if _sweep_due(size):
+            _evict()
+    except Exception as e:
+        logger.warning(f"LLM cache write failed: {e}")
+        _count("errors")
+
+
+def _sweep_due(written: int) -> bool:
+    """Claim the next sweep if the interval passed or the budget may be exceeded."""
+    global _last_sweep, _bytes_since_sweep
+    budget = config.LLM_CACHE_MAX_MB * 1024 * 1024
+    now = time.monotonic()
+    with _lock:
+        _bytes_since_sweep += written
+        due = now - _last_sweep >= config.LLM_CACHE_EVICT_INTERVAL_SEC or (
+            _size_after_sweep is not None and _size_after_sweep + _bytes_since_sweep > budget
+        )
+        if due:
+            _last_sweep = now
+            _bytes_since_sweep = 0
+    return due
+
+
+def _evict():
+    global _size_after_sweep
+    budget = int(config.LLM_CACHE_MAX_MB * 1024 * 1024)
+    expired = exec_query(
+        "DELETE FROM llm_cache WHERE created_at <= CURRENT_TIMESTAMP - make_interval(hours => %s)",
+        (config.LLM_CACHE_TTL_HOURS,),
+    )
+    total = exec_query("SELECT COALESCE(SUM(bytes), 0) AS total FROM llm_cache", fetch=True)[0]["total"]
+    over_budget = []
+    if total > budget:
+        # Keep the most recently used entries whose running size fits the budget
+        over_budget = exec_query(
+            """DELETE FROM llm_cache WHERE key IN (
+                   SELECT key FROM (
+                       SELECT key, SUM(bytes) OVER (ORDER BY last_used_at DESC, key) AS running
+                       FROM llm_cache
+                   ) sized
+                   WHERE running > %s
+               )
+               RETURNING bytes""",
+            (budget,),
+            fetch=True,
+        )
+        total -= sum(row["bytes"] or 0 for row in over_budget)
+    with _lock:
+        _size_after_sweep = total
+    removed = (expired or 0) + len(over_budget)
+    if removed:
+        _count("evicted", removed)
+
+
+def record_bypass():
+    """Count a lookup skipped because the caller forced a fresh response."""
+    _count("bypassed")
+
+
+def stats() -> dict:
+    """Process-wide hit/miss counters plus hit rate."""
+    with _lock:
+        snapshot = dict(_stats)
+    lookups = snapshot["hits"] + snapshot["misses"]
+    snapshot["hit_rate"] = round(snapshot["hits"] / lookups, 3) if lookups else 0.0
+    snapshot["enabled"] = config.LLM_CACHE_ENABLED
+    return snapshot
@@ -0,0 +1,281 @@
+"""Parse the serialized window.__NUXT__ payload out of server-rendered HTML.
+
+Nuxt 2 emits the SSR state as a script tag in one of two shapes:
+
+    window.__NUXT__={...};
+    window.__NUXT__=(function(a,b,c){a.x=b;return {...}}(1,"two",null));
+
+The second (devalue) form hoists repeated values into function parameters.
+This module evaluates just enough JavaScript to rebuild the state without a
+browser: literals, object/array literals, parameter references, simple
+member assignments before the return, `void 0`, `Array(n)` and
+`new Date(...)`.
+"""
+
+import json
+import re
+from datetime import datetime, timezone
+
+_NUXT_START = re.compile(r"window\.__NUXT__\s*=\s*")
+
+_TOKEN = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<number>-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<punct>[{}\[\]():,;.=!])
+""", re.VERBOSE | re.DOTALL)
+
+_JS_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0"}
+
+
+class NuxtParseError(ValueError):
+    """The __NUXT__ script used syntax we don't evaluate."""
+
+
+class NuxtStateMissing(NuxtParseError):
+    """The page has no window.__NUXT__ assignment at all (e.g. an interstitial)."""
+
+
+def _unescape(body: str) -> str:
+    out = []
+    i = 0
+    while i < len(body):
+        ch = body[i]
+        if ch != "\\":
+            out.append(ch)
+            i += 1
+            continue
+        nxt = body[i + 1] if i + 1 < len(body) else ""
+        if nxt == "u" and body[i + 2:i + 3] == "{":
+            end = body.index("}", i)
+            out.append(chr(int(body[i + 3:end], 16)))
+            i = end + 1
+        elif nxt == "u":
+            code = int(body[i + 2:i + 6], 16)
+            i += 6
+            # Re-join UTF-16 surrogate pairs
+            if 0xD800 <= code <= 0xDBFF and body[i:i + 2] == "\\u":
+                low = int(body[i + 2:i + 6], 16)
+                if 0xDC00 <= low <= 0xDFFF:
+                    code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                    i += 6
+            out.append(chr(code))
+        elif nxt == "x":
+            out.append(chr(int(body[i + 2:i + 4], 16)))
+            i += 4
+        else:
+            out.append(_JS_ESCAPES.get(nxt, nxt))
+            i += 2
+    return "".join(out)
+
+
+def _tokenize(src: str) -> list[tuple[str, str]]:
+    tokens = []
+    pos = 0
+    while pos < len(src):
+        m = _TOKEN.match(src, pos)
+        if not m:
+            raise NuxtParseError(f"Unexpected character {src[pos]!r} at {pos}")
+        pos = m.end()
+        kind = m.lastgroup
+        if kind != "ws":
+            tokens.append((kind, m.group()))
+    return tokens
+
+
+class _Evaluator:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+        self.scope = {}
+
+    def peek(self, value=None):
+        if self.pos >= len(self.tokens):
+            return None if value is None else False
+        tok = self.tokens[self.pos]
+        return tok if value is None else tok[1] == value
+
+    def take(self, value=None):
+        if self.pos >= len(self.tokens):
+            raise NuxtParseError("Unexpected end of script")
+        tok = self.tokens[self.pos]
+        if value is not None and tok[1] != value:
+            raise NuxtParseError(f"Expected {value!r}, got {tok[1]!r}")
+        self.pos += 1
+        return tok
+
+    def value(self):
+        kind, text = self.take()
+        if kind == "string":
+            return _unescape(text[1:-1])
+        if kind == "number":
+            number = float(text)
+            return int(number) if number.is_integer() and "." not in text and "e" not in text.lower() else number
+        if text == "{":
+            obj = {}
+            while not self.peek("}"):
+                key_kind, key = self.take()
+                if key_kind == "string":
+                    key = _unescape(key[1:-1])
+                self.take(":")
+                obj[key] = self.value()
+                if not self.peek("}"):
+                    self.take(",")
+            self.take("}")
+            return obj
+        if text == "[":
+            arr = []
+            while not self.peek("]"):
+                arr.append(self.value())
+                if not self.peek("]"):
+                    self.take(",")
+            self.take("]")
+            return arr
+        if text == "!":
+            return not self.value()
+        if kind == "name":
+            if text == "true":
+                return True
+            if text == "false":
+                return False
+            if text in ("null", "undefined"):
+                return None
+            if text == "void":
+                self.take()
+                return None
+            if text == "Array" and self.peek("("):
+                self.take("(")
+                size = self.value() if not self.peek(")") else 0
+                self.take(")")
+                return [None] * int(size or 0)
+            if text == "new" and self.peek("Date"):
+                return self._date()
+            if text == "Object" and self.peek("."):
+                # Object.create(null) → plain dict
+                self.take(".")
+                self.take()
+                self.take("(")
+                while not self.peek(")"):
+                    self.take()
+                self.take(")")
+                return {}
+            if text in self.scope:
+                return self._member_chain(self.scope[text])
+            raise NuxtParseError(f"Unknown identifier {text!r}")
+        raise NuxtParseError(f"Unexpected token {text!r}")
+
+    def _date(self):
+        """new Date(ms) / new Date("iso") → ISO-8601 string."""
+        self.take("Date")
+        self.take("(")
+        arg = self.value() if not self.peek(")") else None
+        self.take(")")
+        if isinstance(arg, (int, float)):
+            return datetime.fromtimestamp(arg / 1000, tz=timezone.utc).isoformat()
+        return arg
+
+    def _member_chain(self, value):
+        while self.peek(".") or self.peek("["):
+            if self.take()[1] == ".":
+                key = self.take()[1]
+            else:
+                key = self.value()
+                self.take("]")
+            value = value[key] if isinstance(value, (dict, list)) else None
+        return value
+
+    def assignment(self):
+        """a.b.c=value / a[0]=value — mutate an object reached from a parameter."""
+        _, name = self.take()
+        target = self.scope[name]
+        keys = []
+        while self.peek(".") or self.peek("["):
+            if self.take()[1] == ".":
+                keys.append(self.take()[1])
+            else:
+                keys.append(self.value())
+                self.take("]")
+        self.take("=")
+        value = self.value()
+        if not keys:
+            self.scope[name] = value
+            return
+        for key in keys[:-1]:
+            target = target[key]
+        if isinstance(target, list):
+            while len(target) <= keys[-1]:
+                target.append(None)
+        target[keys[-1]] = value
+
+    def iife(self):
+        """(function(a,b){...;return X}(args)) — also accepts the ')(' call form."""
+        self.take("(")
+        self.take("function")
+        self.take("(")
+        params = []
+        while not self.peek(")"):
+            params.append(self.take()[1])
+            if not self.peek(")"):
+                self.take(",")
+        self.take(")")
+        self.take("{")
+        body_start = self.pos
+        depth = 1
+        while depth:
+            text = self.take()[1]
+            if text == "{":
+                depth += 1
+            elif text == "}":
+                depth -= 1
+        body_end = self.pos - 1
+        if self.peek(")"):
+            self.take(")")
+        self.take("(")
+        args = []
+        while not self.peek(")"):
+            args.append(self.value())
+            if not self.peek(")"):
+                self.take(",")
+        self.take(")")
+        self.scope = dict(zip(params, args + [None] * (len(params) - len(args))))
+
+        # Re-run the body now that parameters are bound
+        self.pos = body_start
+        while self.pos < body_end:
+            if self.peek(";"):
+                self.take()
+            elif self.peek("return"):
+                self.take()
+                return self.value()
+            else:
+                self.assignment()
+        raise NuxtParseError("IIFE body has no return statement")
+
+
+def _script_source(html: str) -> str:
+    m = _NUXT_START.search(html)
+    if not m:
+        raise NuxtStateMissing("No window.__NUXT__ assignment in page")
+    end = html.find("</script>", m.end())
+    return html[m.end():end if end != -1 else None].strip().rstrip(";")
+
+
+def parse_nuxt_state(html: str) -> dict:
+    """Return the full __NUXT__ object from an SSR HTML document."""
+    src = _script_source(html)
+    if src.startswith("{"):
+        try:
+            return json.loads(src)
+        except ValueError:
+            pass
+    try:
+        evaluator = _Evaluator(_tokenize(src))
+        if src.startswith("(function"):
+            return evaluator.iife()
+        return evaluator.value()
+    except NuxtParseError:
+        raise
+    except (ValueError, KeyError, IndexError, TypeError) as e:
+        # Malformed escapes, unbound names, assignments into missing keys
+        raise NuxtParseError(f"{type(e).__name__}: {e}") from e
@@ -0,0 +1,118 @@
+"""Pipeline Events - in-process pub/sub behind the /api/events SSE stream.
+
+The scraper, filter and generator publish() as work happens; every open
+/api/events connection holds a Subscription with its own bounded asyncio
+queue. Producers never block: publish() hands the event to each
+subscriber's event loop, and a subscriber that falls behind loses its
+oldest events rather than slowing the pipeline down.
+
+Event types:
+    job_scraped       job_id, title, budget, url, source
+    filter_decision   job_id, title, status, reason, score
+    proposal_started  job_id, title, route
+    proposal_token    job_id, model, delta, restart   (only while someone is listening)
+    proposal_stored   job_id, proposal_id, model, proposal_text
+    proposal_failed   job_id, error
+    cycle_started / cycle_finished / cycle_failed
+
+proposal_token deltas are the proposal text decoded from the model's JSON
+answer, for live display only — after a fallback to the next model the
+text starts over (restart=true) under the new model name, and
+proposal_stored carries the final text. The last EVENTS_REPLAY events
+(minus tokens) are kept so a reconnecting client sending Last-Event-ID
+catches up on what it missed.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+import config
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_subscribers = set()
+_ids = itertools.count(1)
+_recent = deque(maxlen=config.EVENTS_REPLAY)
+
+# High-volume events that are not worth replaying to a reconnecting client
+_NO_REPLAY = {"proposal_token"}
+
+
+class Subscription:
+    """One SSE client: a bounded queue owned by the client's event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def _put(self, event: dict):
+        # Runs on self.loop
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    def deliver(self, event: dict):
+        """Thread-safe: schedule event onto the subscriber's loop."""
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    async def get(self, timeout: float) -> dict | None:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+def has_subscribers() -> bool:
+    return bool(_subscribers)
+
+
+def publish(event_type: str, **data):
+    """Record an event and fan it out to every open stream."""
+    event = {"id": next(_ids), "type": event_type, "ts": round(time.time(), 3), "data": data}
+    with _lock:
+        if event_type not in _NO_REPLAY:
+            _recent.append(event)
+        subscribers = list(_subscribers)
+    for sub in subscribers:
+        try:
+            sub.deliver(event)
+        except RuntimeError:
+            # Loop already closed — the connection went away without unsubscribing
+            unsubscribe(sub)
+
+
+def subscribe(last_event_id: str = None) -> Subscription:
+    """Register a stream on the running loop, replaying events after last_event_id."""
+    sub = Subscription(asyncio.get_running_loop(), config.EVENTS_QUEUE_SIZE)
+    try:
+        after = int(last_event_id) if last_event_id else None
+    except ValueError:
+        after = None
+    with _lock:
+        if after is not None:
+            for event in _recent:
+                if event["id"] > after:
+                    sub._put(event)
+        _subscribers.add(sub)
+    return sub
+
+
+def unsubscribe(sub: Subscription):
+    with _lock:
+        _subscribers.discard(sub)
+    if sub.dropped:
+        logger.info(f"Event stream closed after dropping {sub.dropped} events")
+
+
+def format_sse(event: dict) -> str:
+    """Serialise an event as one text/event-stream message."""
+    payload = json.dumps(event["data"], default=str, ensure_ascii=False)
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
@@ -0,0 +1,81 @@
+"""Prompt Builder - keeps job descriptions inside a token budget.
+
+Counts tokens with tiktoken when it is installed (cl100k_base — close
+enough for budgeting on other model families), otherwise with a ~4
+characters/token estimate. Descriptions over budget are condensed to the
+lines a proposal actually needs: the opening paragraph, requirement bullets
+and any questions the client asks, in their original order.
+"""
+
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+_BULLET = re.compile(r"^\s*(?:[-*•▪◦·]|\d+[.)]|[a-z][.)])\s+", re.IGNORECASE)
+_REQUIREMENT = re.compile(
+    r"\b(?:must|required?|requirements?|need(?:s|ed)?|should|looking for|deliverables?|"
+    r"experience (?:with|in)|proficien\w*|familiar\w* with|budget|deadline|timeline)\b",
+    re.IGNORECASE,
+)
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            logger.info("tiktoken not available — estimating tokens as chars/4")
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def _truncate(text: str, budget: int) -> str:
+    """Cut text to at most `budget` tokens, ending on a word boundary."""
+    if count_tokens(text) <= budget:
+        return text
+    encoding = _get_encoding()
+    if encoding is not None:
+        cut = encoding.decode(encoding.encode(text, disallowed_special=())[:budget])
+    else:
+        cut = text[:budget * 4]
+    cut = cut.rsplit(None, 1)[0] if " " in cut else cut
+    return cut.rstrip(" ,;:-") + " …"
+
+
+def condense_description(text: str, budget: int) -> str:
+    """Return text unchanged if it fits `budget` tokens, else a condensed version."""
+    text = (text or "").strip()
+    if budget <= 0 or count_tokens(text) <= budget:
+        return text
+
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+    if len(paragraphs) == 1:
+        # Scraped descriptions are often one block — fall back to sentences
+        paragraphs = [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
+
+    kept = [paragraphs[0]]
+    seen = {paragraphs[0]}
+    for line in (l.strip() for p in paragraphs[1:] for l in p.splitlines()):
+        if not line or line in seen:
+            continue
+        if _BULLET.match(line) or "?" in line or _REQUIREMENT.search(line):
+            kept.append(line)
+            seen.add(line)
+
+    condensed = "\n".join(kept)
+    return _truncate(condensed, budget)
@@ -1,20 +1,98 @@
-"""Proposal Generator - Uses AI API to generate custom proposals."""
+"""Proposal Generator - Uses AI API to generate custom proposals.
+
+generate_all_pending() fans jobs out over AI_CONCURRENCY worker threads.
+Every call first reserves a slot in the proposal_quota ledger (see
+db.database.reserve_daily_slot) and then waits on two token buckets
+(AI_REQUESTS_PER_MIN, AI_TOKENS_PER_MIN), so parallel workers and
+overlapping cycles stay inside both the daily proposal limit and the
+provider's rate limits. Byte-identical prompts are answered from the
+llm_cache table (modules/llm_cache.py) without touching either bucket.
+
+ModelRouter picks a fallback chain of models per job from config.AI_ROUTES
+(score and budget bands); the next model is tried when one errors.
+
+A failed call is recorded on the job (generation_attempts, last_error) and
+the job is not picked up again until next_attempt_at, which backs off
+exponentially with jitter. After AI_RETRY_MAX_ATTEMPTS the job is moved to
+'generation_failed'. A process-wide CircuitBreaker stops all provider calls
+while the recent error rate is above AI_BREAKER_ERROR_RATE.
+
+The openai SDK is imported and clients are built on first use (get_client),
+so importing this module — and booting the API — stays cheap and works
+without NVIDIA_API_KEY. One client per endpoint is shared by all workers
+and keeps its HTTP connections alive between calls.
+"""
 
 import logging
 import json
+import os
+import random
 import re
-from openai import OpenAI
-from db.database import exec_query
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from db.database import exec_query, release_daily_slot, reserve_daily_slot
+from modules import llm_cache, pipeline_events
+from modules.generation_queue import budget_usd, rank_pending_jobs
+from modules.prompt_builder import condense_description, count_tokens
 import config
-from datetime import datetime
+from datetime import datetime, timedelta
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-client = OpenAI(
-    api_key=config.AI_API_KEY,
-    base_url=config.AI_BASE_URL,
-)
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(base_url: str = None, api_key: str = None):
+    """Process-wide OpenAI client for an endpoint, built on first use.
+
+    Each client owns a keep-alive connection pool sized for AI_CONCURRENCY
+    workers, so back-to-back calls skip the TCP/TLS handshake.
+    """
+    base_url = base_url or config.AI_BASE_URL
+    api_key = api_key or config.AI_API_KEY
+    key = (base_url, api_key)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _clients_lock:
+        if key not in _clients:
+            if not api_key:
+                raise RuntimeError(f"No API key configured for {base_url}")
+            import httpx
+            from openai import OpenAI
+
+            workers = max(1, config.AI_CONCURRENCY)
+            http_client = httpx.Client(
+                timeout=config.AI_HTTP_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=workers * 2,
+                    max_keepalive_connections=workers,
+                    keepalive_expiry=config.AI_HTTP_KEEPALIVE_EXPIRY,
+                ),
+            )
+            _clients[key] = OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                max_retries=config.AI_CLIENT_MAX_RETRIES,
+                http_client=http_client,
+            )
+            logger.info(f"🔌 LLM client ready for {base_url}")
+        return _clients[key]
+
+
+def close_clients():
+    """Close pooled connections (API shutdown); clients are rebuilt on next use."""
+    with _clients_lock:
+        for client in _clients.values():
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning(f"Closing LLM client failed: {e}")
+        _clients.clear()
 
 SYSTEM_PROMPT = """You are writing Upwork proposals for a skilled developer named Alex Chen. Their background:
 - Built and operate a large-scale Instagram automation platform managing 200+ accounts
@@ -37,73 +115,611 @@ Output format (valid JSON only):
     "relevant_experience": "what experience you highlighted"
 }"""
 
-def count_sent_today():
-    """Count proposals sent today."""
-    result = exec_query(
-        "SELECT COUNT(*) as count FROM proposals WHERE sent_at >= date('now')",
-        fetch=True
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate_per_min."""
+
+    def __init__(self, rate_per_min: float, capacity: float = None):
+        self.rate = rate_per_min / 60.0
+        self.capacity = capacity or rate_per_min
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1) -> float:
+        """Block until `amount` tokens are available. Returns seconds waited."""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                sleep_for = (amount - self._tokens) / self.rate
+            time.sleep(sleep_for)
+            waited += sleep_for
+
+    def adjust(self, delta: float):
+        """Charge (positive) or refund (negative) tokens once the real cost is known."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - delta)
+
+
+class DailyQuota:
+    """Today's proposal slots, reserved atomically in the proposal_quota ledger.
+
+    One instance is shared by the workers of a run so that, once the ledger
+    says the day is full, the rest of the run stops asking.
+    """
+
+    def __init__(self, limit: int = None):
+        self.limit = config.LIMITS['max_proposals_per_day'] if limit is None else limit
+        self.exhausted = False
+
+    def reserve(self):
+        """Returns the ledger day to release with, or None when the day is full."""
+        day = reserve_daily_slot(self.limit)
+        if day is None and not self.exhausted:
+            self.exhausted = True
+            logger.warning(f"⚠️  Daily proposal limit ({self.limit}) reached")
+        return day
+
+    def release(self, day):
+        """Give a reserved slot back after a generation that produced nothing."""
+        release_daily_slot(day)
+
+
+class CircuitOpen(Exception):
+    """The provider breaker is open; the call was not attempted."""
+
+
+class CircuitBreaker:
+    """Stops provider calls while the recent error rate is too high.
+
+    closed → open when at least min_calls of the last `window` calls have
+    an error ratio >= error_rate; open → half_open after `cooldown` seconds,
+    letting exactly one trial call through; that call closes or re-opens it.
+    """
+
+    def __init__(self, window: int, min_calls: int, error_rate: float, cooldown: float):
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+                logger.info("Circuit breaker half-open — sending one trial call")
+                return True
+            return False
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls are refused outright (cheap check for callers)."""
+        return self.state == "open" and time.monotonic() - self.opened_at < self.cooldown
+
+    def record(self, ok: bool):
+        with self._lock:
+            if self.state == "half_open":
+                if ok:
+                    self.state = "closed"
+                    self._outcomes.clear()
+                    logger.info("✅ Circuit breaker closed — provider recovered")
+                else:
+                    self._open("trial call failed")
+                return
+            self._outcomes.append(ok)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.error_rate:
+                self._open(f"{failures}/{len(self._outcomes)} recent calls failed")
+
+    def _open(self, reason: str):
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        self._outcomes.clear()
+        logger.warning(f"⚠️  Circuit breaker open for {self.cooldown}s: {reason}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            recent = len(self._outcomes)
+            failures = self._outcomes.count(False)
+        return {
+            "state": "open" if self.is_open else self.state,
+            "recent_calls": recent,
+            "recent_error_rate": round(failures / recent, 2) if recent else 0.0,
+            "times_opened": self.times_opened,
+        }
+
+
+breaker = CircuitBreaker(
+    window=config.AI_BREAKER_WINDOW,
+    min_calls=config.AI_BREAKER_MIN_CALLS,
+    error_rate=config.AI_BREAKER_ERROR_RATE,
+    cooldown=config.AI_BREAKER_COOLDOWN,
+)
+
+
+class _CallStats:
+    """Per-run latency and token totals for LLM calls."""
+
+    def __init__(self):
+        self.latencies = []
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.throttled_sec = 0.0
+        self.cache_hits = 0
+        self.failed = 0
+        self.dead_lettered = 0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, prompt_tokens: int, completion_tokens: int, throttled: float):
+        with self._lock:
+            self.latencies.append(latency)
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.throttled_sec += throttled
+
+    def record_cache_hit(self):
+        with self._lock:
+            self.cache_hits += 1
+
+    def record_failure(self, terminal: bool):
+        with self._lock:
+            self.failed += 1
+            self.dead_lettered += int(terminal)
+
+    def summary(self) -> dict:
+        ordered = sorted(self.latencies)
+
+        def pct(p):
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 2)
+
+        return {
+            "calls": len(ordered),
+            "p50_sec": pct(50),
+            "p95_sec": pct(95),
+            "max_sec": round(ordered[-1], 2) if ordered else 0.0,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "throttled_sec": round(self.throttled_sec, 1),
+            "cache_hits": self.cache_hits,
+            "failed": self.failed,
+            "dead_lettered": self.dead_lettered,
+        }
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+last_generation_stats = {}
+
+
+def _rate_buckets() -> tuple[TokenBucket | None, TokenBucket | None]:
+    """Process-wide (requests, tokens) buckets; None where the limit is 0."""
+    with _buckets_lock:
+        for name, rate in (("requests", config.AI_REQUESTS_PER_MIN), ("tokens", config.AI_TOKENS_PER_MIN)):
+            bucket = _buckets.get(name)
+            if rate and (bucket is None or bucket.rate != rate / 60.0):
+                _buckets[name] = TokenBucket(rate)
+            elif not rate:
+                _buckets.pop(name, None)
+        return _buckets.get("requests"), _buckets.get("tokens")
+
+
+def build_messages(job: dict) -> list[dict]:
+    """Chat messages for a job, with the description held to AI_PROMPT_DESCRIPTION_TOKENS."""
+    description = job['description'] or ""
+    condensed = condense_description(description, config.AI_PROMPT_DESCRIPTION_TOKENS)
+    if condensed != description.strip():
+        logger.debug(
+            f"Condensed description for {job['id']}: "
+            f"{count_tokens(description)} → {count_tokens(condensed)} tokens"
+        )
+
+    job_context = f"""
+Job Title: {job['title']}
+Budget: {job['budget']}
+Description: {condensed}
+"""
+    return [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": f"Generate a proposal for this Upwork job:\n{job_context}"
+        }
+    ]
+
+
+class ModelRouter:
+    """Maps a job's score/budget band to a fallback chain of models (config.AI_ROUTES).
+
+    Also keeps per-route, per-model call counts and latencies so volume can
+    be steered to the fast models and the slow one saved for high-value jobs.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def route(self, job: dict = None) -> tuple[str, list[dict]]:
+        """Returns (route_name, [{"model", "base_url", "api_key_env"}, ...]).
+
+        Without a job (ad-hoc _call_llm use) there is no band to match, so
+        AI_MODEL is used.
+        """
+        if not job:
+            return "default", [self._target(config.AI_MODEL)]
+        score = job.get("filter_score") or 0
+        budget = budget_usd(job.get("budget")) if job.get("budget") else 0.0
+        for route in config.AI_ROUTES:
+            if score >= route.get("min_score", 0) and budget >= route.get("min_budget", 0):
+                return route["name"], [self._target(m) for m in route["models"]]
+        return "default", [self._target(config.AI_MODEL)]
+
+    @staticmethod
+    def _target(spec) -> dict:
+        if isinstance(spec, str):
+            spec = {"model": spec}
+        return {
+            "model": spec["model"],
+            "base_url": spec.get("base_url") or config.AI_BASE_URL,
+            "api_key_env": spec.get("api_key_env"),
+        }
+
+    @staticmethod
+    def _api_key(target: dict) -> str | None:
+        return os.getenv(target["api_key_env"]) if target["api_key_env"] else config.AI_API_KEY
+
+    @staticmethod
+    def client_for(target: dict):
+        """Shared client for the target's endpoint (see get_client)."""
+        return get_client(target["base_url"], ModelRouter._api_key(target))
+
+    def has_usable_key(self) -> bool:
+        """True if any configured model (its own api_key_env or AI_API_KEY) has a key."""
+        specs = [m for route in config.AI_ROUTES for m in route["models"]] or [config.AI_MODEL]
+        return any(self._api_key(self._target(spec)) for spec in specs)
+
+    def record(self, route: str, model: str, ok: bool, latency: float, fallback: bool = False):
+        with self._lock:
+            entry = self._stats.setdefault((route, model), {
+                "calls": 0, "ok": 0, "failed": 0, "as_fallback": 0, "latencies": deque(maxlen=200),
+            })
+            entry["calls"] += 1
+            entry["ok" if ok else "failed"] += 1
+            entry["as_fallback"] += int(fallback)
+            if ok:
+                entry["latencies"].append(latency)
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = {key: dict(value, latencies=sorted(value["latencies"])) for key, value in self._stats.items()}
+        out = {}
+        for (route, model), entry in snapshot.items():
+            ordered = entry.pop("latencies")
+            entry["success_rate"] = round(entry["ok"] / entry["calls"], 3) if entry["calls"] else 0.0
+            entry["p50_sec"] = round(ordered[len(ordered) // 2], 2) if ordered else 0.0
+            entry["p95_sec"] = round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 2) if ordered else 0.0
+            out.setdefault(route, {})[model] = entry
+        return out
+
+
+router = ModelRouter()
+
+
+def _stream_completion(client, model: str, messages: list[dict], params: dict, on_token):
+    """Streamed chat completion; calls on_token(model, delta) per chunk.
+
+    Returns (text, usage) — usage comes from the final chunk when the
+    provider honours stream_options, else None.
+    """
+    stream = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        stream=True,
+        stream_options={"include_usage": True},
+        **params,
+    )
+    parts = []
+    usage = None
+    try:
+        for chunk in stream:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                on_token(model, delta)
+    finally:
+        stream.close()
+    return "".join(parts), usage
+
+
+def _call_llm(messages: list[dict], stats: _CallStats = None, bypass_cache: bool = False,
+              route: tuple[str, list[dict]] = None, on_token=None) -> tuple[str, int, int, str]:
+    """Rate-limited, cached chat completion over a route's fallback chain.
+
+    Returns (text, prompt_tokens, completion_tokens, model); tokens are 0
+    for a cache hit since nothing was billed. With on_token the response is
+    streamed and on_token(model, delta) is called as text arrives.
+    """
+    route_name, chain = route or router.route()
+    params = {"max_tokens": config.AI_MAX_TOKENS}
+    keys = {}
+    if config.LLM_CACHE_ENABLED:
+        keys = {t["model"]: llm_cache.cache_key(t["model"], messages, params) for t in chain}
+        if bypass_cache:
+            llm_cache.record_bypass()
+        else:
+            for target in chain:
+                cached = llm_cache.get(keys[target["model"]])
+                if cached is not None:
+                    if stats is not None:
+                        stats.record_cache_hit()
+                    return cached, 0, 0, target["model"]
+
+    if not breaker.allow():
+        raise CircuitOpen("provider circuit breaker is open")
+
+    requests_bucket, tokens_bucket = _rate_buckets()
+    prompt_estimate = sum(count_tokens(m["content"]) for m in messages)
+    estimate = prompt_estimate + config.AI_MAX_TOKENS
+
+    throttled = 0.0
+    if tokens_bucket:
+        throttled += tokens_bucket.acquire(estimate)
+
+    last_error = None
+    for i, target in enumerate(chain):
+        model = target["model"]
+        if requests_bucket:
+            throttled += requests_bucket.acquire(1)
+        started = time.monotonic()
+        try:
+            if on_token:
+                text, usage = _stream_completion(router.client_for(target), model, messages, params, on_token)
+            else:
+                response = router.client_for(target).chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    **params,
+                )
+                text = response.choices[0].message.content or ""
+                usage = getattr(response, "usage", None)
+        except Exception as e:
+            latency = time.monotonic() - started
+            router.record(route_name, model, False, latency, fallback=i > 0)
+            last_error = e
+            if i + 1 < len(chain):
+                logger.warning(f"{model} failed ({type(e).__name__}: {e}) — falling back to {chain[i + 1]['model']}")
+            continue
+        latency = time.monotonic() - started
+        # The breaker tracks the provider as a whole: one outcome per chain
+        breaker.record(True)
+        router.record(route_name, model, True, latency, fallback=i > 0)
+
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or prompt_estimate
+        completion_tokens = getattr(usage, "completion_tokens", None) or count_tokens(text)
+        used = prompt_tokens + completion_tokens
+        if tokens_bucket:
+            tokens_bucket.adjust(used - estimate)
+        if stats is not None:
+            stats.record(latency, prompt_tokens, completion_tokens, throttled)
+
+        if keys and text.strip():
+            llm_cache.put(keys[model], model, text, used)
+        return text, prompt_tokens, completion_tokens, model
+
+    breaker.record(False)
+    raise last_error
+
+
+def _retry_delay(attempt: int) -> float:
+    """Exponential backoff for the given attempt number, jittered to 50-100%."""
+    delay = min(config.AI_RETRY_MAX_DELAY, config.AI_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    return random.uniform(delay / 2, delay)
+
+
+def _record_failure(job: dict, error: str, stats: _CallStats = None):
+    """Count a failed generation on the job and schedule (or stop) its retries."""
+    attempts = (job.get('generation_attempts') or 0) + 1
+    terminal = attempts >= config.AI_RETRY_MAX_ATTEMPTS
+    if terminal:
+        next_attempt = None
+        status = 'generation_failed'
+        logger.error(f"❌ Giving up on job {job['id']} after {attempts} attempts: {error}")
+    else:
+        delay = _retry_delay(attempts)
+        next_attempt = datetime.now() + timedelta(seconds=delay)
+        status = job['status']
+        logger.warning(f"Job {job['id']} attempt {attempts} failed, retrying in {delay:.0f}s: {error}")
+
+    exec_query(
+        """UPDATE jobs SET generation_attempts = ?, next_attempt_at = ?, last_error = ?, status = ?
+           WHERE id = ?""",
+        (attempts, next_attempt, error[:500], status, job['id'])
     )
-    return result[0]['count'] if result else 0
+    if stats is not None:
+        stats.record_failure(terminal)
+
+
+_PROPOSAL_KEY = re.compile(r'"proposal"\s*:\s*"')
+
+
+class _ProposalStream:
+    """Turns streamed completion deltas into deltas of the proposal text.
+
+    The model answers in JSON, so the raw stream starts with
+    {"proposal": "... — this decodes the "proposal" string value as it
+    arrives (holding back half-received escapes) and ignores the rest. An
+    answer that doesn't start with { (after an optional ``` fence) is
+    passed through as plain text, matching how the final parse falls back.
+    """
+
+    def __init__(self):
+        self.raw = ""
+        self.emitted = ""
+
+    def feed(self, delta: str) -> str:
+        self.raw += delta
+        text = self._visible()
+        if not text.startswith(self.emitted):
+            return ""
+        new = text[len(self.emitted):]
+        self.emitted = text
+        return new
+
+    def _visible(self) -> str:
+        body = self.raw.lstrip()
+        if body.startswith("```"):
+            newline = body.find("\n")
+            if newline == -1:
+                return ""
+            body = body[newline + 1:].lstrip()
+        if not body or "```".startswith(body):
+            return ""
+        if not body.startswith("{"):
+            return body
+        m = _PROPOSAL_KEY.search(body)
+        if not m:
+            return ""
+        start = i = m.end()
+        while i < len(body):
+            ch = body[i]
+            if ch == '"':
+                break
+            if ch == "\\":
+                if i + 1 >= len(body):
+                    break
+                if body[i + 1] == "u":
+                    # Wait for all four hex digits, and for the low half of a surrogate pair
+                    if i + 6 > len(body):
+                        break
+                    if body[i + 2:i + 4].lower() in ("d8", "d9", "da", "db") and i + 12 > len(body):
+                        break
+                    i += 6
+                else:
+                    i += 2
+                continue
+            i += 1
+        try:
+            return json.loads('"' + body[start:i] + '"')
+        except ValueError:
+            return self.emitted
+
+
+def _token_publisher(job_id: str):
+    """on_token callback for _call_llm, or None (plain response) when no dashboard is watching.
+
+    Publishes the proposal text as it is written, not the raw JSON. After a
+    fallback to another model the text starts over, flagged with restart.
+    """
+    if not pipeline_events.has_subscribers():
+        return None
+    state = {"model": None, "stream": None}
+
+    def on_token(model, delta):
+        restart = state["model"] is not None and model != state["model"]
+        if state["model"] != model:
+            state["model"], state["stream"] = model, _ProposalStream()
+        text = state["stream"].feed(delta)
+        if text or restart:
+            pipeline_events.publish("proposal_token", job_id=job_id, model=model, delta=text, restart=restart)
+    return on_token
+
+
+def generate_proposal(job_id, quota: DailyQuota = None, stats: _CallStats = None,
+                      bypass_cache: bool = False):
+    """Generate a proposal for a specific job using Claude.
+
+    bypass_cache: skip the llm_cache lookup and always call the API (the
+    fresh response still replaces the cached one).
+    """
 
-def generate_proposal(job_id):
-    """Generate a proposal for a specific job using Claude."""
-    
     # Check daily limit
-    if count_sent_today() >= config.LIMITS['max_proposals_per_day']:
-        logger.warning(f"⚠️  Daily proposal limit ({config.LIMITS['max_proposals_per_day']}) reached")
+    quota = quota or DailyQuota()
+    slot = quota.reserve()
+    if slot is None:
         return False
-    
+
+    generated = False
+    try:
+        generated = _generate(job_id, stats, bypass_cache)
+    finally:
+        if not generated:
+            quota.release(slot)
+    return generated
+
+
+def _generate(job_id, stats: _CallStats = None, bypass_cache: bool = False):
     # Get job details
     result = exec_query(
-        "SELECT id, title, description, budget FROM jobs WHERE id = ?",
+        """SELECT id, title, description, budget, filter_score, status, generation_attempts
+           FROM jobs WHERE id = ?""",
         (job_id,),
         fetch=True
     )
-    
+
     if not result:
         logger.error(f"Job {job_id} not found")
         return False
-    
+
     job = result[0]
-    
+
     # Check if proposal already exists
     existing = exec_query(
         "SELECT id FROM proposals WHERE job_id = ?",
         (job_id,),
         fetch=True
     )
-    
+
     if existing:
         logger.warning(f"Proposal already exists for job {job_id}")
         return False
-    
-    # Build prompt
-    job_context = f"""
-Job Title: {job['title']}
-Budget: {job['budget']}
-Description: {job['description']}
-"""
-    
+
     try:
         logger.info(f"🤖 Generating proposal for: {job['title'][:50]}...")
-        
-        response = client.chat.completions.create(
-            model=config.AI_MODEL,
-            max_tokens=1024,
-            messages=[
-                {
-                    "role": "system",
-                    "content": SYSTEM_PROMPT
-                },
-                {
-                    "role": "user",
-                    "content": f"Generate a proposal for this Upwork job:\n{job_context}"
-                }
-            ]
-        )
+        route = router.route(job)
+        pipeline_events.publish("proposal_started", job_id=job_id, title=job['title'], route=route[0])
+
+        try:
+            raw, prompt_tokens, completion_tokens, model = _call_llm(
+                build_messages(job), stats, bypass_cache, route, _token_publisher(job_id)
+            )
+        except CircuitOpen:
+            # Not the job's fault — leave its attempt count alone
+            logger.info(f"Skipping job {job_id}: provider circuit breaker is open")
+            pipeline_events.publish("proposal_failed", job_id=job_id, error="circuit breaker open")
+            return False
+        except Exception as e:
+            _record_failure(job, f"{type(e).__name__}: {e}", stats)
+            pipeline_events.publish("proposal_failed", job_id=job_id, error=f"{type(e).__name__}: {e}")
+            return False
 
         # Parse response — handle None, markdown fences, or plain text
-        raw = response.choices[0].message.content or ""
         raw = raw.strip()
 
         # Strip markdown code fences if present
@@ -122,20 +738,33 @@ Description: {job['description']}
 
         if not proposal_text:
             logger.error("AI returned empty proposal")
+            _record_failure(job, "empty proposal", stats)
+            pipeline_events.publish("proposal_failed", job_id=job_id, error="empty proposal")
             return False
 
-        # Store in database
-        exec_query(
-            """INSERT INTO proposals (job_id, proposal_text, status, generated_at)
-               VALUES (?, ?, 'pending', ?)""",
-            (job_id, proposal_text, datetime.now())
+        # Store in database — a concurrent run may have won the race for this job
+        inserted = exec_query(
+            """INSERT INTO proposals (job_id, proposal_text, status, generated_at,
+                                     prompt_tokens, completion_tokens, model)
+               VALUES (?, ?, 'pending', ?, ?, ?, ?)
+               ON CONFLICT (job_id) DO NOTHING
+               RETURNING id""",
+            (job_id, proposal_text, datetime.now(), prompt_tokens, completion_tokens, model),
+            fetch=True
         )
+        if not inserted:
+            logger.warning(f"Proposal already exists for job {job_id}")
+            return False
 
         # Update job status
         exec_query(
-            "UPDATE jobs SET status = 'proposal_ready' WHERE id = ?",
+            "UPDATE jobs SET status = 'proposal_ready', next_attempt_at = NULL, last_error = '' WHERE id = ?",
             (job_id,)
         )
+        pipeline_events.publish(
+            "proposal_stored",
+            job_id=job_id, proposal_id=inserted[0]['id'], model=model, proposal_text=proposal_text,
+        )
 
         logger.info(f"✅ Proposal generated: {proposal_text[:60]}...")
         return True
@@ -144,29 +773,57 @@ Description: {job['description']}
         logger.error(f"Error generating proposal: {e}")
         return False
 
-def generate_all_pending():
+def generate_all_pending(bypass_cache: bool = False):
     """Generate proposals for all jobs with status='pending_proposal'."""
     logger.info("📝 Starting proposal generation...")
-    
-    # Get all pending proposal jobs, ordered by filter score (highest first)
-    pending_jobs = exec_query(
-        "SELECT id FROM jobs WHERE status = 'pending_proposal' ORDER BY filter_score DESC",
-        fetch=True
+    if not router.has_usable_key():
+        logger.error("❌ No API key for any configured model (NVIDIA_API_KEY or a route's api_key_env) — skipping proposal generation")
+        return 0
+
+    # Pending jobs that aren't backing off or stale, best conversion odds first
+    job_ids, stale = rank_pending_jobs()
+    generated = generate_for_jobs(job_ids, bypass_cache=bypass_cache)
+    last_generation_stats["skipped_stale"] = stale
+    return generated
+
+def generate_for_jobs(job_ids: list, bypass_cache: bool = False):
+    """Generate proposals for job_ids (in order) on AI_CONCURRENCY workers."""
+    quota = DailyQuota()
+    stats = _CallStats()
+    started = time.monotonic()
+    workers = max(1, min(config.AI_CONCURRENCY, len(job_ids)))
+
+    def work(job_id):
+        # Skip the DB round trips once the day's slots are gone or the provider is down
+        if quota.exhausted or breaker.is_open:
+            return False
+        return generate_proposal(job_id, quota=quota, stats=stats, bypass_cache=bypass_cache)
+
+    # Executor queue is FIFO, so the highest-priority jobs are started first
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="proposal") as pool:
+        generated = sum(1 for ok in pool.map(work, job_ids) if ok)
+
+    duration = time.monotonic() - started
+    summary = stats.summary()
+    last_generation_stats.clear()
+    last_generation_stats.update({
+        "pending": len(job_ids),
+        "generated": generated,
+        "workers": workers,
+        "duration_sec": round(duration, 1),
+        **summary,
+        "breaker": breaker.stats()["state"],
+        "finished_at": datetime.now().isoformat(),
+    })
+
+    if quota.exhausted:
+        logger.info(f"Daily limit reached after {generated} proposals")
+    logger.info(
+        f"📊 Generation complete: {generated} proposals created in {duration:.1f}s "
+        f"({workers} workers, p50 {summary['p50_sec']}s, p95 {summary['p95_sec']}s)"
     )
-    
-    generated = 0
-    
-    for job in pending_jobs:
-        if generate_proposal(job['id']):
-            generated += 1
-        
-        # Stop if daily limit reached
-        if count_sent_today() >= config.LIMITS['max_proposals_per_day']:
-            logger.info(f"Daily limit reached after {generated} proposals")
-            break
-    
-    logger.info(f"📊 Generation complete: {generated} proposals created")
     return generated
 
 if __name__ == "__main__":
-    generate_all_pending()
+    import sys
+    generate_all_pending(bypass_cache="--no-cache" in sys.argv)
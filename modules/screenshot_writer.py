@@ -0,0 +1,300 @@
+"""Screenshot Writer - background storage for auto-submit audit screenshots.
+
+The browser encodes each frame as JPEG (page.screenshot(**capture_options())),
+which is all the submit flow waits for. queue_frame() hands the bytes to a
+daemon thread that:
+
+- skips frames nearly identical to the proposal's previous one (dHash
+  distance with Pillow, exact match without it),
+- re-encodes to WebP when SCREENSHOT_FORMAT = "webp" and Pillow is installed,
+- writes the file under screenshots/ and indexes it in the screenshots table,
+- every SCREENSHOT_RETENTION_INTERVAL_SEC (sooner if recent writes may have
+  crossed the budget), deletes screenshots older than
+  SCREENSHOT_RETENTION_DAYS, then the oldest ones beyond SCREENSHOT_MAX_MB.
+
+PNGs saved by the old synchronous flow have no index rows; the first sweep
+in each process indexes them from their filenames so retention covers them.
+"""
+
+import atexit
+import hashlib
+import io
+import logging
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+
+import config
+from db.database import exec_query
+
+logger = logging.getLogger(__name__)
+
+SCREENSHOTS_DIR = Path(__file__).parent.parent / "screenshots"
+
+_queue = queue.Queue(maxsize=config.SCREENSHOT_QUEUE_SIZE)
+_thread = None
+_thread_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"queued": 0, "written": 0, "skipped_duplicate": 0, "dropped": 0, "evicted": 0, "errors": 0}
+
+# (proposal_id, stage) -> fingerprint of the last frame written for that stage
+# (writer thread only). Keyed by stage so an after_submit or error frame that
+# looks like before_submit is still kept — only repeats of one stage are skipped.
+_last_frame = OrderedDict()
+_LAST_FRAME_MAX = 256
+
+# Retention throttle (writer thread only)
+_last_retention = 0.0
+_size_after_retention = None    # indexed bytes measured by the last sweep
+_bytes_since_retention = 0
+_legacy_indexed = False
+
+# proposal_12_pre-submit_20250101_120000.png — the old flow's naming
+_LEGACY_NAME = re.compile(r"^proposal_(\d+)_(.+)_(\d{8}_\d{6})\.png$")
+
+_image = None
+_image_loaded = False
+
+
+def _get_image():
+    global _image, _image_loaded
+    if not _image_loaded:
+        _image_loaded = True
+        try:
+            from PIL import Image
+            _image = Image
+        except Exception:
+            logger.info("Pillow not available — screenshots stay JPEG, duplicates matched exactly")
+    return _image
+
+
+def _count(name: str, n: int = 1):
+    with _stats_lock:
+        _stats[name] += n
+
+
+def capture_options() -> dict:
+    """page.screenshot() kwargs — the browser does the JPEG encoding."""
+    return {"type": "jpeg", "quality": config.SCREENSHOT_QUALITY, "full_page": False}
+
+
+def queue_frame(proposal_id: int, stage: str, data: bytes) -> bool:
+    """Hand a captured frame to the writer. Never blocks; returns False if dropped."""
+    _ensure_thread()
+    try:
+        _queue.put_nowait((proposal_id, stage, data, datetime.now()))
+    except queue.Full:
+        logger.warning(f"Screenshot queue full — dropping {stage} frame for proposal {proposal_id}")
+        _count("dropped")
+        return False
+    _count("queued")
+    return True
+
+
+def flush(timeout: float = 15.0) -> bool:
+    """Wait until queued frames are written (e.g. before the submitter exits)."""
+    deadline = time.monotonic() + timeout
+    while _queue.unfinished_tasks:
+        if time.monotonic() >= deadline:
+            logger.warning(f"Screenshot writer still has {_queue.unfinished_tasks} frame(s) pending")
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def stats() -> dict:
+    with _stats_lock:
+        snapshot = dict(_stats)
+    snapshot["pending"] = _queue.unfinished_tasks
+    return snapshot
+
+
+def list_for_proposal(proposal_id: int) -> list[dict]:
+    """Indexed screenshots for a proposal, oldest first."""
+    rows = exec_query(
+        """SELECT id, stage, filename, bytes, created_at FROM screenshots
+           WHERE proposal_id = %s ORDER BY created_at, id""",
+        (proposal_id,),
+        fetch=True,
+    )
+    return [dict(row) for row in rows]
+
+
+def _ensure_thread():
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    with _thread_lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_run, name="screenshot-writer", daemon=True)
+            _thread.start()
+
+
+def _run():
+    while True:
+        item = _queue.get()
+        try:
+            _write(*item)
+        except Exception as e:
+            logger.warning(f"Screenshot write failed: {e}")
+            _count("errors")
+        finally:
+            _queue.task_done()
+
+
+def _fingerprint(data: bytes):
+    """64-bit difference hash with Pillow, else a content digest."""
+    image = _get_image()
+    if image is None:
+        return hashlib.sha1(data).digest()
+    gray = image.open(io.BytesIO(data)).convert("L").resize((9, 8))
+    pixels = list(gray.getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            bits = (bits << 1) | int(left > pixels[row * 9 + col + 1])
+    return bits
+
+
+def _same_frame(previous, current) -> bool:
+    if isinstance(previous, int) and isinstance(current, int):
+        return bin(previous ^ current).count("1") <= config.SCREENSHOT_DEDUPE_DISTANCE
+    return previous == current
+
+
+def _encode(data: bytes) -> tuple[bytes, str]:
+    if config.SCREENSHOT_FORMAT == "webp":
+        image = _get_image()
+        if image is not None:
+            out = io.BytesIO()
+            image.open(io.BytesIO(data)).save(out, "WEBP", quality=config.SCREENSHOT_QUALITY)
+            return out.getvalue(), "webp"
+    return data, "jpg"
+
+
+def _write(proposal_id: int, stage: str, data: bytes, taken_at: datetime):
+    fingerprint = _fingerprint(data)
+    key = (proposal_id, stage)
+    previous = _last_frame.get(key)
+    if previous is not None and _same_frame(previous, fingerprint):
+        logger.debug(f"Skipping {stage} screenshot for proposal {proposal_id}: same as previous {stage} frame")
+        _count("skipped_duplicate")
+        return
+    _last_frame[key] = fingerprint
+    _last_frame.move_to_end(key)
+    while len(_last_frame) > _LAST_FRAME_MAX:
+        _last_frame.popitem(last=False)
+
+    body, ext = _encode(data)
+    filename = f"proposal_{proposal_id}_{stage}_{taken_at:%Y%m%d_%H%M%S_%f}.{ext}"
+    path = SCREENSHOTS_DIR / filename
+    SCREENSHOTS_DIR.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(body)
+    try:
+        exec_query(
+            """INSERT INTO screenshots (proposal_id, stage, filename, bytes, created_at)
+               VALUES (%s, %s, %s, %s, %s)""",
+            (proposal_id, stage, filename, len(body), taken_at),
+        )
+    except Exception:
+        # An unindexed file would never be reached by retention
+        path.unlink(missing_ok=True)
+        raise
+    _count("written")
+    logger.info(f"Screenshot saved: {filename} ({len(body) // 1024} KB)")
+    if _retention_due(len(body)):
+        _enforce_retention()
+
+
+def _retention_due(written: int) -> bool:
+    """Claim the next sweep if the interval passed or the budget may be exceeded."""
+    global _last_retention, _bytes_since_retention
+    _bytes_since_retention += written
+    now = time.monotonic()
+    due = now - _last_retention >= config.SCREENSHOT_RETENTION_INTERVAL_SEC or (
+        _size_after_retention is not None
+        and _size_after_retention + _bytes_since_retention > config.SCREENSHOT_MAX_MB * 1024 * 1024
+    )
+    if due:
+        _last_retention = now
+        _bytes_since_retention = 0
+    return due
+
+
+def _index_legacy_files():
+    """Index PNGs from the old flow so age and size retention apply to them."""
+    global _legacy_indexed
+    _legacy_indexed = True
+    candidates = {p.name: p for p in SCREENSHOTS_DIR.glob("proposal_*.png")}
+    if not candidates:
+        return
+    known = {
+        row["filename"]
+        for row in exec_query("SELECT filename FROM screenshots WHERE filename LIKE %s", ("%.png",), fetch=True)
+    }
+    indexed = 0
+    for name, path in candidates.items():
+        match = _LEGACY_NAME.match(name)
+        if name in known or not match:
+            continue
+        try:
+            size = path.stat().st_size
+        except OSError:
+            continue
+        exec_query(
+            """INSERT INTO screenshots (proposal_id, stage, filename, bytes, created_at)
+               VALUES (%s, %s, %s, %s, %s)""",
+            (int(match.group(1)), match.group(2), name, size,
+             datetime.strptime(match.group(3), "%Y%m%d_%H%M%S")),
+        )
+        indexed += 1
+    if indexed:
+        logger.info(f"Indexed {indexed} legacy PNG screenshot(s) for retention")
+
+
+def _enforce_retention():
+    global _size_after_retention
+    if not _legacy_indexed:
+        _index_legacy_files()
+    budget = int(config.SCREENSHOT_MAX_MB * 1024 * 1024)
+    removed = list(exec_query(
+        """DELETE FROM screenshots
+           WHERE created_at < CURRENT_TIMESTAMP - make_interval(days => %s)
+           RETURNING filename""",
+        (config.SCREENSHOT_RETENTION_DAYS,),
+        fetch=True,
+    ))
+    total = exec_query("SELECT COALESCE(SUM(bytes), 0) AS total FROM screenshots", fetch=True)[0]["total"]
+    if total > budget:
+        # Keep the newest screenshots whose running size fits the budget
+        over_budget = exec_query(
+            """DELETE FROM screenshots WHERE id IN (
+                   SELECT id FROM (
+                       SELECT id, SUM(bytes) OVER (ORDER BY created_at DESC, id DESC) AS running
+                       FROM screenshots
+                   ) sized
+                   WHERE running > %s
+               )
+               RETURNING filename, bytes""",
+            (budget,),
+            fetch=True,
+        )
+        total -= sum(row["bytes"] or 0 for row in over_budget)
+        removed += over_budget
+    _size_after_retention = total
+
+    for row in removed:
+        try:
+            (SCREENSHOTS_DIR / row["filename"]).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not delete screenshot {row['filename']}: {e}")
+    if removed:
+        _count("evicted", len(removed))
+
+
+atexit.register(flush, 5.0)
@@ -5,37 +5,17 @@ import sys
 from datetime import datetime
 
 sys.path.insert(0, "/Users/growthgod/upwork_scripting_app")
-from db.database import exec_query
+from db.database import exec_query, insert_new_jobs
 
 
 def insert_jobs(jobs_json: str, keyword: str = ""):
     """Insert jobs from JSON string, skip duplicates."""
     jobs = json.loads(jobs_json)
-    new_count = 0
-    for job in jobs:
-        # Check if exists
-        exists = exec_query(
-            "SELECT 1 FROM jobs WHERE id = %s", (job["id"],), fetch=True
-        )
-        if exists:
-            continue
-        try:
-            exec_query(
-                """INSERT INTO jobs (id, title, url, description, budget, posted_at, status, fetched_at)
-                   VALUES (%s, %s, %s, %s, %s, %s, 'new', %s)""",
-                (
-                    job["id"],
-                    job["title"],
-                    job["url"],
-                    job["description"][:2000],
-                    job["budget"],
-                    job["posted_at"] or datetime.now().isoformat(),
-                    datetime.now().isoformat(),
-                ),
-            )
-            new_count += 1
-        except Exception as e:
-            print(f"  Skip {job['id']}: {e}")
+    try:
+        new_count = len(insert_new_jobs(jobs, description_limit=2000))
+    except Exception as e:
+        print(f"  Insert failed: {e}")
+        new_count = 0
 
     # Log the run
     duplicates = len(jobs) - new_count
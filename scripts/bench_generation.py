@@ -0,0 +1,202 @@
+"""Benchmark proposal generation against the local LLM stub.
+
+Inserts N synthetic pending jobs (ids bench-<run>-<n>), starts
+scripts/llm_stub_server.py in-process (or uses --base-url), runs
+proposal_generator.generate_for_jobs() over them and reports throughput,
+tail latency and DB time per proposal. Everything it creates — jobs,
+proposals, quota ledger slots, llm_cache rows (model 'bench-stub') — is
+removed afterwards unless --keep is given.
+
+    python scripts/bench_generation.py --jobs 40 --concurrency 8 --passes 2 \
+        --latency-median 2 --latency-p95 6 --error-rate 0.05
+
+Point DATABASE_URL at a scratch database if you'd rather not touch dev data.
+"""
+
+import argparse
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from scripts.llm_stub_server import add_stub_arguments, start_stub, stub_config_from_args
+
+BENCH_MODEL = "bench-stub"
+
+
+class _DbTimer:
+    """Wraps exec_query in the modules the generator uses and sums time spent."""
+
+    def __init__(self, modules):
+        self.modules = modules
+        self.originals = {}
+        self.seconds = 0.0
+        self.queries = 0
+        self._lock = threading.Lock()
+
+    def _wrap(self, fn):
+        def timed(*args, **kwargs):
+            started = time.monotonic()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.seconds += time.monotonic() - started
+                    self.queries += 1
+        return timed
+
+    def __enter__(self):
+        for module in self.modules:
+            self.originals[module] = module.exec_query
+            module.exec_query = self._wrap(module.exec_query)
+        return self
+
+    def __exit__(self, *exc):
+        for module, original in self.originals.items():
+            module.exec_query = original
+
+
+def _seed_jobs(run_id: str, count: int) -> list[str]:
+    from db.database import exec_query, insert_new_jobs
+
+    jobs = [
+        {
+            "id": f"bench-{run_id}-{i:04d}",
+            # Titles/descriptions don't include the run id so a second run can hit the cache
+            "title": f"Synthetic job #{i}: Python scraper for product listings",
+            "url": f"https://example.invalid/jobs/{i}",
+            "description": (
+                f"Need a Python developer to build a scraper for listing page {i}. "
+                "Data goes into PostgreSQL nightly; must handle pagination and retries. "
+            ) * 4,
+            "budget": f"${200 + (i % 10) * 50}",
+            "feed_source": "bench",
+        }
+        for i in range(count)
+    ]
+    insert_new_jobs(jobs)
+    exec_query(
+        "UPDATE jobs SET status = 'pending_proposal', filter_score = 5 WHERE id LIKE %s",
+        (f"bench-{run_id}-%",),
+    )
+    return [job["id"] for job in jobs]
+
+
+def _reset_jobs(run_id: str) -> int:
+    """Delete this run's proposals and put its jobs back to pending_proposal."""
+    from db.database import exec_query
+
+    removed = exec_query("DELETE FROM proposals WHERE job_id LIKE %s", (f"bench-{run_id}-%",))
+    exec_query(
+        """UPDATE jobs SET status = 'pending_proposal', generation_attempts = 0,
+                           next_attempt_at = NULL, last_error = ''
+           WHERE id LIKE %s""",
+        (f"bench-{run_id}-%",),
+    )
+    return removed or 0
+
+
+def _cleanup(run_id: str, generated_total: int):
+    from db.database import exec_query
+
+    _reset_jobs(run_id)
+    exec_query("DELETE FROM jobs WHERE id LIKE %s", (f"bench-{run_id}-%",))
+    exec_query("DELETE FROM llm_cache WHERE model = %s", (BENCH_MODEL,))
+    exec_query(
+        "UPDATE proposal_quota SET used = GREATEST(used - %s, 0) WHERE day = CURRENT_DATE",
+        (generated_total,),
+    )
+
+
+def _run_pass(pg, job_ids: list[str], bypass_cache: bool, timer_modules) -> dict:
+    with _DbTimer(timer_modules) as timer:
+        started = time.monotonic()
+        generated = pg.generate_for_jobs(job_ids, bypass_cache=bypass_cache)
+        wall = time.monotonic() - started
+
+    stats = dict(pg.last_generation_stats)
+    per_proposal = max(generated, 1)
+    return {
+        "generated": generated,
+        "wall_sec": round(wall, 2),
+        "proposals_per_min": round(generated / wall * 60, 1) if wall else 0.0,
+        "p50_sec": stats.get("p50_sec"),
+        "p95_sec": stats.get("p95_sec"),
+        "max_sec": stats.get("max_sec"),
+        "cache_hits": stats.get("cache_hits"),
+        "prompt_tokens": stats.get("prompt_tokens"),
+        "completion_tokens": stats.get("completion_tokens"),
+        "throttled_sec": stats.get("throttled_sec"),
+        "failed": stats.get("failed"),
+        "breaker": stats.get("breaker"),
+        "db_queries": timer.queries,
+        "db_ms_per_proposal": round(timer.seconds * 1000 / per_proposal, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark proposal generation against a local LLM stub.")
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=config.AI_CONCURRENCY)
+    parser.add_argument("--passes", type=int, default=1, help="repeat over the same jobs (2+ exercises the cache)")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the LLM response cache")
+    parser.add_argument("--no-rate-limit", action="store_true", help="disable the request/token buckets")
+    parser.add_argument("--base-url", help="use an already running stub instead of starting one")
+    parser.add_argument("--keep", action="store_true", help="leave benchmark jobs/proposals in the DB")
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    server = None
+    stub = None
+    base_url = args.base_url
+    if not base_url:
+        stub = stub_config_from_args(args)
+        server = start_stub(stub)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    config.AI_MODEL = BENCH_MODEL
+    config.AI_ROUTES = []
+    config.AI_BASE_URL = base_url
+    config.AI_API_KEY = "stub"
+    config.AI_CLIENT_MAX_RETRIES = 0
+    config.AI_CONCURRENCY = args.concurrency
+    config.LIMITS["max_proposals_per_day"] = 10 ** 6
+    if args.no_rate_limit:
+        config.AI_REQUESTS_PER_MIN = 0
+        config.AI_TOKENS_PER_MIN = 0
+
+    import db.database
+    from modules import llm_cache
+    from modules import proposal_generator as pg
+
+    timer_modules = [pg, llm_cache, db.database]
+
+    run_id = uuid.uuid4().hex[:8]
+    print(f"Benchmark {run_id}: {args.jobs} jobs, {args.concurrency} workers, stub at {base_url}")
+    job_ids = _seed_jobs(run_id, args.jobs)
+    generated_total = 0
+    try:
+        for n in range(1, args.passes + 1):
+            if n > 1:
+                _reset_jobs(run_id)
+            result = _run_pass(pg, job_ids, args.no_cache, timer_modules)
+            generated_total += result["generated"]
+            print(f"\nPass {n}:")
+            for key, value in result.items():
+                print(f"  {key:<20} {value}")
+    finally:
+        if not args.keep:
+            _cleanup(run_id, generated_total)
+        if server:
+            server.shutdown()
+
+    if stub:
+        print(f"\nStub: {stub.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark API cold start: how long `import main` takes in a fresh interpreter.
+
+Each run spawns a new Python process, so nothing is warm except the OS file
+cache. Reports median/p95 import time, which heavy SDKs ended up in
+sys.modules (none of them should be needed just to boot the API), and with
+--importtime the slowest imports by cumulative time from `-X importtime`.
+
+    python scripts/bench_startup.py --runs 10 --importtime
+
+Run it on two checkouts (or before/after a change) to compare.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("openai", "httpx", "playwright", "feedparser", "curl_cffi", "tiktoken")
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"sec": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(.+)$")
+
+
+def _run(module: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)]
+    return subprocess.run(cmd, cwd=ROOT, env=os.environ.copy(), capture_output=True, text=True)
+
+
+def _slowest_imports(stderr: str, top: int) -> list[tuple[float, str]]:
+    """Parse -X importtime output into the top (cumulative ms, module) pairs."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            rows.append((int(match.group(2)) / 1000.0, match.group(3).rstrip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the API.")
+    parser.add_argument("--module", default="main", help="module to import (default: main)")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--importtime", action="store_true", help="also show the slowest imports")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    timings = []
+    loaded = set()
+    for _ in range(args.runs):
+        result = _run(args.module)
+        if result.returncode != 0:
+            print(result.stderr, file=sys.stderr)
+            sys.exit(f"import {args.module} failed")
+        probe = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(probe["sec"])
+        loaded.update(probe["loaded"])
+
+    ordered = sorted(timings)
+    print(f"import {args.module}: {args.runs} cold runs")
+    print(f"  median   {statistics.median(ordered) * 1000:8.1f} ms")
+    print(f"  p95      {ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000:8.1f} ms")
+    print(f"  min      {ordered[0] * 1000:8.1f} ms")
+    print(f"  heavy modules loaded: {', '.join(sorted(loaded)) or 'none'}")
+
+    if args.importtime:
+        result = _run(args.module, importtime=True)
+        print("\nSlowest imports (cumulative ms):")
+        for ms, name in _slowest_imports(result.stderr, args.top):
+            print(f"  {ms:8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
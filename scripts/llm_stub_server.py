@@ -0,0 +1,245 @@
+"""Local OpenAI-compatible stub for offline generation tuning.
+
+Serves POST /v1/chat/completions with a configurable latency distribution,
+error rate and mix of response shapes, so generate_all_pending() can be
+benchmarked without a live endpoint (see scripts/bench_generation.py).
+Requests with "stream": true get SSE chunks: the first after --ttft-share
+of the drawn latency, the rest spread over the remainder.
+
+    python scripts/llm_stub_server.py --port 8799 --latency-median 2 --latency-p95 6 \
+        --error-rate 0.05 --shapes json=0.7,fenced=0.15,text=0.1,empty=0.05
+
+Point the generator at it with AI_BASE_URL = "http://127.0.0.1:8799/v1".
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SHAPES = ("json", "fenced", "text", "empty")
+
+_PROPOSAL = (
+    "Saw you need the nightly export to stop timing out — I rebuilt a similar "
+    "pipeline last month and cut it from 40 minutes to 3. I run a platform "
+    "automating 200+ accounts, so scrapers and queues are my day job. "
+    "Which step is slowest today: the fetch or the write?"
+)
+
+
+class StubConfig:
+    def __init__(self, latency_median=1.5, latency_p95=4.0, error_rate=0.0,
+                 error_codes=(429, 500), shapes=None, completion_tokens=180, seed=None,
+                 ttft_share=0.3):
+        self.latency_median = latency_median
+        self.latency_p95 = max(latency_p95, latency_median)
+        self.error_rate = error_rate
+        self.error_codes = tuple(error_codes)
+        self.shapes = shapes or {"json": 1.0}
+        self.completion_tokens = completion_tokens
+        self.ttft_share = ttft_share
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, **{s: 0 for s in SHAPES}}
+
+    def latency(self) -> float:
+        """Log-normal draw matching the configured median and p95 (seconds)."""
+        if self.latency_median <= 0:
+            return 0.0
+        sigma = math.log(self.latency_p95 / self.latency_median) / 1.645
+        with self.lock:
+            return self.rng.lognormvariate(math.log(self.latency_median), sigma)
+
+    def draw(self) -> tuple[int | None, str]:
+        """Pick (error_status or None, response shape) for one request."""
+        with self.lock:
+            self.stats["requests"] += 1
+            if self.rng.random() < self.error_rate:
+                self.stats["errors"] += 1
+                return self.rng.choice(self.error_codes), ""
+            shape = self.rng.choices(list(self.shapes), weights=list(self.shapes.values()))[0]
+            self.stats[shape] += 1
+            return None, shape
+
+
+def _content(shape: str) -> str:
+    body = json.dumps({
+        "proposal": _PROPOSAL,
+        "opening_hook": _PROPOSAL.split(" — ")[0],
+        "relevant_experience": "automation platform",
+    }, indent=2)
+    if shape == "json":
+        return body
+    if shape == "fenced":
+        return f"```json\n{body}\n```"
+    if shape == "text":
+        return _PROPOSAL
+    return ""
+
+
+def _make_handler(cfg: StubConfig):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def _send(self, status: int, payload: dict):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/stats"):
+                with cfg.lock:
+                    self._send(200, dict(cfg.stats))
+            else:
+                self._send(404, {"error": {"message": "not found"}})
+
+        def _stream(self, request: dict, content: str, usage: dict, latency: float):
+            chunk_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            model = request.get("model", "stub")
+            pieces = [content[i:i + 16] for i in range(0, len(content), 16)] or [""]
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+
+            def emit(payload):
+                self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode())
+                self.wfile.flush()
+
+            time.sleep(latency * cfg.ttft_share)
+            gap = latency * (1 - cfg.ttft_share) / len(pieces)
+            for n, piece in enumerate(pieces):
+                if n:
+                    time.sleep(gap)
+                emit({
+                    "id": chunk_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                })
+            emit({
+                "id": chunk_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            })
+            if (request.get("stream_options") or {}).get("include_usage"):
+                emit({
+                    "id": chunk_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                    "model": model, "choices": [], "usage": usage,
+                })
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                request = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                request = {}
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send(404, {"error": {"message": "not found"}})
+                return
+
+            latency = cfg.latency()
+            status, shape = cfg.draw()
+            if status:
+                time.sleep(latency)
+                self._send(status, {"error": {"message": f"stub error {status}", "type": "stub"}})
+                return
+
+            prompt_chars = sum(len(m.get("content") or "") for m in request.get("messages", []))
+            content = _content(shape)
+            completion = cfg.completion_tokens if content else 0
+            usage = {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": completion,
+                "total_tokens": prompt_chars // 4 + completion,
+            }
+            if request.get("stream"):
+                self._stream(request, content, usage, latency)
+                return
+
+            time.sleep(latency)
+            self._send(200, {
+                "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            })
+
+    return Handler
+
+
+def parse_shapes(spec: str) -> dict:
+    """'json=0.7,text=0.3' → {"json": 0.7, "text": 0.3}"""
+    shapes = {}
+    for part in filter(None, spec.split(",")):
+        name, _, weight = part.partition("=")
+        if name not in SHAPES:
+            raise ValueError(f"Unknown shape {name!r} (expected one of {', '.join(SHAPES)})")
+        shapes[name] = float(weight or 1)
+    return shapes
+
+
+def start_stub(cfg: StubConfig, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Start the stub on a daemon thread. server.server_address has the bound port."""
+    server = ThreadingHTTPServer((host, port), _make_handler(cfg))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="llm-stub", daemon=True).start()
+    return server
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency-median", type=float, default=1.5, help="seconds")
+    parser.add_argument("--latency-p95", type=float, default=4.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0-1")
+    parser.add_argument("--error-codes", default="429,500")
+    parser.add_argument("--shapes", default="json=1", help="json/fenced/text/empty weights")
+    parser.add_argument("--completion-tokens", type=int, default=180)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--ttft-share", type=float, default=0.3,
+                        help="share of the latency spent before the first streamed chunk")
+
+
+def stub_config_from_args(args) -> StubConfig:
+    return StubConfig(
+        latency_median=args.latency_median,
+        latency_p95=args.latency_p95,
+        error_rate=args.error_rate,
+        error_codes=[int(c) for c in args.error_codes.split(",") if c],
+        shapes=parse_shapes(args.shapes),
+        completion_tokens=args.completion_tokens,
+        seed=args.seed,
+        ttft_share=args.ttft_share,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8799)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), _make_handler(stub_config_from_args(args)))
+    print(f"LLM stub listening on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
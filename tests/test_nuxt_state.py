@@ -0,0 +1,91 @@
+"""Unit tests for modules.nuxt_state (browser-free __NUXT__ parsing)."""
+
+import pytest
+
+from modules.nuxt_state import NuxtParseError, NuxtStateMissing, parse_nuxt_state
+
+
+def _page(script: str) -> str:
+    return f"<html><body><div id=__nuxt></div><script>{script}</script></body></html>"
+
+
+def test_object_literal_form():
+    state = parse_nuxt_state(_page(
+        'window.__NUXT__={state:{jobsSearch:{jobs:[{title:"A",amount:{amount:50}}],'
+        'paging:{total:1,offset:0}}},serverRendered:true};'
+    ))
+    assert state["state"]["jobsSearch"]["jobs"] == [{"title": "A", "amount": {"amount": 50}}]
+    assert state["state"]["jobsSearch"]["paging"] == {"total": 1, "offset": 0}
+    assert state["serverRendered"] is True
+
+
+def test_plain_json_form():
+    state = parse_nuxt_state(_page('window.__NUXT__ = {"state": {"n": 1.5, "x": null}};'))
+    assert state == {"state": {"n": 1.5, "x": None}}
+
+
+def test_devalue_iife_binds_parameters():
+    state = parse_nuxt_state(_page(
+        'window.__NUXT__=(function(a,b,c){return {state:{jobs:[{title:b,tier:a},'
+        '{title:"Two",tier:a,client:c}]}}}(2,"One",null));'
+    ))
+    jobs = state["state"]["jobs"]
+    assert jobs[0] == {"title": "One", "tier": 2}
+    assert jobs[1] == {"title": "Two", "tier": 2, "client": None}
+
+
+def test_devalue_iife_call_outside_parens():
+    state = parse_nuxt_state(_page('window.__NUXT__=(function(a){return {v:a}})("x");'))
+    assert state == {"v": "x"}
+
+
+def test_member_assignment_before_return():
+    state = parse_nuxt_state(_page(
+        'window.__NUXT__=(function(a,b){a.title="T";a.tags=Array(2);a.tags[1]=b;'
+        'b.deep={};b.deep.n=3;return {job:a}}({},{}));'
+    ))
+    assert state["job"]["title"] == "T"
+    assert state["job"]["tags"] == [None, {"deep": {"n": 3}}]
+
+
+def test_void_and_negation_literals():
+    state = parse_nuxt_state(_page(
+        'window.__NUXT__={a:void 0,b:!0,c:!1,d:undefined,e:false,f:-1.5e2};'
+    ))
+    assert state == {"a": None, "b": True, "c": False, "d": None, "e": False, "f": -150.0}
+
+
+def test_unicode_escapes():
+    state = parse_nuxt_state(_page(
+        r"window.__NUXT__={s:'caf\u00e9',e:'\uD83D\uDE80',b:'\u{1F600}',x:'\x41\n',q:'it\'s'};"
+    ))
+    assert state["s"] == "café"
+    assert state["e"] == "\U0001F680"
+    assert state["b"] == "\U0001F600"
+    assert state["x"] == "A\n"
+    assert state["q"] == "it's"
+
+
+def test_new_date():
+    state = parse_nuxt_state(_page(
+        'window.__NUXT__={a:new Date(0),b:new Date("2024-05-01T10:00:00Z")};'
+    ))
+    assert state["a"] == "1970-01-01T00:00:00+00:00"
+    assert state["b"] == "2024-05-01T10:00:00Z"
+
+
+def test_missing_state_is_distinct_from_parse_errors():
+    with pytest.raises(NuxtStateMissing):
+        parse_nuxt_state("<html><title>Just a moment...</title></html>")
+
+
+@pytest.mark.parametrize("script", [
+    'window.__NUXT__={a:new Map([[1,2]])};',
+    'window.__NUXT__={a:foo(1)};',
+    'window.__NUXT__=(function(a){missing.x=1;return {a:a}}(1));',
+    "window.__NUXT__={s:'\\u00zz'};",
+])
+def test_unsupported_syntax_raises_parse_error(script):
+    with pytest.raises(NuxtParseError) as info:
+        parse_nuxt_state(_page(script))
+    assert not isinstance(info.value, NuxtStateMissing)